@@ -0,0 +1,26 @@
+import os
+import httpx
+
+# -------------------------------------------------
+# Shared Async HTTP Client
+# One pooled connection manager for every outbound audio download, so concurrent
+# requests reuse keep-alive connections instead of blocking a worker thread each.
+# -------------------------------------------------
+_client = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("AURA_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("AURA_HTTP_MAX_KEEPALIVE", "20")),
+        )
+        # follow_redirects mirrors `requests.get`, which storage CDNs rely on
+        _client = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(30.0), follow_redirects=True)
+    return _client
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
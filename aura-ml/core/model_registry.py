@@ -0,0 +1,218 @@
+import os
+import gc
+import time
+import threading
+
+# -------------------------------------------------
+# Model Registry
+# One place that decides which models a worker holds in memory.
+#
+# Load policy per model (AURA_MODEL_POLICY, e.g. "emotion=eager,ast=disabled"):
+#   eager    -> loaded during startup warm-up, never unloaded for the budget or when idle
+#   lazy     -> loaded on first use, unloaded when idle or when the memory budget needs room
+#   disabled -> never loaded; callers get ModelDisabledError (HTTP 503 at the API layer)
+#
+# Memory budget (AURA_MODEL_MEMORY_BUDGET_MB, 0 = unlimited): after every load, least recently
+# used lazy models are unloaded until the resident total fits. A model still running a request
+# when it is unloaded stays alive until that request drops its reference.
+# -------------------------------------------------
+POLICIES = ("eager", "lazy", "disabled")
+
+class ModelDisabledError(RuntimeError):
+    """Raised when a model disabled by AURA_MODEL_POLICY is requested."""
+
+def parse_policies(value: str) -> dict:
+    """'a=eager, b=disabled' -> {'a': 'eager', 'b': 'disabled'}; malformed entries are ignored."""
+    policies = {}
+    for item in (value or "").split(","):
+        name, _, policy = item.partition("=")
+        name, policy = name.strip(), policy.strip().lower()
+        if name and policy in POLICIES:
+            policies[name] = policy
+        elif item.strip():
+            print(f"⚠️ Ignoring model policy '{item.strip()}' (expected name=eager|lazy|disabled)")
+    return policies
+
+def estimate_nbytes(obj) -> int:
+    """
+    Resident size of a loaded model: parameters + buffers of a torch module (also found behind
+    a transformers pipeline's `.model`), or the object's own `memory_bytes()` if it has one.
+    """
+    if obj is None:
+        return 0
+    if hasattr(obj, "memory_bytes"):
+        return int(obj.memory_bytes())
+    module = obj if hasattr(obj, "parameters") else getattr(obj, "model", None)
+    if module is not None and hasattr(module, "memory_bytes"):
+        return int(module.memory_bytes())  # e.g. an ONNX Runtime model behind a pipeline
+    if module is None or not hasattr(module, "parameters"):
+        return 0
+    seen, total = set(), 0
+    tensors = list(module.parameters()) + list(module.buffers() if hasattr(module, "buffers") else [])
+    for tensor in tensors:
+        key = (tensor.data_ptr(), tensor.numel())
+        if key not in seen:
+            seen.add(key)
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+class ModelEntry:
+    def __init__(self, name, load, unload, default_policy, size):
+        self.name = name
+        self.load = load
+        self.unload = unload
+        self.default_policy = default_policy
+        self.size = size
+        self.lock = threading.Lock()  # serializes loads of this model only
+        self.obj = None
+        self.nbytes = 0
+        self.last_used = 0.0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+class ModelRegistry:
+    """
+    Load-Policy and Memory-Budget Manager for the service's ML models.
+
+    Services register an idempotent `load()` (returns the model, loading it if needed) and an
+    `unload()` (drops the service's reference). Every access goes through `get(name)`, which
+    enforces the policy, records recency for LRU eviction, and measures newly loaded models.
+
+    Architecture:
+    - Registration: each service module registers itself at import time.
+    - Policy: per-model default, overridden by AURA_MODEL_POLICY.
+    - Budget: AURA_MODEL_MEMORY_BUDGET_MB, LRU eviction of lazy models after each load.
+    - Idle sweep: `unload_idle()` (scheduled when AURA_MODEL_IDLE_MINUTES > 0).
+    """
+    _instance = None
+
+    def __init__(self, budget_mb: float = None, policies: dict = None):
+        self._entries = {}
+        self._lock = threading.RLock()  # bookkeeping only; never held while a model loads
+        budget_mb = float(os.getenv("AURA_MODEL_MEMORY_BUDGET_MB", "0")) if budget_mb is None else budget_mb
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._policies = parse_policies(os.getenv("AURA_MODEL_POLICY", "")) if policies is None else dict(policies)
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = ModelRegistry()
+        return cls._instance
+
+    def register(self, name: str, load, unload, default_policy: str = "lazy", size=estimate_nbytes):
+        with self._lock:
+            self._entries[name] = ModelEntry(name, load, unload, default_policy, size)
+
+    def policy(self, name: str) -> str:
+        return self._policies.get(name, self._entries[name].default_policy)
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.obj is not None
+
+    def get(self, name: str):
+        """Returns the loaded model, loading it on first use. Raises ModelDisabledError if disabled."""
+        entry = self._entries[name]
+        if self.policy(name) == "disabled":
+            raise ModelDisabledError(f"Model '{name}' is disabled on this worker (AURA_MODEL_POLICY)")
+
+        with entry.lock:
+            started = time.perf_counter()
+            obj = entry.load()
+            newly_loaded = obj is not None and obj is not entry.obj
+            if newly_loaded:
+                entry.obj = obj
+                entry.nbytes = entry.size(obj)
+                entry.loads += 1
+                entry.load_seconds = time.perf_counter() - started
+        entry.last_used = time.monotonic()
+
+        if newly_loaded:
+            print(f"📦 Model '{name}' resident: {entry.nbytes / 1024 / 1024:.1f} MB "
+                  f"(loaded in {entry.load_seconds:.2f}s, total {self.resident_bytes() / 1024 / 1024:.1f} MB)")
+            self._enforce_budget(keep=name)
+        return obj
+
+    def handle(self, name: str):
+        """Proxy that resolves the model on every attribute access (for components holding a model reference)."""
+        return ModelHandle(self, name)
+
+    def warm(self):
+        """Loads every eager model (startup). Failures are logged; the model stays loadable later."""
+        for name in list(self._entries):
+            if self.policy(name) == "eager":
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"⚠️ Eager load of '{name}' failed: {e}")
+
+    def unload(self, name: str) -> bool:
+        entry = self._entries[name]
+        with entry.lock:
+            if entry.obj is None:
+                return False
+            entry.unload()
+            entry.obj, entry.nbytes = None, 0
+            entry.evictions += 1
+        gc.collect()
+        print(f"♻️ Model '{name}' unloaded.")
+        return True
+
+    def unload_all(self):
+        for name in list(self._entries):
+            self.unload(name)
+
+    def unload_idle(self, max_idle_seconds: float):
+        """Unloads lazy models unused for `max_idle_seconds`. Returns the unloaded names."""
+        now = time.monotonic()
+        idle = [e.name for e in self._entries.values()
+                if e.obj is not None and self.policy(e.name) == "lazy" and now - e.last_used >= max_idle_seconds]
+        return [name for name in idle if self.unload(name)]
+
+    def resident_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values() if e.obj is not None)
+
+    def _enforce_budget(self, keep: str):
+        if self.budget_bytes <= 0:
+            return
+        with self._lock:
+            candidates = sorted((e for e in self._entries.values()
+                                 if e.obj is not None and e.name != keep and self.policy(e.name) == "lazy"),
+                                key=lambda e: e.last_used)
+        for entry in candidates:
+            if self.resident_bytes() <= self.budget_bytes:
+                return
+            self.unload(entry.name)
+        if self.resident_bytes() > self.budget_bytes:
+            print(f"⚠️ Model memory {self.resident_bytes() / 1024 / 1024:.1f} MB exceeds budget "
+                  f"{self.budget_bytes / 1024 / 1024:.1f} MB (remaining models are eager or in use).")
+
+    def stats(self):
+        """Per-model policy, residency and size, plus the budget (for /admin/metrics)."""
+        now = time.monotonic()
+        return {
+            "budget_mb": round(self.budget_bytes / 1024 / 1024, 1),
+            "resident_mb": round(self.resident_bytes() / 1024 / 1024, 1),
+            "models": {
+                e.name: {
+                    "policy": self.policy(e.name),
+                    "loaded": e.obj is not None,
+                    "resident_mb": round(e.nbytes / 1024 / 1024, 1),
+                    "idle_seconds": round(now - e.last_used, 1) if e.last_used else None,
+                    "loads": e.loads,
+                    "evictions": e.evictions,
+                    "load_seconds": round(e.load_seconds, 2),
+                } for e in self._entries.values()
+            },
+        }
+
+class ModelHandle:
+    """Stand-in for a registry model: `handle.encode(...)` runs `registry.get(name).encode(...)`."""
+
+    def __init__(self, registry: ModelRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
@@ -0,0 +1,76 @@
+import os
+import secrets
+import warnings
+from contextlib import contextmanager
+import numpy as np
+
+# -------------------------------------------------
+# ONNX Export & Runtime Helpers
+# Shared by the optional ONNX Runtime backends (face emotion, AST). `onnx` / `onnxruntime`
+# are optional dependencies, imported only when a backend asks for them. The parity check
+# (`parity_report`) is shared by every optimized backend, ONNX or not.
+# Every file is written under a per-process ".partial" name and renamed, so a crashed export
+# never leaves a truncated model in the cache and workers exporting at once never share a file.
+# -------------------------------------------------
+
+@contextmanager
+def staged(path: str):
+    """Yields a unique staging path (pid + random suffix) that replaces `path` on success."""
+    staging = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.partial"
+    try:
+        yield staging
+        os.replace(staging, path)
+    finally:
+        if os.path.exists(staging):
+            os.remove(staging)
+
+def export_onnx(module, example, path: str, input_name: str, output_name: str = "logits"):
+    """Exports a torch module (TorchScript exporter, opset 17) with a dynamic batch axis."""
+    import torch
+
+    with staged(path) as staging, warnings.catch_warnings(), torch.no_grad():
+        warnings.simplefilter("ignore")  # torch.onnx tracer notices
+        torch.onnx.export(module.eval(), (example,), staging, input_names=[input_name], output_names=[output_name],
+                          opset_version=17, dynamo=False,
+                          dynamic_axes={input_name: {0: "batch"}, output_name: {0: "batch"}})
+
+def quantize_onnx(source: str, path: str):
+    """Dynamic int8 quantization of an exported graph's weights (activations stay fp32)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    with staged(path) as staging:
+        quantize_dynamic(source, staging, weight_type=QuantType.QInt8)
+
+def create_session(path: str, threads: int = 0):
+    """CPU InferenceSession with all graph optimizations; `threads` intra-op threads (0 = onnxruntime default)."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+def parity_passed(parity: dict, tolerance: float) -> bool:
+    """Every top-1 class agrees and no class probability differs by more than `tolerance`."""
+    return parity["top1_agreement"] == 1.0 and parity["max_prob_diff"] <= tolerance
+
+def parity_report(ref_probs, cand_probs, tolerance: float = 0.05) -> dict:
+    """
+    Parity of a candidate backend's class probabilities against the eager reference's
+    (both [n, classes], same class order). Shared by every optimized backend (CNN, face emotion, AST).
+    """
+    ref_probs, cand_probs = np.asarray(ref_probs, dtype=np.float64), np.asarray(cand_probs, dtype=np.float64)
+    parity = {
+        "top1_agreement": float(np.mean(ref_probs.argmax(1) == cand_probs.argmax(1))),
+        "max_prob_diff": round(float(np.abs(ref_probs - cand_probs).max()), 6),
+    }
+    return {"passed": parity_passed(parity, tolerance), **parity}
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+def model_slug(model_name: str) -> str:
+    """Hub id or local path -> one cache directory name ("org/model" -> "org--model")."""
+    return model_name.strip("/\\").replace("/", "--").replace("\\", "--")
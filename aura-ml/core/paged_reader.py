@@ -0,0 +1,112 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# -------------------------------------------------
+# Paged Supabase Reader
+# Streams large tables in fixed-size `.range()` pages instead of one unbounded select
+# (which PostgREST silently caps at its max-rows setting). A few pages are fetched
+# concurrently ahead of the consumer; only those pages are ever held as Python dicts.
+# -------------------------------------------------
+PAGE_SIZE = int(os.getenv("AURA_DB_PAGE_SIZE", "1000"))
+FETCH_WORKERS = int(os.getenv("AURA_DB_FETCH_WORKERS", "4"))
+
+class PagedReader:
+    def __init__(self, supabase, page_size: int = PAGE_SIZE, workers: int = FETCH_WORKERS):
+        self.supabase = supabase
+        self.page_size = max(1, page_size)
+        self.workers = max(1, workers)
+
+    def _fetch(self, table, columns, order, apply, page):
+        query = self.supabase.table(table).select(columns)
+        if apply is not None:
+            query = apply(query)
+        start = page * self.page_size
+        return query.order(order).range(start, start + self.page_size - 1).execute().data or []
+
+    def iter_pages(self, table: str, columns: str, order: str = "id", apply=None):
+        """
+        Yields each page's rows in table order. `apply` adds filters to every page query
+        (e.g. `lambda q: q.gt("created_at", watermark)`). Pages are ordered by a unique
+        column so offsets are stable; the stream ends at the first short page.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            next_page, exhausted = 0, False
+            while True:
+                while not exhausted and len(pending) < self.workers:
+                    pending.append(pool.submit(self._fetch, table, columns, order, apply, next_page))
+                    next_page += 1
+                if not pending:
+                    return
+                rows = pending.popleft().result()
+                if len(rows) < self.page_size:
+                    exhausted = True
+                if rows:
+                    yield rows
+
+    def read_column(self, table: str, column: str, order: str = "id"):
+        """All values of one column, paged."""
+        return [row[column] for rows in self.iter_pages(table, column, order) for row in rows]
+
+class IdEncoder:
+    """Streaming string id -> dense integer code assignment (first-seen order)."""
+
+    def __init__(self):
+        self.index = {}
+        self.ids = []
+
+    def encode(self, values) -> np.ndarray:
+        index, ids = self.index, self.ids
+        codes = []
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(ids)
+                ids.append(value)
+            codes.append(code)
+        return np.array(codes, dtype=np.int32)
+
+    def sorted_remap(self):
+        """(ids in sorted order, array mapping first-seen code -> sorted code)."""
+        ids = np.array(self.ids, dtype=object)
+        order = np.argsort(ids, kind="stable")
+        remap = np.empty(len(ids), dtype=np.int32)
+        remap[order] = np.arange(len(ids), dtype=np.int32)
+        return ids[order], remap
+
+class InteractionLog:
+    """Integer-coded (user, sound) pairs with their id vocabularies and newest created_at."""
+
+    def __init__(self, user_codes, item_codes, user_ids, item_ids, watermark=None):
+        self.user_codes = user_codes
+        self.item_codes = item_codes
+        self.user_ids = user_ids
+        self.item_ids = item_ids
+        self.watermark = watermark
+
+    def __len__(self):
+        return len(self.user_codes)
+
+def read_interactions(reader: PagedReader, apply=None, columns: str = "user_id, sound_id, created_at", order: str = "id"):
+    """
+    Streams `user_interactions` into integer-coded NumPy arrays.
+    Each page is encoded as soon as it arrives, so memory is the code arrays plus the
+    id vocabularies, never the full list of row dicts. Codes are sorted-id ordered.
+    """
+    users, items = IdEncoder(), IdEncoder()
+    user_chunks, item_chunks = [], []
+    watermark = None
+    for rows in reader.iter_pages("user_interactions", columns, order=order, apply=apply):
+        user_chunks.append(users.encode(row['user_id'] for row in rows))
+        item_chunks.append(items.encode(row['sound_id'] for row in rows))
+        page_max = max((row.get('created_at') for row in rows if row.get('created_at')), default=None)
+        if page_max is not None and (watermark is None or page_max > watermark):
+            watermark = page_max
+
+    user_ids, user_remap = users.sorted_remap()
+    item_ids, item_remap = items.sorted_remap()
+    user_codes = user_remap[np.concatenate(user_chunks)] if user_chunks else np.empty(0, dtype=np.int32)
+    item_codes = item_remap[np.concatenate(item_chunks)] if item_chunks else np.empty(0, dtype=np.int32)
+    return InteractionLog(user_codes, item_codes, user_ids, item_ids, watermark)
@@ -1,6 +1,10 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from services.recommendation_engine import RecommenderSystem
+from services.vector_index import SoundVectorIndex
+from services.analysis_store import AnalysisStore
+from core.model_registry import ModelRegistry
 from datetime import datetime
+import os
 
 def retrain_task():
     """
@@ -8,16 +12,44 @@ def retrain_task():
     Accesses the singleton RecommenderSystem to refresh the collaborative filtering matrix
     with the latest user interaction data from the database.
     """
+    if not ModelRegistry.get_instance().is_loaded("recommender"):
+        return  # disabled, or lazy and not in use on this worker: nothing to keep fresh
     print(f"\n🔄 [Auto-Pipeline] Starting scheduled model retraining at {datetime.now()}...")
     
     recommender = RecommenderSystem.get_instance()
     
-    # Triggers the mock training sequence to update the in-memory similarity matrix
-    recommender.train_mock_model()
+    # Adopts a fresh artifact another worker just published, otherwise retrains (and republishes it)
+    outcome = recommender.refresh()
     
-    print(f"✅ [Auto-Pipeline] Retraining complete. Model updated in-memory.\n")
+    print(f"✅ [Auto-Pipeline] Retraining complete ({outcome}). Model updated in-memory.\n")
 
-def start_scheduler():
+def incremental_update_task():
+    """
+    Folds interactions logged since the last update into the live recommendation model,
+    so new plays shape recommendations within minutes instead of waiting for the full retrain.
+    """
+    if ModelRegistry.get_instance().is_loaded("recommender"):
+        RecommenderSystem.get_instance().update_incremental()
+
+def unload_idle_models_task(idle_minutes):
+    """Frees lazily loaded models this worker has not used recently (see core/model_registry.py)."""
+    unloaded = ModelRegistry.get_instance().unload_idle(idle_minutes * 60)
+    if unloaded:
+        print(f"♻️ [Auto-Pipeline] Unloaded idle models: {', '.join(unloaded)}")
+
+def refresh_index_task(supabase):
+    """
+    Rebuilds the in-process sound vector index so newly ingested sounds become searchable
+    without a restart. The previous index keeps serving until the rebuild completes.
+    """
+    print(f"\n🔄 [Auto-Pipeline] Refreshing vector index at {datetime.now()}...")
+    SoundVectorIndex.get_instance().build(supabase)
+
+def refresh_analysis_task(supabase):
+    """Reloads precomputed analysis results written by ingestion or the precompute job."""
+    AnalysisStore.get_instance().build(supabase)
+
+def start_scheduler(supabase=None):
     """
     Initializes and starts the background task scheduler.
     Configures the retraining interval to ensure the recommendation engine remains 
@@ -26,6 +58,16 @@ def start_scheduler():
     scheduler = BackgroundScheduler()
     
     scheduler.add_job(retrain_task, 'interval', minutes=30)
+    update_minutes = int(os.getenv("AURA_RECOMMENDER_UPDATE_MINUTES", "5"))
+    if update_minutes > 0:
+        scheduler.add_job(incremental_update_task, 'interval', minutes=update_minutes)
+    if supabase is not None and SoundVectorIndex.is_enabled():
+        scheduler.add_job(refresh_index_task, 'interval', minutes=30, args=[supabase])
+    idle_minutes = float(os.getenv("AURA_MODEL_IDLE_MINUTES", "0"))
+    if idle_minutes > 0:
+        scheduler.add_job(unload_idle_models_task, 'interval', minutes=max(1.0, idle_minutes / 2), args=[idle_minutes])
+    if supabase is not None:
+        scheduler.add_job(refresh_analysis_task, 'interval', minutes=30, args=[supabase])
     
     scheduler.start()
     print("🕒 AI Retraining Scheduler Started (Runs every 30 mins)")
\ No newline at end of file
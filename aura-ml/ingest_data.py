@@ -6,6 +6,8 @@ Pipeline Stages:
 1. Retrieval: Query Freesound API for high-quality audio metadata and preview links.
 2. Vectorization: Generate semantic embeddings for sound descriptions using 'all-MiniLM-L6-v2'.
 3. Persistence: Upsert structured assets (metadata + embeddings) into the Supabase 'sounds' table.
+4. Analysis (optional, PRECOMPUTE_ANALYSIS=1): Store waveform / AST / CNN results alongside each row
+   so the API can serve them without live inference (see scripts/precompute_analysis.py).
 """
 
 import os
@@ -19,6 +21,7 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY") 
 FREESOUND_API_KEY = os.getenv("FREESOUND_API_KEY")
+PRECOMPUTE_ANALYSIS = os.getenv("PRECOMPUTE_ANALYSIS", "0") == "1"
 
 if not SUPABASE_URL or not SUPABASE_KEY or not FREESOUND_API_KEY:
     print("Error: Missing API Keys in .env file")
@@ -78,6 +81,11 @@ def run_pipeline():
                 "duration_seconds": int(duration),
                 "embedding": vector,
             }
+
+            if PRECOMPUTE_ANALYSIS:
+                from services.analysis_store import compute_analysis
+                results = compute_analysis(file_url)
+                data.update({column: value for column, value in results.items() if value is not None})
             
             try:
                 supabase.table("sounds").upsert(data, on_conflict="file_url").execute()
@@ -6,6 +6,8 @@ It facilitates communication between the Next.js frontend and various specialize
 
 Architecture:
 - Framework: FastAPI (High-performance, async-ready web framework).
+- Concurrency: I/O-bound endpoints are `async def` (async Supabase client, pooled httpx downloads);
+  CPU-bound inference is offloaded explicitly to a dedicated inference thread pool.
 - Security: Global API Key validation via 'x-api-key' header middleware.
 - Data Layer: Direct integration with Supabase for vector search and metadata retrieval.
 - AI Logic: Coordinates multiple specialized services:
@@ -16,29 +18,52 @@ Architecture:
     - Sentiment Analysis (TextBlob)
 
 Lifecycle:
-- The `lifespan` context manager ensures all heavy ML models are pre-loaded ("warmed up")
-  during server startup to minimize latency for the first user request.
+- Every model is owned by the ModelRegistry, which applies a per-model load policy
+  (eager / lazy / disabled, AURA_MODEL_POLICY) and an overall memory budget.
+- Importing this module is cheap: heavy libraries (torch, transformers, sentence_transformers,
+  sklearn, textblob) are imported by the services on first model load, and no client or model
+  is created at import time.
+- The `lifespan` context manager starts serving immediately and warms the eager models and
+  local indexes in a background thread (AURA_BACKGROUND_WARMUP=0 blocks startup until warm).
+  `/ready` reports when the warm-up has finished.
 """
 
+import time
+_import_started = time.perf_counter()
+
 import os
+import threading
 import json
-from fastapi import FastAPI, HTTPException, Security, Depends
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Security, Depends, Request
+from fastapi.responses import JSONResponse
 from fastapi.security.api_key import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from supabase import create_client, Client
-from sentence_transformers import SentenceTransformer
+from pydantic import BaseModel, ValidationError, conint, conlist
+from typing import List, Optional
+from supabase import create_client, acreate_client, Client, AsyncClient
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
 # Services
-from services.audio_classifier import predict_sound_class
-from services.custom_cnn import predict_with_custom_model
+from services.audio_classifier import AudioClassifier, predict_sound_class, predict_sound_classes
+from services.feature_cache import FeatureCache
+from services.custom_cnn import predict_with_custom_model, predict_windowed, CustomModelLoader
 from services.recommendation_engine import RecommenderSystem
-from services.audio_processor import extract_waveform
-from services.emotion_classifier import detect_emotion
+from services.audio_processor import extract_waveform, extract_waveform_levels, MAX_POINTS, MAX_LEVELS
+from services.emotion_classifier import EmotionClassifier, detect_emotion, detect_emotions, dominant_emotion
+from services.face_session import FaceSessionStore
 from services.sentiment_analyzer import analyze_sentiment
+from services.vector_index import SoundVectorIndex
+from services.embedding_cache import EmbeddingCache
+from services.batch_encoder import BatchEncoder
 from core.scheduler import start_scheduler
+from core.http_client import close_http_client
+from core.model_registry import ModelRegistry, ModelDisabledError
+from services.audio_loader import AudioLoader
+from services.analysis_store import AnalysisStore
 
 # -------------------------------------------------
 # 1. Environment Configuration
@@ -84,35 +109,152 @@ async def verify_api_key(api_key_header: str = Security(api_key_header)):
 # -------------------------------------------------
 url = os.getenv("SUPABASE_URL")
 key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(url, key)
+# Both Supabase clients are created during `lifespan`, never at import time:
+# the sync client feeds index builds and the scheduler, the async one serves request handlers.
+supabase: Client = None
+supabase_async: AsyncClient = None
+
+# Startup timeline (seconds), reported by /admin/metrics and scripts/profile_startup.py
+startup_profile = {"import_seconds": None, "serving_seconds": None, "warm_seconds": None, "warm_done": False}
+
+# CPU-bound model calls run here so they never compete with the event loop or the anyio I/O pool
+inference_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AURA_INFERENCE_WORKERS", str(os.cpu_count() or 4))),
+    thread_name_prefix="inference",
+)
+
+async def run_inference(func, *args, **kwargs):
+    """Offloads a blocking inference call to the inference pool and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, functools.partial(func, *args, **kwargs))
 
-print("Loading AI Model (all-MiniLM-L6-v2)...")
-model = SentenceTransformer('all-MiniLM-L6-v2')
-print("AI Model Loaded.")
+async def prefetch_audio(file_url: str):
+    """
+    Non-blocking download into the shared AudioLoader cache, so the inference thread only decodes.
+    Failures are swallowed here; the service re-raises them in its usual response format.
+    """
+    try:
+        await AudioLoader.get_instance().afetch_bytes(file_url)
+    except Exception as e:
+        print(f"⚠️ Async download failed for {file_url[:50]}: {e}")
+
+models = ModelRegistry.get_instance()
+
+_text_model = None
+
+def load_text_model():
+    global _text_model
+    if _text_model is None:
+        print("Loading AI Model (all-MiniLM-L6-v2)...")
+        from sentence_transformers import SentenceTransformer
+        _text_model = SentenceTransformer('all-MiniLM-L6-v2')
+        print("AI Model Loaded.")
+    return _text_model
+
+def unload_text_model():
+    global _text_model
+    _text_model = None
+
+models.register("text_encoder", load_text_model, unload_text_model, default_policy="eager")
+
+# Every endpoint encodes text through this cache, never through the model directly.
+# Cache misses are coalesced by the micro-batching scheduler into one forward pass per batch;
+# the encoder resolves the model through the registry, so it is loaded (or reloaded) on demand.
+batch_encoder = BatchEncoder(models.handle("text_encoder"))
+embedding_cache = EmbeddingCache(batch_encoder, max_size=int(os.getenv("AURA_EMBEDDING_CACHE_SIZE", "2048")))
+
+# Face DJ session mode (?session_id=...): skip unchanged frames, smooth emotions, cache mixes per emotion
+face_sessions = FaceSessionStore(
+    alpha=float(os.getenv("AURA_FACE_EMA_ALPHA", "0.3")),
+    hash_distance=int(os.getenv("AURA_FACE_HASH_DISTANCE", "4")),
+    ttl_seconds=float(os.getenv("AURA_FACE_SESSION_TTL_SECONDS", "600")),
+    mix_ttl_seconds=float(os.getenv("AURA_FACE_MIX_TTL_SECONDS", "300")),
+)
 
-recommender = RecommenderSystem.get_instance()
+# Face DJ: detected emotion -> sonic search query
+EMOTION_VIBES = {
+    "happy": "energetic upbeat sunny",
+    "sad": "comforting rain cozy",
+    "angry": "calm zen meditation",
+    "fear": "safe reassuring warm",
+    "surprise": "magical ethereal",
+    "neutral": "focus deep work",
+    "disgust": "cleansing water fresh"
+}
+DEFAULT_VIBE = "relaxing"
+
+async def match_sounds(query_vector, match_threshold: float, match_count: int):
+    """
+    Vector search over the sound library.
+    Served from the in-process index once it is warm; otherwise falls back to the `match_sounds` RPC.
+    """
+    index = SoundVectorIndex.get_instance()
+    if index.ready:
+        return index.query(query_vector, match_threshold, match_count)
+    index.record_fallback()
+
+    if not isinstance(query_vector, list):
+        query_vector = query_vector.tolist()
+    response = await supabase_async.rpc("match_sounds", {
+        "query_embedding": query_vector,
+        "match_threshold": match_threshold,
+        "match_count": match_count,
+    }).execute()
+    return response.data
 
 # -------------------------------------------------
 # 4. Application Lifecycle Management
 # -------------------------------------------------
+def warm_up():
+    """
+    Model Warm-up: loads the eager models, pins the Face DJ queries and builds the local indexes.
+    Requests arriving meanwhile are still served, because the event loop never waits on a model:
+    routes resolve models inside `run_inference` (text embeddings in the batch encoder's thread), so
+    a request for a model that is still loading (e.g. the recommender's DB fetch + SVD) blocks one
+    worker thread on the registry lock while `/`, `/ready` and other routes keep responding. Vector search falls back to the
+    `match_sounds` RPC until the index is ready.
+    """
+    started = time.perf_counter()
+    # Eager models load now; lazy ones on first use, disabled ones never
+    models.warm()
+    if models.is_loaded("text_encoder"):
+        try:
+            embedding_cache.warm([*EMOTION_VIBES.values(), DEFAULT_VIBE])
+        except Exception as e:
+            print(f"⚠️ Embedding cache warm-up failed: {e}")
+    if SoundVectorIndex.is_enabled():
+        SoundVectorIndex.get_instance().build(supabase)
+    AnalysisStore.get_instance().build(supabase)
+    startup_profile["warm_seconds"] = round(time.perf_counter() - started, 3)
+    startup_profile["warm_done"] = True
+    print(f"🔥 Warm-up complete in {startup_profile['warm_seconds']:.2f}s")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Context Manager for Startup/Shutdown events.
-    Crucial for 'Model Warm-up': Triggers the loading of heavy Neural Networks
-    into memory BEFORE the server accepts traffic, preventing cold-start lag.
+    Opens the Supabase clients and starts accepting traffic right away; the heavy
+    Neural Networks are warmed up in the background (see `warm_up`).
     """
+    global supabase, supabase_async
+    started = time.perf_counter()
     print("🚀 Starting Aura AI Services...")
-    # Warm up models
-    _ = RecommenderSystem.get_instance()
-    from services.audio_classifier import AudioClassifier
-    AudioClassifier.get_instance()
-    from services.emotion_classifier import EmotionClassifier
-    EmotionClassifier.get_instance()
-    
-    start_scheduler()
+    supabase = create_client(url, key)
+    supabase_async = await acreate_client(url, key)
+
+    if os.getenv("AURA_BACKGROUND_WARMUP", "1") == "1":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    else:
+        warm_up()
+
+    start_scheduler(supabase)
+    startup_profile["serving_seconds"] = round(time.perf_counter() - started, 3)
     yield
     print("🛑 Shutting down Aura AI Services...")
+    batch_encoder.close()
+    models.unload_all()
+    await close_http_client()
+    inference_executor.shutdown(wait=False)
 
 # -------------------------------------------------
 # 5. FastAPI Application Construction
@@ -120,6 +262,19 @@ async def lifespan(app: FastAPI):
 # Dependencies are applied globally to protect all routes by default
 app = FastAPI(lifespan=lifespan, dependencies=[Depends(verify_api_key)])
 
+@app.exception_handler(ModelDisabledError)
+async def model_disabled_handler(request: Request, exc: ModelDisabledError):
+    """Routes that need a model this worker does not serve answer 503, so a balancer can retry elsewhere."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+def requires(*names):
+    """Route dependency: fails fast with 503 when a model the route needs is disabled here."""
+    def check():
+        for name in names:
+            if models.policy(name) == "disabled":
+                raise ModelDisabledError(f"Model '{name}' is disabled on this worker (AURA_MODEL_POLICY)")
+    return Depends(check)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -139,15 +294,62 @@ class SearchQuery(BaseModel):
 class AnalysisRequest(BaseModel):
     file_url: str
 
+class ClassifyRequest(BaseModel):
+    file_url: str
+    top_k: int = 5
+    aggregate: str = "label"  # "label" (raw AudioSet classes) or "vibe" (summed per vibe)
+
+class BatchAnalysisRequest(BaseModel):
+    file_urls: List[str]
+    batch_size: int = 8
+    top_k: int = 5
+    aggregate: str = "label"
+
+class CustomClassifyRequest(BaseModel):
+    file_url: str
+    windowed: bool = False     # classify the full file in 1-second windows instead of the first second
+    hop_seconds: float = 0.5
+    pooling: str = "mean"      # "mean" or "max" over window probabilities
+
+class WaveformLevelsRequest(BaseModel):
+    file_url: str
+    levels: conlist(conint(ge=1, le=MAX_POINTS), min_length=1, max_length=MAX_LEVELS) = [50, 200, 1000]
+    mode: str = "mean"
+
 class RecommendRequest(BaseModel):
     sound_id: str
+    alpha: Optional[float] = None  # collaborative weight in the hybrid blend (default AURA_RECOMMENDER_HYBRID_ALPHA)
+
+class BatchRecommendRequest(BaseModel):
+    sound_ids: List[str]
+    top_k: int = 4
+    alpha: Optional[float] = None
 
 class FindSimilarRequest(BaseModel):
     sound_id: str
     match_count: int = 10
 
 class FaceRequest(BaseModel):
-    image: str
+    image: str  # base64 or data URL (raw image bodies are accepted too, see read_face_frames)
+
+class FaceBatchRequest(BaseModel):
+    images: List[str]
+
+def face_body_openapi(model, field: str, raw: bool):
+    """
+    OpenAPI request body for the face endpoints: they read the body themselves (see read_face_frames),
+    so the accepted encodings are declared here to keep the frame payload documented in /docs.
+    """
+    binary = {"type": "string", "format": "binary"}
+    upload = binary if raw else {"type": "array", "items": binary}
+    content = {
+        "application/json": {"schema": model.model_json_schema()},
+        "multipart/form-data": {"schema": {"type": "object", "required": [field], "properties": {field: upload}}},
+    }
+    if raw:
+        content["image/*"] = {"schema": binary}
+        content["application/octet-stream"] = {"schema": binary}
+    return {"requestBody": {"required": True, "content": content}}
 
 class SentimentRequest(BaseModel):
     text: str
@@ -159,13 +361,13 @@ class MixRequest(BaseModel):
 # 7. Endpoint Definitions
 # -------------------------------------------------
 
-@app.post("/search-knowledge")
-def search_knowledge(payload: SearchQuery):
+@app.post("/search-knowledge", dependencies=[requires("text_encoder")])
+async def search_knowledge(payload: SearchQuery):
     """Retrieves standard RAG knowledge snippets based on semantic similarity."""
     try:
         print(f"📚 Searching Knowledge for: {payload.query}")
-        query_vector = model.encode(payload.query).tolist()
-        response = supabase.rpc("match_knowledge", {
+        query_vector = (await embedding_cache.aencode(payload.query)).tolist()
+        response = await supabase_async.rpc("match_knowledge", {
             "query_embedding": query_vector,
             "match_threshold": 0.3,
             "match_count": 3
@@ -175,114 +377,273 @@ def search_knowledge(payload: SearchQuery):
         print(f"Knowledge Search Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/search")
-def search_sounds(payload: SearchQuery):
+@app.post("/search", dependencies=[requires("text_encoder")])
+async def search_sounds(payload: SearchQuery):
     """Semantic Search entry point. Converts text queries to vectors and scans the Supabase index."""
     try:
         print(f"Searching for: {payload.query}")
-        query_vector = model.encode(payload.query).tolist()
-        response = supabase.rpc("match_sounds", {
-            "query_embedding": query_vector,
-            "match_threshold": payload.match_threshold,
-            "match_count": payload.match_count,
-        }).execute()
-        return {"results": response.data}
+        query_vector = await embedding_cache.aencode(payload.query)
+        results = await match_sounds(query_vector, payload.match_threshold, payload.match_count)
+        return {"results": results}
     except Exception as e:
         print(f"Search Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/analyze-waveform")
-def analyze_audio(payload: AnalysisRequest):
+async def analyze_audio(payload: AnalysisRequest):
     """Extracts a simplified visual waveform (amplitude vs time) from an audio file."""
+    stored = AnalysisStore.get_instance().get(payload.file_url, "waveform")
+    if stored is not None:
+        return {"waveform": stored}
     try:
-        waveform = extract_waveform(payload.file_url, n_points=50)
+        await prefetch_audio(payload.file_url)
+        waveform = await run_inference(extract_waveform, payload.file_url, 50)
         return {"waveform": waveform}
     except Exception as e:
         print(f"Error in analyze_audio: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/classify-audio")
-def classify_audio(payload: AnalysisRequest):
+@app.post("/analyze-waveform/levels")
+async def analyze_audio_levels(payload: WaveformLevelsRequest):
+    """Multi-resolution waveform (e.g. 50/200/1000 points) for zoomable UIs, computed in one decode pass."""
+    if payload.mode not in ("mean", "rms", "peak"):
+        raise HTTPException(status_code=422, detail="mode must be one of: mean, rms, peak")
+    try:
+        await prefetch_audio(payload.file_url)
+        levels = await run_inference(extract_waveform_levels, payload.file_url, payload.levels, payload.mode)
+        return {"levels": {str(n): points for n, points in levels.items()}}
+    except Exception as e:
+        print(f"Error in analyze_audio_levels: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def is_default_classification(top_k: int, aggregate: str) -> bool:
+    """Precomputed AST results are the default top-5 raw-label predictions."""
+    return top_k == 5 and aggregate == "label"
+
+@app.post("/classify-audio", dependencies=[requires("ast")])
+async def classify_audio(payload: ClassifyRequest):
     """Runs the primary AST model to tag audio files with 'Vibe' labels."""
-    predictions = predict_sound_class(payload.file_url)
+    if payload.aggregate not in ("label", "vibe"):
+        raise HTTPException(status_code=422, detail="aggregate must be 'label' or 'vibe'")
+    if is_default_classification(payload.top_k, payload.aggregate):
+        stored = AnalysisStore.get_instance().get(payload.file_url, "ast_predictions")
+        if stored is not None:
+            return {"predictions": stored}
+    await prefetch_audio(payload.file_url)
+    predictions = await run_inference(predict_sound_class, payload.file_url, payload.top_k, payload.aggregate)
     return {"predictions": predictions}
 
-@app.post("/classify-custom")
-def classify_custom(payload: AnalysisRequest):
-    """Runs the specialized UrbanSound8K Custom CNN inference pipeline."""
-    return predict_with_custom_model(payload.file_url)
-
-@app.post("/recommend")
-def get_recommendations(payload: RecommendRequest):
-    """Generates personalized recommendations based on the SVD collaborative filtering matrix."""
-    recommended_ids = recommender.recommend_for_sound(payload.sound_id)
-    response = supabase.table("sounds").select("*").in_("id", recommended_ids).execute()
+@app.post("/classify-audio/batch", dependencies=[requires("ast")])
+async def classify_audio_batch(payload: BatchAnalysisRequest):
+    """
+    Catalogue tagging: classifies many files in one call. Stored results are reused; the rest are
+    downloaded concurrently and run through AST in batches.
+    """
+    max_files = int(os.getenv("AURA_BATCH_MAX_FILES", "64"))
+    if len(payload.file_urls) > max_files:
+        raise HTTPException(status_code=422, detail=f"At most {max_files} files per batch")
+    if payload.aggregate not in ("label", "vibe"):
+        raise HTTPException(status_code=422, detail="aggregate must be 'label' or 'vibe'")
+
+    store = AnalysisStore.get_instance()
+    use_stored = is_default_classification(payload.top_k, payload.aggregate)
+    stored = {url: store.get(url, "ast_predictions") if use_stored else None for url in payload.file_urls}
+    pending = list(dict.fromkeys(url for url, preds in stored.items() if preds is None))
+
+    await asyncio.gather(*(prefetch_audio(url) for url in pending))
+    batch_size = max(1, min(payload.batch_size, 32))
+    live = await run_inference(predict_sound_classes, pending, batch_size=batch_size, top_k=payload.top_k, aggregate=payload.aggregate)
+    stored.update({item["file_url"]: item["predictions"] for item in live})
+
+    return {"results": [{"file_url": url, "predictions": stored[url]} for url in payload.file_urls]}
+
+@app.post("/classify-custom", dependencies=[requires("custom_cnn")])
+async def classify_custom(payload: CustomClassifyRequest):
+    """
+    Runs the specialized UrbanSound8K Custom CNN inference pipeline.
+    With `windowed`, the whole file is classified in one batched pass over 1-second windows
+    and per-window plus pooled probabilities are returned.
+    """
+    if payload.windowed:
+        if payload.hop_seconds <= 0:
+            raise HTTPException(status_code=400, detail="hop_seconds must be positive")
+        await prefetch_audio(payload.file_url)
+        return await run_inference(
+            predict_windowed, payload.file_url, hop_seconds=payload.hop_seconds, pooling=payload.pooling
+        )
+    stored = AnalysisStore.get_instance().get(payload.file_url, "cnn_prediction")
+    if stored is not None:
+        return stored
+    await prefetch_audio(payload.file_url)
+    return await run_inference(predict_with_custom_model, payload.file_url)
+
+# Both run in the inference pool: resolving the recommender may train it (DB read + SVD) on first use
+# under the `lazy` policy, and scoring is a full-catalogue matmul. Neither may run on the event loop.
+def recommend_for_sound(sound_id: str, alpha: Optional[float]):
+    return RecommenderSystem.get_instance().recommend_for_sound(sound_id, alpha=alpha)
+
+def recommend_many(sound_ids, top_k: int, alpha: Optional[float]):
+    return RecommenderSystem.get_instance().recommend_many(sound_ids, top_k=top_k, alpha=alpha)
+
+@app.post("/recommend", dependencies=[requires("recommender")])
+async def get_recommendations(payload: RecommendRequest):
+    """Generates recommendations by blending SVD collaborative filtering with sound embedding similarity."""
+    recommended_ids = await run_inference(recommend_for_sound, payload.sound_id, payload.alpha)
+    response = await supabase_async.table("sounds").select("*").in_("id", recommended_ids).execute()
     return {"recommendations": response.data}
 
+@app.post("/recommend/batch", dependencies=[requires("recommender")])
+async def get_recommendations_batch(payload: BatchRecommendRequest):
+    """
+    Recommendations for many sounds in one call (e.g. a whole playlist or feed page).
+    All sounds are scored in one vectorized pass; sound rows are fetched with a single query.
+    """
+    max_ids = int(os.getenv("AURA_BATCH_MAX_FILES", "64"))
+    if len(payload.sound_ids) > max_ids:
+        raise HTTPException(status_code=422, detail=f"At most {max_ids} sounds per batch")
+    top_k = max(1, min(payload.top_k, 50))
+
+    recommended = await run_inference(recommend_many, payload.sound_ids, top_k=top_k, alpha=payload.alpha)
+    all_ids = list(dict.fromkeys(i for ids in recommended.values() for i in ids))
+    rows = {}
+    if all_ids:
+        response = await supabase_async.table("sounds").select("*").in_("id", all_ids).execute()
+        rows = {row["id"]: row for row in response.data}
+
+    return {"results": [
+        {"sound_id": sound_id, "recommendations": [rows[i] for i in recommended[sound_id] if i in rows]}
+        for sound_id in payload.sound_ids
+    ]}
+
 @app.post("/find-similar")
-def find_similar(payload: FindSimilarRequest):
+async def find_similar(payload: FindSimilarRequest):
     """Finds chemically similar sounds using vector distance (Latent Space traversal)."""
     try:
         print(f"🔍 Finding similar for: {payload.sound_id}")
-        source_response = supabase.table("sounds").select("embedding").eq("id", payload.sound_id).execute()
+        index = SoundVectorIndex.get_instance()
+        if index.ready and payload.sound_id in index.rows:
+            query_vector = index.get_embedding(payload.sound_id)
+            if query_vector is None:
+                random_response = await supabase_async.table("sounds").select("*").limit(4).execute()
+                return {"results": random_response.data}
+            results = await match_sounds(query_vector, 0.3, payload.match_count)
+            return {"results": [s for s in results if s['id'] != payload.sound_id]}
+
+        source_response = await supabase_async.table("sounds").select("embedding").eq("id", payload.sound_id).execute()
         
         if not source_response.data:
             raise HTTPException(status_code=404, detail="Source sound not found")
             
         embedding_data = source_response.data[0]['embedding']
         if not embedding_data:
-            random_response = supabase.table("sounds").select("*").limit(4).execute()
+            random_response = await supabase_async.table("sounds").select("*").limit(4).execute()
             return {"results": random_response.data}
 
         query_vector = json.loads(embedding_data) if isinstance(embedding_data, str) else embedding_data
 
-        response = supabase.rpc("match_sounds", {
-            "query_embedding": query_vector,
-            "match_threshold": 0.3,
-            "match_count": payload.match_count,
-        }).execute()
-
-        results = [s for s in response.data if s['id'] != payload.sound_id]
+        results = await match_sounds(query_vector, 0.3, payload.match_count)
+        results = [s for s in results if s['id'] != payload.sound_id]
         return {"results": results}
     except Exception as e:
         print(f"❌ Find Similar Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/analyze-face")
-def analyze_face(payload: FaceRequest):
+async def read_face_frames(request: Request, model, field: str):
+    """
+    Face frames from any accepted encoding (raw bytes skip the ~33% base64 overhead and its decode):
+    - application/json: `model` body (base64 strings or data URLs)
+    - multipart/form-data: image files under `field`
+    - image/* or application/octet-stream: the raw image as the whole body (one frame)
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        return [await upload.read() for upload in form.getlist(field) if hasattr(upload, "read")]
+    if content_type.startswith(("image/", "application/octet-stream")):
+        return [await request.body()]
+    try:
+        payload = model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    value = getattr(payload, field)
+    return value if isinstance(value, list) else [value]
+
+async def face_mix(emotion: str):
+    """Maps an emotion to its sonic 'scenario' and retrieves a matching soundscape (cached per emotion)."""
+    mix = face_sessions.cached_mix(emotion)
+    if mix is not None:
+        return mix
+    search_query = EMOTION_VIBES.get(emotion, DEFAULT_VIBE)
+    print(f"🎭 Face: {emotion} -> 🎵 DJ Query: {search_query}")
+    query_vector = await embedding_cache.aencode(search_query)
+    mix = await match_sounds(query_vector, 0.20, 4)
+    face_sessions.store_mix(emotion, mix)
+    return mix
+
+@app.post("/analyze-face", dependencies=[requires("emotion", "text_encoder")],
+          openapi_extra=face_body_openapi(FaceRequest, "image", raw=True))
+async def analyze_face(request: Request, session_id: Optional[str] = None):
     """
     Multimodal Pipeline: Face -> Emotion -> Sound.
-    1. Detects emotion from the input image.
+    1. Detects emotion from the input image (JSON base64 or a raw image body).
     2. Maps emotion to a sonic 'scenario'.
     3. Retrieves a matching soundscape using vector search.
+
+    With `?session_id=...` (webcam streams), unchanged frames skip inference, the emotion is
+    smoothed over recent frames, and the mix is only re-queried when the smoothed emotion changes.
     """
+    frames = await read_face_frames(request, FaceRequest, "image")
+    if len(frames) != 1:
+        raise HTTPException(status_code=422, detail="Exactly one image expected")
     try:
-        emotion_data = detect_emotion(payload.image)
+        if session_id:
+            state = await run_inference(face_sessions.observe, session_id, frames[0])
+            mix = state['mix']
+            if state['changed'] or mix is None:
+                mix = await face_mix(state['label'])
+                face_sessions.set_mix(session_id, mix)
+            return {
+                "emotion": state['label'],
+                "confidence": state['score'],
+                "mix": mix,
+                "session": {"inferred": state['inferred'], "changed": state['changed']}
+            }
+
+        emotion_data = await run_inference(detect_emotion, frames[0])
         emotion = emotion_data['label']
-        
-        vibe_map = {
-            "happy": "energetic upbeat sunny",
-            "sad": "comforting rain cozy",
-            "angry": "calm zen meditation",
-            "fear": "safe reassuring warm",
-            "surprise": "magical ethereal",
-            "neutral": "focus deep work",
-            "disgust": "cleansing water fresh"
-        }
-        search_query = vibe_map.get(emotion, "relaxing")
-        print(f"🎭 Face: {emotion} -> 🎵 DJ Query: {search_query}")
-
-        query_vector = model.encode(search_query).tolist()
-        response = supabase.rpc("match_sounds", {
-            "query_embedding": query_vector,
-            "match_threshold": 0.20,
-            "match_count": 4
-        }).execute()
+        mix = await face_mix(emotion)
 
         return {
             "emotion": emotion,
             "confidence": emotion_data['score'],
-            "mix": response.data
+            "mix": mix
+        }
+    except Exception as e:
+        print(f"Face Analysis Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze-face/batch", dependencies=[requires("emotion", "text_encoder")],
+          openapi_extra=face_body_openapi(FaceBatchRequest, "images", raw=False))
+async def analyze_face_batch(request: Request):
+    """
+    Several webcam frames in one call (JSON {"images": [...]} or multipart files under "images").
+    All frames run through the vision model in batched forward passes; the mix is retrieved once,
+    for the emotion with the highest total score across the frames.
+    """
+    frames = await read_face_frames(request, FaceBatchRequest, "images")
+    max_frames = int(os.getenv("AURA_FACE_MAX_FRAMES", "16"))
+    if not frames or len(frames) > max_frames:
+        raise HTTPException(status_code=422, detail=f"Between 1 and {max_frames} images per batch")
+    try:
+        results = await run_inference(detect_emotions, frames)
+        dominant = dominant_emotion(results)
+        mix = await face_mix(dominant['label'])
+
+        return {
+            "emotion": dominant['label'],
+            "confidence": dominant['score'],
+            "frames": [{"emotion": r['label'], "confidence": r['score']} for r in results],
+            "mix": mix
         }
     except Exception as e:
         print(f"Face Analysis Error: {e}")
@@ -293,8 +654,8 @@ def get_sentiment(payload: SentimentRequest):
     """Analyzes text input for polarity and returns simple sentiment labels."""
     return analyze_sentiment(payload.text)
 
-@app.post("/generate-mix")
-def generate_mix(payload: MixRequest):
+@app.post("/generate-mix", dependencies=[requires("text_encoder")])
+async def generate_mix(payload: MixRequest):
     """
     'Surprise Me' Logic.
     Generates a curated 4-track mix based on an abstract user scenario (e.g., 'Focus', 'Relax').
@@ -303,17 +664,10 @@ def generate_mix(payload: MixRequest):
     try:
         import random
         print(f"🎛️ Generating mix for: {payload.scenario}")
-        query_vector = model.encode(payload.scenario).tolist()
-        
-        response = supabase.rpc("match_sounds", {
-            "query_embedding": query_vector,
-            "match_threshold": 0.25,
-            "match_count": 20
-        }).execute()
-
-        candidates = response.data
+        query_vector = await embedding_cache.aencode(payload.scenario)
+        candidates = await match_sounds(query_vector, 0.25, 20)
         if len(candidates) < 4:
-            random_res = supabase.table("sounds").select("*").limit(10).execute()
+            random_res = await supabase_async.table("sounds").select("*").limit(10).execute()
             candidates.extend(random_res.data)
 
         selected_sounds = []
@@ -336,18 +690,50 @@ def generate_mix(payload: MixRequest):
         print(f"Mix Gen Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/admin/retrain")
-def force_retrain():
-    """Manual trigger endpoint for Admin users to force a model refresh."""
+@app.post("/admin/retrain", dependencies=[requires("recommender")])
+def force_retrain(incremental: bool = False):
+    """
+    Manual trigger endpoint for Admin users to force a model refresh.
+    `?incremental=true` only folds in interactions newer than the model's watermark.
+    """
     try:
         print("⚡ Manual Retraining Triggered by Admin")
         recommender = RecommenderSystem.get_instance()
+        if incremental:
+            mode = recommender.update_incremental()
+            return {"status": "success", "message": f"Model updated ({mode})."}
         recommender.train_mock_model()
         return {"status": "success", "message": "Model retrained."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/admin/metrics")
+def get_metrics():
+    """Operational counters for the serving caches and per-model residency."""
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "encoder": batch_encoder.stats(),
+        "audio_loader": AudioLoader.get_instance().stats(),
+        "vector_index": SoundVectorIndex.get_instance().stats(),
+        "custom_cnn": {"mode": CustomModelLoader.mode, "parity": CustomModelLoader.parity},
+        "emotion": {"backend": EmotionClassifier.backend, "parity": EmotionClassifier.parity},
+        "ast": {"backend": AudioClassifier.backend, "parity": AudioClassifier.parity,
+                "feature_cache": FeatureCache.get_instance().stats()},
+        "models": models.stats(),
+        "face_sessions": face_sessions.stats(),
+        "startup": startup_profile,
+    }
+
 @app.get("/")
 def read_root():
     """Health check endpoint."""
-    return {"status": "Aura ML Brain is Online 🧠"}
\ No newline at end of file
+    return {"status": "Aura ML Brain is Online 🧠"}
+
+@app.get("/ready")
+def read_ready():
+    """Readiness probe: 503 until the background warm-up has loaded the eager models and indexes."""
+    if not startup_profile["warm_done"]:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready", "startup": startup_profile}
+
+startup_profile["import_seconds"] = round(time.perf_counter() - _import_started, 3)
\ No newline at end of file
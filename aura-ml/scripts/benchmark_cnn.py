@@ -0,0 +1,80 @@
+"""
+Custom CNN Inference Benchmark.
+
+Compares the eager fp32 AudioCNN against its optimized CPU variants (TorchScript, static int8
+conv stack, torch.compile) on the fixed reference spectrograms:
+- Parity: top-1 agreement and max probability difference vs eager.
+- Latency: mean / p50 / p95 per call for single-clip requests (the /classify-custom shape).
+  Speedup is on p50, which scheduler noise on a shared CPU barely moves.
+- Size: serialized state size of each variant.
+
+Usage (from the aura-ml directory):
+    python scripts/benchmark_cnn.py [--iterations 500] [--threads 1]
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import statistics
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cnn_network import (
+    INFERENCE_MODES, load_eager_model, build_inference_model, check_parity, reference_spectrograms
+)
+
+def serialized_kb(model):
+    buffer = io.BytesIO()
+    if isinstance(model, torch.jit.ScriptModule):
+        torch.jit.save(model, buffer)
+    else:
+        torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1024
+
+def time_model(model, inputs, iterations):
+    latencies = []
+    with torch.inference_mode():
+        for _ in range(20):  # warm-up (and compilation for torch.compile)
+            model(inputs[:1])
+        for i in range(iterations):
+            x = inputs[i % len(inputs)].unsqueeze(0)
+            start = time.perf_counter()
+            model(x)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(latencies), statistics.median(latencies), statistics.quantiles(latencies, n=20)[18]
+
+def run_benchmark(iterations, modes):
+    print(f"🚀 Custom CNN benchmark ({iterations} single-clip calls, {torch.get_num_threads()} threads)")
+    eager = load_eager_model()
+    inputs = reference_spectrograms()
+
+    print("\n" + "="*87)
+    print(f"{'Mode':<10} {'Avg ms':>8} {'P50 ms':>8} {'P95 ms':>8} {'Speedup':>8} {'Size KB':>9} {'Top-1':>7} {'Max Δp':>9}")
+    print("="*87)
+    baseline = None
+    for mode in modes:
+        try:
+            model = build_inference_model(load_eager_model(), mode)
+            parity = check_parity(eager, model, inputs)
+            avg_ms, p50_ms, p95_ms = time_model(model, inputs, iterations)
+        except Exception as e:
+            print(f"{mode:<10} ❌ {e}")
+            continue
+        baseline = baseline or p50_ms
+        size = serialized_kb(model) if mode != "compiled" else float("nan")
+        print(f"{mode:<10} {avg_ms:>8.3f} {p50_ms:>8.3f} {p95_ms:>8.3f} {baseline / p50_ms:>7.2f}x {size:>9.1f} "
+              f"{parity['top1_agreement']:>7.0%} {parity['max_prob_diff']:>9.5f}")
+    print("="*87)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Custom CNN inference modes.")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--modes", nargs="+", default=list(INFERENCE_MODES), choices=INFERENCE_MODES)
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    run_benchmark(args.iterations, args.modes)
@@ -0,0 +1,84 @@
+"""
+Face-Emotion Backend Benchmark.
+
+Compares the eager transformers pipeline against the ONNX Runtime backends (fp32, dynamic int8)
+on the fixed reference images:
+- Parity: top-1 agreement and max probability difference vs the pipeline.
+- Latency: mean / p95 per call for single frames (/analyze-face) and batches (/analyze-face/batch).
+- Size: model file size.
+
+Exports are written to AURA_EMOTION_ONNX_DIR (reused on later runs).
+
+Usage (from the aura-ml directory):
+    python scripts/benchmark_emotion.py [--iterations 50] [--batch 8] [--threads 1] [--model <hub id or local dir>]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.emotion_classifier import MODEL_NAME
+from services.emotion_onnx import load_onnx_classifier, check_parity, reference_images
+
+def time_classifier(classifier, images, batch, iterations):
+    latencies = []
+    for _ in range(3):  # warm-up
+        classifier(images[:batch], batch_size=batch)
+    for i in range(iterations):
+        start_pos = (i * batch) % (len(images) - batch + 1)
+        frames = images[start_pos:start_pos + batch]
+        start = time.perf_counter()
+        classifier(frames if batch > 1 else frames[0], batch_size=batch)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(latencies), statistics.quantiles(latencies, n=20)[18]
+
+def model_mb(classifier):
+    if hasattr(classifier, "memory_bytes"):
+        return classifier.memory_bytes() / 1024 / 1024
+    return sum(p.numel() * p.element_size() for p in classifier.model.parameters()) / 1024 / 1024
+
+def run_benchmark(model_name, iterations, batch, threads):
+    import torch
+    from transformers import logging, pipeline
+    logging.set_verbosity_error()
+    if threads:
+        torch.set_num_threads(threads)
+
+    print(f"🚀 Emotion backend benchmark: {model_name} ({iterations} calls per shape, {torch.get_num_threads()} torch threads)")
+    reference = pipeline("image-classification", model=model_name)
+    images = reference_images(32)
+    backends = [("pipeline", reference, None)]
+    for name, quantized in (("onnx", False), ("onnx-int8", True)):
+        try:
+            classifier, _ = load_onnx_classifier(model_name, quantized=quantized, threads=threads or 0)
+            backends.append((name, classifier, check_parity(reference, classifier, images)))
+        except Exception as e:
+            print(f"{name:<10} ❌ {e}")
+
+    print("\n" + "="*92)
+    print(f"{'Backend':<10} {'1x avg ms':>10} {'1x p95':>8} {f'{batch}x avg ms':>11} {f'{batch}x p95':>8} "
+          f"{'Speedup':>8} {'Size MB':>8} {'Top-1':>7} {'Max Δp':>9}")
+    print("="*92)
+    baseline = None
+    for name, classifier, parity in backends:
+        single_avg, single_p95 = time_classifier(classifier, images, 1, iterations)
+        batch_avg, batch_p95 = time_classifier(classifier, images, batch, iterations)
+        baseline = baseline or single_avg
+        top1 = f"{parity['top1_agreement']:>7.0%}" if parity else f"{'-':>7}"
+        diff = f"{parity['max_prob_diff']:>9.5f}" if parity else f"{'-':>9}"
+        print(f"{name:<10} {single_avg:>10.2f} {single_p95:>8.2f} {batch_avg:>11.2f} {batch_p95:>8.2f} "
+              f"{baseline / single_avg:>7.2f}x {model_mb(classifier):>8.1f} {top1} {diff}")
+    print("="*92)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark face-emotion serving backends.")
+    parser.add_argument("--model", default=MODEL_NAME, help="hub id or local model directory")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=None, help="torch / onnxruntime intra-op threads")
+    args = parser.parse_args()
+    run_benchmark(args.model, args.iterations, args.batch, args.threads)
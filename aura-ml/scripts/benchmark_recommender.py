@@ -0,0 +1,97 @@
+"""
+Recommender Training Benchmark.
+
+Compares the legacy dense training path (pandas pivot_table -> TruncatedSVD -> np.corrcoef -> argsort)
+with the sparse path (integer-encoded CSR -> sparse TruncatedSVD -> item factors -> blocked top-K) on
+synthetic implicit-feedback logs with a Zipf-like sound popularity.
+(Recommendation quality is compared separately by scripts/evaluate_recommender.py.)
+
+Reports wall time and peak traced memory (tracemalloc) per stage size.
+The dense path is skipped above --legacy-max interactions (its user x user matrix grows quadratically).
+
+Usage (from the aura-ml directory):
+    python scripts/benchmark_recommender.py [--sizes 10000 100000 1000000] [--sounds 2000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import TruncatedSVD
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recommendation_engine import (
+    NEIGHBOUR_K, build_interaction_matrix, item_factors, blocked_top_k, top_k_neighbours
+)
+
+def synthetic_interactions(n_interactions, n_sounds, seed=42):
+    rng = np.random.default_rng(seed)
+    n_users = max(50, n_interactions // 20)
+    popularity = 1.0 / np.arange(1, n_sounds + 1) ** 0.8
+    sounds = rng.choice(n_sounds, size=n_interactions, p=popularity / popularity.sum())
+    users = rng.integers(0, n_users, size=n_interactions)
+    return [f"user_{u}" for u in users], [f"sound_{s:05d}" for s in sounds]
+
+def svd(matrix):
+    n_components = max(1, min(12, matrix.shape[1] - 1))
+    model = TruncatedSVD(n_components=n_components, random_state=42)
+    return model, model.fit_transform(matrix)
+
+def legacy_train(user_ids, sound_ids):
+    df = pd.DataFrame({"user_id": user_ids, "sound_id": sound_ids, "rating": 1})
+    matrix = df.pivot_table(index="user_id", columns="sound_id", values="rating").fillna(0)
+    corr = np.corrcoef(svd(matrix)[1])
+    n_rows = min(matrix.shape[1], len(corr))
+    scores = np.nan_to_num(corr[:n_rows, :n_rows], nan=-np.inf)
+    scores[np.arange(n_rows), np.arange(n_rows)] = -np.inf
+    return top_k_neighbours(scores, NEIGHBOUR_K)
+
+def sparse_train(user_ids, sound_ids):
+    matrix, _, item_ids = build_interaction_matrix(user_ids, sound_ids)
+    model, _ = svd(matrix)
+    factors = item_factors(model.components_, model.singular_values_)
+    return blocked_top_k(factors, len(item_ids), len(item_ids), NEIGHBOUR_K)
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+def run_benchmark(sizes, n_sounds, legacy_max):
+    print(f"🚀 Recommender training benchmark ({n_sounds} sounds, top-{NEIGHBOUR_K} neighbours)")
+    print("\n" + "="*78)
+    print(f"{'Interactions':>12} {'Users':>8} {'Path':<8} {'Time s':>9} {'Peak MB':>10} {'Speedup':>9} {'Mem ratio':>10}")
+    print("="*78)
+    for n in sizes:
+        user_ids, sound_ids = synthetic_interactions(n, n_sounds)
+        n_users = len(set(user_ids))
+        table, sparse_time, sparse_mem = measure(sparse_train, user_ids, sound_ids)
+        if n <= legacy_max:
+            legacy_table, legacy_time, legacy_mem = measure(legacy_train, user_ids, sound_ids)
+            print(f"{n:>12,} {n_users:>8,} {'dense':<8} {legacy_time:>9.2f} {legacy_mem:>10.1f}")
+            print(f"{'':>12} {'':>8} {'sparse':<8} {sparse_time:>9.2f} {sparse_mem:>10.1f} "
+                  f"{legacy_time / sparse_time:>8.1f}x {legacy_mem / sparse_mem:>9.1f}x")
+            if legacy_table.shape[1] != table.shape[1]:
+                print(f"   ❌ Table width mismatch: {legacy_table.shape} vs {table.shape}")
+        else:
+            dense_gb = (n_users * n_sounds + n_users * n_users) * 8 / 1024**3
+            print(f"{n:>12,} {n_users:>8,} {'dense':<8} {'skipped':>9} {f'~{dense_gb:.1f} GB':>10}")
+            print(f"{'':>12} {'':>8} {'sparse':<8} {sparse_time:>9.2f} {sparse_mem:>10.1f}")
+    print("="*78)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dense vs sparse recommender training.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--sounds", type=int, default=2000)
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="largest interaction count to run the dense path on")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.sounds, args.legacy_max)
@@ -0,0 +1,90 @@
+"""
+Recommender Quality + Speed Evaluation (recall@K on held-out interactions).
+
+Trains on a leave-one-out split and scores every engine with the same protocol
+(services/recommender_eval.py):
+- item:       SVD item factors (`components_.T`), cosine top-K by blocked matmul (the served engine)
+- user-corr:  the legacy engine, Pearson correlation of *user* factor rows indexed by sound position
+- popularity: most played sounds for everyone (baseline)
+
+Synthetic logs have planted taste structure (each sound belongs to a topic, each user favours
+one or two topics), so a model that learns item similarity should beat popularity clearly.
+
+Usage (from the aura-ml directory):
+    python scripts/evaluate_recommender.py [--interactions 200000] [--sounds 2000] [--k 5 10 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.paged_reader import InteractionLog
+from services.recommendation_engine import NEIGHBOUR_K, fit_snapshot, interaction_matrix, blocked_top_k
+from services.recommender_eval import holdout_split, recall_at_k, popularity_table
+
+def synthetic_log(n_interactions, n_sounds, n_topics=25, noise=0.2, seed=42):
+    rng = np.random.default_rng(seed)
+    n_users = max(50, n_interactions // 20)
+    topic_of = rng.integers(0, n_topics, n_sounds)
+    members = [np.flatnonzero(topic_of == t) for t in range(n_topics)]
+    favourites = rng.integers(0, n_topics, (n_users, 2))
+    popularity = 1.0 / np.arange(1, n_sounds + 1) ** 0.8
+
+    users = rng.integers(0, n_users, n_interactions)
+    topics = favourites[users, rng.integers(0, 2, n_interactions)]
+    items = np.array([rng.choice(members[t]) if len(members[t]) else 0 for t in topics])
+    random_pick = rng.random(n_interactions) < noise
+    items[random_pick] = rng.choice(n_sounds, random_pick.sum(), p=popularity / popularity.sum())
+
+    user_ids = np.array([f"user_{u}" for u in range(n_users)], dtype=object)
+    item_ids = np.array([f"sound_{s:05d}" for s in range(n_sounds)], dtype=object)
+    return InteractionLog(users.astype(np.int32), items.astype(np.int32), user_ids, item_ids, "2026-01-01")
+
+def legacy_user_corr(matrix):
+    """The pre-item-factor engine: corrcoef over user rows of the SVD output, addressed by sound position."""
+    reduced = TruncatedSVD(n_components=max(1, min(12, matrix.shape[1] - 1)), random_state=42).fit_transform(matrix)
+    centred = reduced - reduced.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        factors = centred / np.linalg.norm(centred, axis=1, keepdims=True)
+    n_rows = min(matrix.shape[1], len(factors))
+    return blocked_top_k(factors, n_rows, n_rows, NEIGHBOUR_K)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def run(n_interactions, n_sounds, ks):
+    log = synthetic_log(n_interactions, n_sounds)
+    train, held_users, held_items = holdout_split(log)
+    matrix, _, _ = interaction_matrix(train)
+    print(f"🚀 Recommender evaluation: {len(train):,} training interactions, {matrix.shape[0]:,} users, "
+          f"{matrix.shape[1]:,} sounds, {len(held_users):,} held-out")
+
+    snapshot, item_time = timed(fit_snapshot, train, list(log.item_ids))
+    engines = [
+        ("item", snapshot.neighbours, item_time),
+        ("user-corr", *timed(legacy_user_corr, matrix)),
+        ("popularity", *timed(popularity_table, matrix, NEIGHBOUR_K)),
+    ]
+
+    print("\n" + "="*72)
+    print(f"{'Engine':<12} {'Train s':>9} {'Rows':>8} " + " ".join(f"{f'R@{k}':>8}" for k in ks) + f" {'Eval s':>8}")
+    print("="*72)
+    for name, table, train_time in engines:
+        recall, eval_time = timed(recall_at_k, table, matrix, held_users, held_items, ks)
+        print(f"{name:<12} {train_time:>9.2f} {len(table):>8,} " + " ".join(f"{recall[k]:>8.3f}" for k in ks) + f" {eval_time:>8.2f}")
+    print("="*72)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate recommender recall@K and training time.")
+    parser.add_argument("--interactions", type=int, default=200_000)
+    parser.add_argument("--sounds", type=int, default=2000)
+    parser.add_argument("--k", nargs="+", type=int, default=[5, 10, 20])
+    args = parser.parse_args()
+    run(args.interactions, args.sounds, args.k)
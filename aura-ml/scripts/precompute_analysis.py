@@ -0,0 +1,77 @@
+"""
+Analysis Precompute Job.
+
+Runs the deterministic audio analysis pipelines once per sound and persists the results on the
+'sounds' row, so the API serves library sounds with a lookup instead of multi-second inference.
+Stages per sound:
+1. Waveform: 50-point normalised amplitude envelope (`/analyze-waveform`).
+2. AST Tags: top-5 "Aura Vibe" predictions (`/classify-audio`).
+3. Custom CNN: UrbanSound8K label + confidence (`/classify-custom`).
+
+Required schema (run once in the Supabase SQL editor):
+    alter table sounds add column if not exists waveform jsonb;
+    alter table sounds add column if not exists ast_predictions jsonb;
+    alter table sounds add column if not exists cnn_prediction jsonb;
+
+Usage (from the aura-ml directory):
+    python scripts/precompute_analysis.py          # only sounds missing results
+    python scripts/precompute_analysis.py --force  # recompute the whole catalogue
+"""
+
+import os
+import sys
+import argparse
+from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.paged_reader import PagedReader
+from services.analysis_store import compute_analysis, ANALYSIS_COLUMNS
+
+load_dotenv()
+url = os.getenv("SUPABASE_URL")
+key = os.getenv("SUPABASE_KEY")
+
+supabase: Client = create_client(
+    url,
+    key,
+    options=ClientOptions(postgrest_client_timeout=60)
+)
+
+def precompute_sound(sound):
+    """Computes and stores the analysis for one 'sounds' row. Returns True if anything was saved."""
+    results = compute_analysis(sound["file_url"])
+    update_data = {column: value for column, value in results.items() if value is not None}
+    if not update_data:
+        return False
+    supabase.table("sounds").update(update_data).eq("id", sound["id"]).execute()
+    return True
+
+def process_catalogue(force=False):
+    print("⏳ Fetching sounds from Database...")
+    # Without --force, only rows missing a result are read (filtered in the DB, not downloaded).
+    # The list is read in full before any update, since updates move rows out of the filter
+    # and would shift the offsets of later pages.
+    missing = None if force else (lambda q: q.or_(",".join(f"{column}.is.null" for column in ANALYSIS_COLUMNS)))
+    pages = PagedReader(supabase).iter_pages("sounds", "id, title, file_url", apply=missing)
+    sounds = [s for page in pages for s in page if s.get("file_url")]
+
+    print(f"🔍 {len(sounds)} sounds need analysis.")
+    saved = 0
+    for i, sound in enumerate(sounds):
+        try:
+            if precompute_sound(sound):
+                saved += 1
+            print(f"   ✅ [{i+1}/{len(sounds)}] {sound['title']}")
+        except Exception as e:
+            print(f"   ❌ [{i+1}/{len(sounds)}] {sound['title']}: {e}")
+
+    print(f"✅ Precompute Complete! Saved results for {saved}/{len(sounds)} sounds.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute waveform / AST / CNN results per sound.")
+    parser.add_argument("--force", action="store_true", help="Recompute sounds that already have results")
+    args = parser.parse_args()
+    process_catalogue(force=args.force)
@@ -0,0 +1,94 @@
+"""
+Startup Profile for the ML Brain.
+
+Reports where process startup time goes:
+1. Imports: imports the target module in a fresh interpreter with `-X importtime` and aggregates
+   the per-module self times by top-level package, heaviest first (plus the slowest single modules).
+2. Model loads (--warm): imports `main` in-process and runs the startup warm-up through the
+   model registry, reporting per-model load time and resident size.
+
+Usage (from the aura-ml directory):
+    python scripts/profile_startup.py [--module main] [--top 15] [--warm]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+def parse_importtime(stderr: str):
+    """-X importtime lines -> [(module, self_us, cumulative_us)], in import order."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+def profile_imports(module: str):
+    """Wall time and -X importtime entries for `import <module>` in a fresh interpreter."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        print(f"❌ import {module} failed:\n{result.stderr[-2000:]}")
+        sys.exit(1)
+    return elapsed, parse_importtime(result.stderr)
+
+def report_imports(module: str, top: int):
+    elapsed, entries = profile_imports(module)
+    by_package = defaultdict(int)
+    for name, self_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+    total_us = sum(self_us for _, self_us, _ in entries)
+
+    print(f"🚀 Startup profile: import {module}")
+    print(f"   Interpreter wall time: {elapsed:.2f}s | import time: {total_us / 1e6:.2f}s over {len(entries)} modules")
+    print("\n" + "="*60)
+    print(f"{'Package':<32} {'Self ms':>12} {'Share':>8}")
+    print("="*60)
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{package:<32} {self_us / 1000:>12.1f} {self_us / max(total_us, 1):>7.1%}")
+
+    print("\n" + "="*60)
+    print(f"{'Slowest modules':<32} {'Self ms':>12} {'Cumul. ms':>12}")
+    print("="*60)
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: -e[1])[:top]:
+        print(f"{name[:32]:<32} {self_us / 1000:>12.1f} {cumulative_us / 1000:>12.1f}")
+    print("="*60)
+
+def report_models():
+    """Imports main and runs the blocking warm-up, then prints the registry's per-model numbers."""
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter() - started
+    if main.supabase is None and main.url and main.key:
+        main.supabase = main.create_client(main.url, main.key)
+    main.warm_up()
+
+    print(f"\n🔥 Warm-up (import main: {imported:.2f}s, warm-up: {main.startup_profile['warm_seconds']:.2f}s)")
+    print("="*60)
+    print(f"{'Model':<16} {'Policy':<10} {'Loaded':<8} {'Load s':>8} {'Resident MB':>14}")
+    print("="*60)
+    stats = main.models.stats()
+    for name, model in stats["models"].items():
+        print(f"{name:<16} {model['policy']:<10} {str(model['loaded']):<8} {model['load_seconds']:>8.2f} {model['resident_mb']:>14.1f}")
+    print("="*60)
+    print(f"{'Total':<36} {'':>8} {stats['resident_mb']:>14.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report per-import and per-model-load startup timings.")
+    parser.add_argument("--module", default="main", help="module whose import is profiled")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--warm", action="store_true", help="also load the eager models and report per-model timings")
+    args = parser.parse_args()
+    report_imports(args.module, args.top)
+    if args.warm:
+        report_models()
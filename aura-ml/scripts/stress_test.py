@@ -0,0 +1,76 @@
+import asyncio
+import time
+import statistics
+import os
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# CONFIG
+API_URL = os.getenv("AURA_API_URL", "http://127.0.0.1:8000")
+API_KEY = os.getenv("AURA_API_KEY")
+HEADERS = {"x-api-key": API_KEY or "", "Content-Type": "application/json"}
+SCENARIOS = {
+    "/search": {"query": "rainforest sounds for sleep", "match_threshold": 0.5, "match_count": 5},
+    "/search-knowledge": {"query": "how does pink noise affect deep sleep"},
+    "/generate-mix": {"scenario": "focus"},
+}
+CONCURRENCY_LEVELS = [1, 8, 32, 64, 128]
+REQUESTS_PER_LEVEL = 256
+
+async def run_level(client, endpoint, payload, concurrency):
+    """Fires REQUESTS_PER_LEVEL requests with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            req_start = time.perf_counter()
+            try:
+                response = await client.post(f"{API_URL}{endpoint}", json=payload, headers=HEADERS)
+                if response.status_code == 200:
+                    latencies.append((time.perf_counter() - req_start) * 1000)
+                else:
+                    errors += 1
+            except Exception:
+                errors += 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(REQUESTS_PER_LEVEL)))
+    total_time = time.perf_counter() - start_time
+    return latencies, errors, total_time
+
+async def run_stress_test():
+    """
+    Concurrency Stress Test.
+    Sweeps increasing numbers of in-flight requests per endpoint. With blocking handlers,
+    throughput plateaus once the anyio thread limit (40) is saturated; the async endpoints
+    should keep scaling until the DB / CPU become the bottleneck.
+    """
+    print(f"🚀 Starting Stress Test on {API_URL}...")
+    limits = httpx.Limits(max_connections=max(CONCURRENCY_LEVELS), max_keepalive_connections=max(CONCURRENCY_LEVELS))
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        for endpoint, payload in SCENARIOS.items():
+            print("\n" + "="*64)
+            print(f"  {endpoint}")
+            print("="*64)
+            print(f"{'Concurrency':>12} {'OK':>6} {'Err':>5} {'Avg ms':>9} {'P95 ms':>9} {'Req/s':>8}")
+            for concurrency in CONCURRENCY_LEVELS:
+                latencies, errors, total_time = await run_level(client, endpoint, payload, concurrency)
+                if len(latencies) < 2:
+                    print(f"{concurrency:>12} {len(latencies):>6} {errors:>5}   (not enough successful requests)")
+                    continue
+                avg_lat = statistics.mean(latencies)
+                p95_lat = statistics.quantiles(latencies, n=20)[18]
+                rps = len(latencies) / total_time
+                print(f"{concurrency:>12} {len(latencies):>6} {errors:>5} {avg_lat:>9.1f} {p95_lat:>9.1f} {rps:>8.1f}")
+
+if __name__ == "__main__":
+    try:
+        httpx.get(API_URL, headers=HEADERS)
+        asyncio.run(run_stress_test())
+    except httpx.ConnectError:
+        print("❌ Error: Run 'uvicorn main:app' in another terminal first!")
@@ -0,0 +1,71 @@
+from core.paged_reader import PagedReader
+from services.audio_processor import extract_waveform
+from services.audio_classifier import predict_sound_class
+from services.custom_cnn import predict_with_custom_model
+
+# Columns on the 'sounds' table holding precomputed, deterministic analysis results
+ANALYSIS_COLUMNS = ("waveform", "ast_predictions", "cnn_prediction")
+WAVEFORM_POINTS = 50
+
+def compute_analysis(file_url: str):
+    """
+    Runs the three deterministic analysis pipelines for one sound.
+    Failed stages are returned as None so callers never persist error payloads.
+    """
+    waveform = extract_waveform(file_url, n_points=WAVEFORM_POINTS)
+
+    ast_predictions = predict_sound_class(file_url)
+    if not ast_predictions or ast_predictions[0]["label"].startswith("Error:"):
+        ast_predictions = None
+
+    cnn_prediction = predict_with_custom_model(file_url)
+    if "error" in cnn_prediction:
+        cnn_prediction = None
+
+    return {
+        "waveform": waveform or None,
+        "ast_predictions": ast_predictions,
+        "cnn_prediction": cnn_prediction,
+    }
+
+class AnalysisStore:
+    """
+    Precomputed Analysis Lookup.
+
+    Library sounds never change their `file_url`, so their waveform, AST vibe tags and
+    CNN label are computed once (at ingest or by `scripts/precompute_analysis.py`) and stored
+    on the 'sounds' row. This singleton mirrors those columns in memory keyed by URL,
+    turning `/analyze-waveform`, `/classify-audio` and `/classify-custom` into dict lookups
+    for the catalogue. Unknown URLs return None and fall back to live inference.
+    """
+    _instance = None
+
+    def __init__(self):
+        self.results = {}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = AnalysisStore()
+        return cls._instance
+
+    def build(self, supabase, reader: PagedReader = None):
+        """Streams the analysis columns of the whole catalogue in `.range()` pages."""
+        try:
+            reader = reader or PagedReader(supabase)
+            pages = reader.iter_pages("sounds", "file_url, " + ", ".join(ANALYSIS_COLUMNS))
+            self.load_rows(row for page in pages for row in page)
+            print(f"✅ Analysis Store Ready: {len(self.results)} sounds with precomputed results.")
+        except Exception as e:
+            print(f"⚠️ Analysis Store unavailable ({e}). Serving live inference only.")
+
+    def load_rows(self, data):
+        results = {}
+        for row in data:
+            stored = {column: row.get(column) for column in ANALYSIS_COLUMNS if row.get(column) is not None}
+            if row.get("file_url") and stored:
+                results[row["file_url"]] = stored
+        self.results = results
+
+    def get(self, file_url: str, column: str):
+        return self.results.get(file_url, {}).get(column)
@@ -0,0 +1,100 @@
+import os
+import copy
+import tempfile
+import warnings
+from types import SimpleNamespace
+import numpy as np
+import torch
+from torch import nn
+from core.onnx_export import export_onnx, quantize_onnx, create_session, model_slug, parity_report
+
+# -------------------------------------------------
+# Optimized AST inference backends (AURA_AST_BACKEND)
+# Imported lazily by services/audio_classifier.py, only when a non-eager backend is requested.
+#
+#   eager      fp32 PyTorch (the pipeline's own model)
+#   quantized  PyTorch dynamic int8 on every nn.Linear (attention + MLP, ~all of AST's weights)
+#   onnx       ONNX Runtime fp32 graph, exported once to AURA_AST_ONNX_DIR
+#   onnx-int8  ONNX Runtime with dynamic int8 weights
+#
+# Every backend takes the same fixed (batch, max_length, 128) fbank input and returns an object
+# with `.logits`, so it replaces `pipeline.model` and nothing downstream changes.
+# -------------------------------------------------
+AST_BACKENDS = ("eager", "quantized", "onnx", "onnx-int8")
+
+def onnx_dir() -> str:
+    """Export cache directory (AURA_AST_ONNX_DIR, default: system temp dir)."""
+    return os.getenv("AURA_AST_ONNX_DIR", os.path.join(tempfile.gettempdir(), "aura-ast-onnx"))
+
+def reference_clips(n: int = 4, seconds: float = 2.0, sample_rate: int = 16000, seed: int = 1234):
+    """
+    Fixed, seeded fixture audio for parity checks and benchmarks: a pure tone, a chirp,
+    pink-ish noise and a click train, cycled to `n` clips (float32, 16 kHz).
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    makers = [
+        lambda: np.sin(2 * np.pi * rng.uniform(200, 2000) * t),
+        lambda: np.sin(2 * np.pi * (100 + rng.uniform(500, 3000) * t / seconds) * t),
+        lambda: np.cumsum(rng.normal(0, 1, len(t))) / np.sqrt(len(t)) + rng.normal(0, 0.05, len(t)),
+        lambda: (np.arange(len(t)) % int(sample_rate / rng.uniform(2, 10)) < 40).astype(float),
+    ]
+    clips = []
+    for i in range(n):
+        clip = makers[i % len(makers)]()
+        clips.append((0.5 * clip / max(np.abs(clip).max(), 1e-6)).astype(np.float32))
+    return clips
+
+def reference_features(classifier, n: int = 4) -> torch.Tensor:
+    """Fbank features of the fixture clips, from the classifier's own feature extractor."""
+    extractor = classifier.feature_extractor
+    return extractor(reference_clips(n), sampling_rate=extractor.sampling_rate, return_tensors="pt")["input_values"]
+
+class OnnxAudioModel:
+    """ONNX Runtime stand-in for ASTForAudioClassification: `model(input_values=...)` -> `.logits`."""
+
+    def __init__(self, path: str, config, threads: int = 0):
+        self.session = create_session(path, threads)
+        self.config = config
+        self.path = path
+
+    def __call__(self, input_values):
+        features = input_values.numpy() if isinstance(input_values, torch.Tensor) else np.asarray(input_values)
+        logits = self.session.run(None, {"input_values": features.astype(np.float32)})[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def memory_bytes(self) -> int:
+        return os.path.getsize(self.path)
+
+def build_backend(classifier, backend: str, model_name: str, threads: int = 0):
+    """Optimized stand-in for `classifier.model` (the eager model is left untouched)."""
+    model = classifier.model
+    if backend == "eager":
+        return model
+    if backend == "quantized":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # torch.ao deprecation notices
+            return torch.ao.quantization.quantize_dynamic(copy.deepcopy(model).eval(), {nn.Linear}, dtype=torch.qint8)
+
+    target_dir = os.path.join(onnx_dir(), model_slug(model_name))
+    os.makedirs(target_dir, exist_ok=True)
+    fp32_path = os.path.join(target_dir, "model.onnx")
+    if not os.path.exists(fp32_path):
+        print(f"⏳ Exporting {model_name} to ONNX...")
+        export_onnx(model, reference_features(classifier, 1), fp32_path, "input_values")
+    path = fp32_path
+    if backend == "onnx-int8":
+        path = os.path.join(target_dir, "model-int8.onnx")
+        if not os.path.exists(path):
+            quantize_onnx(fp32_path, path)
+    return OnnxAudioModel(path, model.config, threads)
+
+def check_parity(reference, candidate, features, tolerance: float = 0.05):
+    """
+    Compares a candidate backend against the eager model on the fixture features.
+    Passes when every top-1 class agrees and no class probability differs by more than `tolerance`.
+    """
+    with torch.no_grad():
+        ref_probs = reference(input_values=features).logits.softmax(-1)
+        cand_probs = candidate(input_values=features).logits.softmax(-1)
+    return parity_report(ref_probs.numpy(), cand_probs.numpy(), tolerance)
@@ -1,8 +1,14 @@
-import requests
-import io
-import librosa
+import os
+import time
 import numpy as np
-from transformers import pipeline
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from services.audio_loader import AudioLoader
+from services.feature_cache import FeatureCache
+from core.model_registry import ModelRegistry
+
+SAMPLE_RATE = 16000
+MODEL_NAME = "mit/ast-finetuned-audioset-10-10-0.4593"
 
 # ---------------------------------------------------------
 # Aesthetic Mapping Layer
@@ -88,78 +94,282 @@ VIBE_MAP = {
     "Crackling, fire": "Fireplace Crackle",
 }
 
+# Lower-cased keys in VIBE_MAP order, for the "first substring match" rule
+_VIBE_KEYS_LOWER = [(key.lower(), val) for key, val in VIBE_MAP.items()]
+
+@lru_cache(maxsize=None)
+def resolve_vibe(original_label: str) -> str:
+    """Exact VIBE_MAP match, else the first key contained in the label (e.g. "Heavy Rain" -> "Rain"), else the label itself."""
+    friendly_label = VIBE_MAP.get(original_label)
+    if not friendly_label:
+        label_lower = original_label.lower()
+        friendly_label = next((val for key, val in _VIBE_KEYS_LOWER if key in label_lower), None)
+    return friendly_label or original_label
+
+class VibeTable:
+    """
+    Precomputed class-id -> vibe resolution for the model's full label set (527 AudioSet classes).
+    Built once at model load, so post-processing is an array lookup over the probabilities
+    instead of a per-prediction scan of VIBE_MAP.
+    """
+
+    def __init__(self, id2label):
+        self.labels = [id2label[i] for i in range(len(id2label))]
+        vibes = [resolve_vibe(label) for label in self.labels]
+        self.vibe_names, self.vibe_ids = np.unique(vibes, return_inverse=True)
+
+    def top_k(self, probs: np.ndarray, top_k: int = 5):
+        """Top-k raw classes, each with its vibe label (same format as the pipeline + VIBE_MAP path)."""
+        top_k = min(top_k, len(probs))
+        idx = np.argpartition(-probs, top_k - 1)[:top_k]
+        idx = idx[np.argsort(-probs[idx], kind="stable")]
+        return [{
+            "label": str(self.vibe_names[self.vibe_ids[i]]),
+            "original_label": self.labels[i],
+            "score": float(probs[i]),
+        } for i in idx]
+
+    def top_k_by_vibe(self, probs: np.ndarray, top_k: int = 5):
+        """Top-k vibes, scoring each vibe by the summed probability of every class that maps to it."""
+        vibe_scores = np.bincount(self.vibe_ids, weights=probs, minlength=len(self.vibe_names))
+        top_k = min(top_k, len(vibe_scores))
+        order = np.argsort(-vibe_scores, kind="stable")[:top_k]
+
+        # Strongest contributing raw class per vibe, for display / debugging
+        results = []
+        for v in order:
+            members = np.flatnonzero(self.vibe_ids == v)
+            best = members[np.argmax(probs[members])]
+            results.append({
+                "label": str(self.vibe_names[v]),
+                "original_label": self.labels[best],
+                "score": float(vibe_scores[v]),
+            })
+        return results
+
 class AudioClassifier:
     """
     Singleton wrapper for the Audio Spectrogram Transformer (AST) pipeline.
     Ensures the heavy neural network model is loaded only once per application lifecycle.
     Uses the 'mit/ast-finetuned-audioset' model for state-of-the-art environmental sound classification.
+
+    Inference backend is selected with AURA_AST_BACKEND (eager | quantized | onnx | onnx-int8, see
+    services/ast_backends.py). Optimized backends replace the pipeline's model only if they pass the
+    parity check against eager on the fixture clips; otherwise the eager model is served.
     """
     _instance = None
+    _vibe_table = None
+    backend = "eager"
+    parity = None
+
+    @classmethod
+    def get_vibe_table(cls):
+        if cls._vibe_table is None:
+            cls._vibe_table = VibeTable(cls.get_instance().model.config.id2label)
+        return cls._vibe_table
 
     @classmethod
     def get_instance(cls):
+        # Loading, residency and eviction are governed by the model registry ("ast")
+        return ModelRegistry.get_instance().get("ast")
+
+    @classmethod
+    def load(cls):
         if cls._instance is None:
             print("⏳ Loading Neural Network (MIT/AST)...")
+            from transformers import pipeline
             cls._instance = pipeline(
                 "audio-classification", 
-                model="mit/ast-finetuned-audioset-10-10-0.4593"
+                model=MODEL_NAME
             )
+            # Resolve all AudioSet classes to vibes once, at load time
+            cls._vibe_table = VibeTable(cls._instance.model.config.id2label)
             print("✅ Neural Network Loaded.")
+
+            requested = os.getenv("AURA_AST_BACKEND", "eager").lower()
+            if requested != "eager":
+                cls._optimize(requested)
         return cls._instance
 
-def predict_sound_class(file_url: str):
+    @classmethod
+    def _optimize(cls, requested):
+        from services.ast_backends import AST_BACKENDS, build_backend, check_parity, reference_features
+        if requested not in AST_BACKENDS:
+            print(f"⚠️ Unknown AURA_AST_BACKEND '{requested}'. Serving eager model.")
+            return
+        try:
+            started = time.perf_counter()
+            candidate = build_backend(cls._instance, requested, MODEL_NAME,
+                                      threads=int(os.getenv("AURA_AST_ONNX_THREADS", "0")))
+            cls.parity = check_parity(cls._instance.model, candidate, reference_features(cls._instance),
+                                      tolerance=float(os.getenv("AURA_AST_PARITY_TOL", "0.05")))
+            if cls.parity["passed"]:
+                # The eager weights are released; the pipeline keeps its feature extractor and config
+                cls._instance.model, cls.backend = candidate, requested
+                print(f"✅ AST optimized ({requested}) in {time.perf_counter() - started:.2f}s. Parity: {cls.parity}")
+            else:
+                print(f"⚠️ AST {requested} backend failed parity {cls.parity}. Serving eager model.")
+        except Exception as e:
+            print(f"⚠️ AST {requested} backend failed ({e}). Serving eager model.")
+
+    @classmethod
+    def unload(cls):
+        cls._instance = None
+        cls._vibe_table = None
+        cls.backend, cls.parity = "eager", None
+
+ModelRegistry.get_instance().register("ast", AudioClassifier.load, AudioClassifier.unload, default_policy="eager")
+
+def clip_to_model_window(audio_array, classifier):
+    """
+    AST consumes a fixed window of `max_length` (1024) fbank frames (25ms window, 10ms hop) and
+    truncates anything longer *after* computing features. Framing is local (no centring, no dither),
+    so dropping the samples past that window yields identical features for a fraction of the work.
+    """
+    extractor = classifier.feature_extractor
+    window = int(0.025 * extractor.sampling_rate)
+    hop = int(0.010 * extractor.sampling_rate)
+    max_samples = window + (extractor.max_length - 1) * hop
+    return audio_array[:max_samples]
+
+def feature_key(file_url: str, loader=None):
+    """FeatureCache key: the URL plus the AudioLoader's content version, so changed files are never served stale."""
+    loader = loader or AudioLoader.get_instance()
+    return (file_url, loader.version(file_url))
+
+def forward_probs(classifier, arrays, batch_size: int = 8, keys=None, cached=None):
+    """
+    Runs the AST forward pass directly (feature extractor + model), returning softmax
+    probabilities as a (n_clips, n_classes) array, `batch_size` clips per pass.
+
+    With `keys` (see `feature_key`), the FeatureCache is used: clips this backend already
+    classified skip the model, clips with cached features skip the filterbank extraction,
+    and new features / probabilities are stored. `cached` passes the (probs, features)
+    the caller already looked up, so a clip's `arrays` entry may be None exactly when
+    that lookup returned something; a later eviction cannot take it away.
+    """
+    import torch
+    cache = FeatureCache.get_instance() if keys is not None else None
+    if cached is None:
+        cached = [cache.lookup(key, AudioClassifier.backend) for key in keys] if cache is not None else [(None, None)] * len(arrays)
+    probs, features = [hit[0] for hit in cached], [hit[1] for hit in cached]
+
+    pending = [i for i, p in enumerate(probs) if p is None]
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        missing = [i for i in batch if features[i] is None]
+        if missing:
+            clips = [clip_to_model_window(arrays[i], classifier) for i in missing]
+            extracted = classifier.feature_extractor(clips, sampling_rate=SAMPLE_RATE, return_tensors="pt")["input_values"]
+            for i, row in zip(missing, extracted):
+                features[i] = row.numpy()
+        with torch.no_grad():
+            logits = classifier.model(input_values=torch.from_numpy(np.stack([features[i] for i in batch]))).logits
+        for i, row in zip(batch, logits.softmax(-1).numpy()):
+            probs[i] = row
+            if cache is not None:
+                cache.store(keys[i], AudioClassifier.backend, features=features[i], probs=row)
+    return np.stack(probs)
+
+def postprocess(probs, top_k: int = 5, aggregate: str = "label"):
+    table = AudioClassifier.get_vibe_table()
+    if aggregate == "vibe":
+        return table.top_k_by_vibe(probs, top_k)
+    return table.top_k(probs, top_k)
+
+def error_predictions(e):
+    return [{"label": f"Error: {str(e)[:50]}", "score": 0.0}]
+
+def predict_sound_class(file_url: str, top_k: int = 5, aggregate: str = "label"):
     """
     Executes the audio classification inference pipeline.
     
     Process Flow:
-    1. Ingestion: stream audio file from remote URL into memory.
-    2. Preprocessing: Resample audio to 16kHz (native sampling rate for AST).
-    3. Inference: Forward pass through the Transformer model.
-    4. Post-processing: Map raw logits to user-friendly "Vibe" labels using heuristic matching.
+    1. Ingestion: fetch the audio file through the shared AudioLoader cache.
+    2. Preprocessing: Resample audio to 16kHz (native sampling rate for AST), cached per URL.
+       Skipped when the FeatureCache already holds this file version's features or probabilities.
+    3. Inference: Forward pass through the Transformer model (selected backend).
+    4. Post-processing: Map raw logits to user-friendly "Vibe" labels via the precomputed VibeTable.
+       `aggregate="vibe"` ranks vibes by summed probability instead of raw classes.
     """
     try:
-        print(f"1. Downloading audio: {file_url[:50]}...")
-        response = requests.get(file_url)
-        response.raise_for_status()
-        
-        print("2. Decoding audio with Librosa...")
-        # Force 16000Hz for the AI model
-        audio_bytes = io.BytesIO(response.content)
-        audio_array, sampling_rate = librosa.load(audio_bytes, sr=16000)
+        classifier = AudioClassifier.get_instance()
+        key = feature_key(file_url)
+        hit = FeatureCache.get_instance().lookup(key, AudioClassifier.backend)
+        audio_array = None
+        if hit[0] is None and hit[1] is None:
+            print(f"1-2. Loading audio at 16kHz: {file_url[:50]}...")
+            # Force 16000Hz for the AI model
+            audio_array, sampling_rate = AudioLoader.get_instance().load(file_url, sr=SAMPLE_RATE)
 
         print("3. Running Inference...")
-        classifier = AudioClassifier.get_instance()
-        
-        # Get top 5 predictions to increase chance of a good "Vibe" match
-        raw_predictions = classifier(audio_array, top_k=5)
+        probs = forward_probs(classifier, [audio_array], keys=[key], cached=[hit])[0]
         
         # 4. Map Labels to "Aura Vibes"
-        mapped_predictions = []
-        for p in raw_predictions:
-            original_label = p['label']
-            # Try to match exact label, or check if part of the label is in our map
-            friendly_label = VIBE_MAP.get(original_label)
-            
-            # If no exact match, try partial match (e.g. "Heavy Rain" matches "Rain")
-            if not friendly_label:
-                for key, val in VIBE_MAP.items():
-                    if key.lower() in original_label.lower():
-                        friendly_label = val
-                        break
-            
-            # Default fallback
-            if not friendly_label:
-                friendly_label = original_label
-
-            mapped_predictions.append({
-                "label": friendly_label,
-                "original_label": original_label,
-                "score": float(p['score'])
-            })
+        # Get top 5 predictions to increase chance of a good "Vibe" match
+        mapped_predictions = postprocess(probs, top_k, aggregate)
         
         print("✅ Classification Success!")
         return mapped_predictions
 
     except Exception as e:
         print(f"❌ CRITICAL ERROR in Audio Classifier: {e}")
-        return [{"label": f"Error: {str(e)[:50]}", "score": 0.0}]
\ No newline at end of file
+        return error_predictions(e)
+
+def predict_sound_classes(file_urls, batch_size: int = 8, top_k: int = 5, max_workers: int = 8, aggregate: str = "label"):
+    """
+    Batched catalogue tagging.
+
+    Process Flow:
+    1. Ingestion: download + decode all URLs concurrently through the shared AudioLoader
+       (except those whose features are in the FeatureCache).
+    2. Preprocessing: clip each signal to the model window. AST features are a fixed 1024-frame
+       grid, so clips are zero-padded in feature space and no length bucketing is required.
+    3. Inference: the AST forward pass runs `batch_size` clips at a time.
+    4. Post-processing: same VibeTable lookup as the single endpoint.
+
+    Returns one {"file_url", "predictions"} entry per input URL, in input order. Failed URLs carry
+    the usual error prediction instead of failing the whole batch.
+    """
+    if not file_urls:
+        return []
+
+    loader = AudioLoader.get_instance()
+    cache = FeatureCache.get_instance()
+    classifier = None
+    try:
+        classifier = AudioClassifier.get_instance()  # loads the model first: the backend names the cache entries
+    except Exception as e:
+        print(f"❌ CRITICAL ERROR in Batched Audio Classifier: {e}")
+        return [{"file_url": url, "predictions": error_predictions(e)} for url in file_urls]
+
+    def load(url):
+        """(cache key, cache hit, signal or None if the hit covers it), or the exception."""
+        try:
+            key = feature_key(url, loader)
+            hit = cache.lookup(key, AudioClassifier.backend)
+            signal = loader.load(url, sr=SAMPLE_RATE)[0] if hit[0] is None and hit[1] is None else None
+            return key, hit, signal
+        except Exception as e:
+            print(f"❌ Batch decode failed for {url[:50]}: {e}")
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_urls))) as pool:
+        loaded = list(pool.map(load, file_urls))
+
+    results = {i: error_predictions(s) for i, s in enumerate(loaded) if isinstance(s, Exception)}
+    ready = [i for i, s in enumerate(loaded) if not isinstance(s, Exception)]
+
+    if ready:
+        try:
+            print(f"3. Running Batched Inference on {len(ready)} clips (batch_size={batch_size})...")
+            probs = forward_probs(classifier, [loaded[i][2] for i in ready], batch_size,
+                                  keys=[loaded[i][0] for i in ready], cached=[loaded[i][1] for i in ready])
+            for i, row in zip(ready, probs):
+                results[i] = postprocess(row, top_k, aggregate)
+        except Exception as e:
+            print(f"❌ CRITICAL ERROR in Batched Audio Classifier: {e}")
+            for i in ready:
+                results[i] = error_predictions(e)
+
+    return [{"file_url": url, "predictions": results[i]} for i, url in enumerate(file_urls)]
\ No newline at end of file
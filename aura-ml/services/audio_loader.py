@@ -0,0 +1,350 @@
+import os
+import io
+import json
+import time
+import asyncio
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+import requests
+import librosa
+
+from core.http_client import get_http_client
+
+class ByteBudgetLRU:
+    """Thread-safe in-memory LRU bounded by total payload size rather than entry count."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            return None
+
+    def put(self, key, value, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.used_bytes += size
+            while self.used_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_size
+
+    def __len__(self):
+        return len(self._entries)
+
+class DiskCache:
+    """
+    Second-tier cache on local disk. Files are named by key hash; recency is tracked through
+    mtime so eviction (oldest first) survives process restarts and is shared between workers.
+
+    The directory is scanned once at startup and a running byte total is kept afterwards; a
+    write only triggers a scan (which also picks up other workers' files) once that total passes
+    the budget, and eviction then goes down to LOW_WATER of it so scans stay rare.
+    """
+    LOW_WATER = 0.9
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.used_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def read(self, name: str):
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def write(self, name: str, data: bytes):
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # Atomic: concurrent readers never see partial files
+            with self._lock:
+                self.used_bytes += len(data) - replaced
+                over_budget = self.used_bytes > self.max_bytes
+            if over_budget:
+                self._evict()
+        except OSError as e:
+            print(f"⚠️ Audio disk cache write failed: {e}")
+
+    def _scan(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # removed by another worker meanwhile
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        """Rescans the directory and removes the oldest files until usage is under the low-water mark."""
+        with self._lock:
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * self.LOW_WATER
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self.used_bytes = total
+
+class AudioLoader:
+    """
+    Shared Audio Fetch-and-Decode Layer.
+
+    The frontend asks for the waveform, AST tags and CNN label of the same sound card at once;
+    this layer makes sure that file is downloaded and decoded once, not three times.
+
+    Tiers:
+    1. Raw bytes by URL (memory LRU + disk), revalidated with ETag / Last-Modified
+       conditional requests once older than AURA_AUDIO_REVALIDATE_SECONDS.
+    2. Decoded PCM by (url, sample_rate, content version) (memory LRU + disk as .npy).
+
+    Both memory tiers are bounded by bytes (AURA_AUDIO_CACHE_MB), the disk tier by
+    AURA_AUDIO_DISK_CACHE_MB. Concurrent loads of the same key are de-duplicated.
+    """
+    _instance = None
+
+    def __init__(self, memory_mb: float = None, disk_mb: float = None, cache_dir: str = None, revalidate_seconds: float = None):
+        memory_mb = memory_mb if memory_mb is not None else float(os.getenv("AURA_AUDIO_CACHE_MB", "256"))
+        disk_mb = disk_mb if disk_mb is not None else float(os.getenv("AURA_AUDIO_DISK_CACHE_MB", "1024"))
+        cache_dir = cache_dir or os.getenv("AURA_AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "aura-audio-cache"))
+        self.revalidate_seconds = revalidate_seconds if revalidate_seconds is not None else float(os.getenv("AURA_AUDIO_REVALIDATE_SECONDS", "300"))
+
+        # Split the memory budget: compressed bytes are small, decoded float32 PCM is large
+        self._bytes = ByteBudgetLRU(int(memory_mb * 0.25 * 1024 * 1024))
+        self._pcm = ByteBudgetLRU(int(memory_mb * 0.75 * 1024 * 1024))
+        self._disk = DiskCache(cache_dir, int(disk_mb * 1024 * 1024))
+
+        self._session = requests.Session()
+        self._key_locks = {}  # key -> [lock, holders]; dropped when the last holder releases
+        self._key_locks_guard = threading.Lock()
+        self._inflight = {}
+
+        # Counters are bumped from inference threads, the event loop and to_thread workers
+        self._lock = threading.Lock()
+        self.counters = {"bytes_memory_hits": 0, "bytes_disk_hits": 0, "bytes_revalidated": 0, "bytes_downloads": 0,
+                         "pcm_memory_hits": 0, "pcm_disk_hits": 0, "pcm_decodes": 0}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = AudioLoader()
+        return cls._instance
+
+    # -------------------------------------------------
+    # Helpers
+    # -------------------------------------------------
+    @staticmethod
+    def _digest(*parts) -> str:
+        return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    @contextmanager
+    def _locked(self, key):
+        """Per-key lock, so the map only holds keys with a load in progress."""
+        with self._key_locks_guard:
+            slot = self._key_locks.get(key)
+            if slot is None:
+                slot = self._key_locks[key] = [threading.Lock(), 0]
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._key_locks_guard:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self._key_locks[key]
+
+    def _memory_entry(self, url):
+        entry = self._bytes.get(url)
+        if entry is not None:
+            self._count("bytes_memory_hits")
+        return entry
+
+    def _cached_entry(self, url):
+        """Returns the cached bytes entry (memory first, then disk) or None."""
+        return self._memory_entry(url) or self._disk_entry(url)
+
+    def _disk_entry(self, url):
+        name = self._digest(url)
+        meta_raw = self._disk.read(f"{name}.json")
+        content = self._disk.read(f"{name}.bin") if meta_raw else None
+        if content is None:
+            return None
+
+        entry = {**json.loads(meta_raw), "content": content}
+        self._bytes.put(url, entry, len(content))
+        self._count("bytes_disk_hits")
+        return entry
+
+    def _conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _apply_response(self, url, entry, status_code, headers, content):
+        """Updates the byte tiers from an HTTP response (200 or 304) and returns the fresh entry."""
+        if status_code == 304 and entry is not None:
+            self._count("bytes_revalidated")
+            entry = {**entry, "fetched_at": time.time()}
+        else:
+            self._count("bytes_downloads")
+            entry = {
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified"),
+                "version": headers.get("etag") or hashlib.sha1(content).hexdigest(),
+                "fetched_at": time.time(),
+                "content": content,
+            }
+            self._disk.write(f"{self._digest(url)}.bin", content)
+
+        meta = {k: v for k, v in entry.items() if k != "content"}
+        self._disk.write(f"{self._digest(url)}.json", json.dumps(meta).encode())
+        self._bytes.put(url, entry, len(entry["content"]))
+        return entry
+
+    def _is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.revalidate_seconds
+
+    # -------------------------------------------------
+    # Raw bytes tier
+    # -------------------------------------------------
+    def _fetch_entry(self, url):
+        with self._locked(("bytes", url)):
+            entry = self._cached_entry(url)
+            if self._is_fresh(entry):
+                return entry
+            response = self._session.get(url, headers=self._conditional_headers(entry), timeout=30)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return self._apply_response(url, entry, response.status_code, response.headers, response.content)
+
+    def fetch_bytes(self, url: str) -> bytes:
+        """Blocking fetch: returns the file contents, downloading only on a miss or a changed validator."""
+        return self._fetch_entry(url)["content"]
+
+    def version(self, url: str) -> str:
+        """Content version (ETag, else content hash) of the URL's current bytes, revalidated like `fetch_bytes`."""
+        return self._fetch_entry(url)["version"]
+
+    async def afetch_bytes(self, url: str) -> bytes:
+        """
+        Async fetch through the pooled httpx client; concurrent calls for one URL share a download.
+        Disk-tier reads and writes run in a worker thread, never on the event loop.
+        """
+        entry = self._memory_entry(url) or await asyncio.to_thread(self._disk_entry, url)
+        if self._is_fresh(entry):
+            return entry["content"]
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._adownload(url, entry))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # Shielded: a cancelled caller must not cancel the download other callers are sharing
+        return (await asyncio.shield(task))["content"]
+
+    async def _adownload(self, url, entry):
+        response = await get_http_client().get(url, headers=self._conditional_headers(entry))
+        if response.status_code != 304:
+            response.raise_for_status()
+        return await asyncio.to_thread(self._apply_response, url, entry, response.status_code, response.headers, response.content)
+
+    # -------------------------------------------------
+    # Decoded PCM tier
+    # -------------------------------------------------
+    def load(self, url: str, sr=16000):
+        """
+        Returns (signal, sample_rate) for a URL, decoded with librosa at `sr` (None = native rate).
+        The returned array is shared and read-only.
+        """
+        entry = self._fetch_entry(url)
+        key = (url, sr, entry["version"])
+
+        cached = self._pcm.get(key)
+        if cached is not None:
+            self._count("pcm_memory_hits")
+            return cached
+
+        with self._locked(("pcm",) + key):
+            cached = self._pcm.get(key)
+            if cached is not None:
+                self._count("pcm_memory_hits")
+                return cached
+
+            name = f"{self._digest(*key)}.npy"
+            raw = self._disk.read(name)
+            if raw is not None:
+                stored = np.load(io.BytesIO(raw))
+                y, sample_rate = stored[1:].astype(np.float32), int(stored[0])
+                self._count("pcm_disk_hits")
+            else:
+                y, sample_rate = librosa.load(io.BytesIO(entry["content"]), sr=sr)
+                y = y.astype(np.float32, copy=False)
+                buffer = io.BytesIO()
+                # First element carries the sample rate so native-rate loads round-trip
+                np.save(buffer, np.concatenate([[np.float32(sample_rate)], y]))
+                self._disk.write(name, buffer.getvalue())
+                self._count("pcm_decodes")
+
+            y.flags.writeable = False
+            self._pcm.put(key, (y, sample_rate), y.nbytes)
+            return y, sample_rate
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "bytes_memory_used": self._bytes.used_bytes,
+            "pcm_memory_used": self._pcm.used_bytes,
+            "bytes_entries": len(self._bytes),
+            "pcm_entries": len(self._pcm),
+        }
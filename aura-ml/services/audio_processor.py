@@ -1,51 +1,129 @@
-import librosa
-import numpy as np
-import requests
 import io
+import os
+import numpy as np
+import soundfile as sf
+from services.audio_loader import AudioLoader
+
+# Decode block size (frames). Single-resolution runs round this to a multiple of the segment
+# length so every block reduces with one reshape.
+BLOCK_FRAMES = 1 << 16
+DEFAULT_LEVELS = (50, 200, 1000)
+# Request limits: points per level (each level allocates n_points accumulators) and levels per call
+MAX_POINTS = int(os.getenv("AURA_WAVEFORM_MAX_POINTS", "5000"))
+MAX_LEVELS = 8
+
+class EnvelopeAccumulator:
+    """
+    Streaming per-segment reduction for one resolution level.
+
+    The signal is split into `n_points` segments of `step = total // n_points` samples (the tail
+    remainder is dropped, as before). Blocks are folded in as they are decoded:
+    - aligned blocks reduce with a single `reshape(-1, step)`;
+    - unaligned blocks reduce with `np.add.reduceat` / `np.maximum.reduceat` at segment boundaries.
+    """
+
+    def __init__(self, total_frames: int, n_points: int, mode: str = "mean"):
+        if not 1 <= n_points <= MAX_POINTS:
+            raise ValueError(f"n_points must be between 1 and {MAX_POINTS}, got {n_points}")
+        self.n_points = n_points
+        self.mode = mode
+        self.step = total_frames // n_points
+        self.usable = self.step * n_points
+        self.values = np.zeros(n_points, dtype=np.float64)
+
+    def add(self, block: np.ndarray, offset: int):
+        """Folds `block` (mono samples starting at absolute frame `offset`) into the segments."""
+        if self.step == 0 or offset >= self.usable:
+            return
+        block = block[:self.usable - offset]
+        data = block * block if self.mode == "rms" else np.abs(block)
+        reduce = np.maximum if self.mode == "peak" else np.add
+
+        first_seg = offset // self.step
+        if offset % self.step == 0 and len(data) % self.step == 0:
+            partial = data.reshape(-1, self.step)
+            partial = partial.max(axis=1) if self.mode == "peak" else partial.sum(axis=1)
+            segs = np.arange(first_seg, first_seg + len(partial))
+        else:
+            # Local indices where a new segment begins inside this block
+            first_boundary = (-offset) % self.step
+            starts = np.arange(first_boundary, len(data), self.step)
+            if len(starts) == 0 or starts[0] != 0:
+                starts = np.concatenate([[0], starts])
+            partial = reduce.reduceat(data, starts)
+            segs = (offset + starts) // self.step
+
+        reduce.at(self.values, segs, partial)
+
+    def result(self):
+        if self.step == 0:
+            return []
+        if self.mode == "peak":
+            waveform = self.values
+        elif self.mode == "rms":
+            waveform = np.sqrt(self.values / self.step)
+        else:
+            waveform = self.values / self.step
+
+        # Normalize to 0.0 - 1.0 range for easy CSS scaling
+        max_val = waveform.max()
+        if max_val > 0:
+            waveform = waveform / max_val
+        return waveform.astype(float).tolist()
+
+def _stream_envelopes(file_url: str, levels, mode: str):
+    """Decodes the file block by block, feeding every level in a single pass."""
+    audio_bytes = AudioLoader.get_instance().fetch_bytes(file_url)
+    try:
+        with sf.SoundFile(io.BytesIO(audio_bytes)) as f:
+            total = f.frames
+            accumulators = [EnvelopeAccumulator(total, n, mode) for n in levels]
+            blocksize = BLOCK_FRAMES
+            if len(accumulators) == 1 and accumulators[0].step > 0:
+                blocksize = max(1, BLOCK_FRAMES // accumulators[0].step) * accumulators[0].step
+
+            offset = 0
+            for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+                mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+                for acc in accumulators:
+                    acc.add(mono, offset)
+                offset += len(mono)
+    except RuntimeError:  # soundfile.LibsndfileError
+        # Container libsndfile cannot stream (e.g. some mp4/aac previews): decode in full once
+        y, _ = AudioLoader.get_instance().load(file_url, sr=None)
+        accumulators = [EnvelopeAccumulator(len(y), n, mode) for n in levels]
+        for acc in accumulators:
+            acc.add(y, 0)
 
-def extract_waveform(file_url: str, n_points: int = 100):
+    return {n: acc.result() for n, acc in zip(levels, accumulators)}
+
+def extract_waveform(file_url: str, n_points: int = 100, mode: str = "mean"):
     """
     Audio Signal Processing Utility.
     Downloads an audio file and generates a simplified waveform representation for UI visualization.
-    
+
     Optimization Strategy:
-    - Downsamples the high-fidelity audio (44.1kHz+) into a compact array of 'n_points' (default 100).
-    - Calculates the mean amplitude for each segment to preserve the visual "shape" of the sound without data bloat.
+    - Streams the decode in fixed-size blocks, so a 5-minute 44.1kHz preview is never held in memory as a whole.
+    - Reduces each block to the compact array of 'n_points' (default 100) with vectorised NumPy ops.
+    - `mode` picks the per-segment statistic: 'mean' amplitude (default), 'rms' or 'peak'.
     - Normalizes values to a 0.0 - 1.0 range for CSS styling compatibility.
     """
     try:
-        # 1. Download the file into memory (don't save to disk)
-        response = requests.get(file_url)
-        response.raise_for_status()
-        audio_bytes = io.BytesIO(response.content)
-
-        # 2. Load with Librosa
-        # sr=None means keep original sampling rate
-        y, sr = librosa.load(audio_bytes, sr=None)
-
-        # 3. Downsample to n_points (we don't need 44,000 points for a tiny UI card)
-        # We take the absolute value (amplitude)
-        y_abs = np.abs(y)
-        
-        # Calculate how many samples per point
-        step = len(y_abs) // n_points
-        
-        # Take the average amplitude for each chunk
-        waveform = []
-        for i in range(0, len(y_abs), step):
-            chunk = y_abs[i:i+step]
-            if len(chunk) > 0:
-                avg_amp = np.mean(chunk)
-                waveform.append(float(avg_amp))
-        
-        # Normalize to 0.0 - 1.0 range for easy CSS scaling
-        if len(waveform) > 0:
-            max_val = max(waveform)
-            if max_val > 0:
-                waveform = [x / max_val for x in waveform]
-
-        return waveform[:n_points] # Ensure exact length
+        return _stream_envelopes(file_url, [n_points], mode)[n_points]
+    except Exception as e:
+        print(f"Audio Analysis Error: {e}")
+        return []
 
+def extract_waveform_levels(file_url: str, levels=DEFAULT_LEVELS, mode: str = "mean"):
+    """
+    Multi-Resolution Waveform.
+    Returns several `n_points` levels (e.g. 50/200/1000 for zoomable UI) from one decode pass.
+    """
+    levels = sorted(set(int(n) for n in levels))
+    if not levels or len(levels) > MAX_LEVELS or levels[0] < 1 or levels[-1] > MAX_POINTS:
+        raise ValueError(f"levels must be 1-{MAX_LEVELS} values between 1 and {MAX_POINTS}")
+    try:
+        return _stream_envelopes(file_url, levels, mode)
     except Exception as e:
         print(f"Audio Analysis Error: {e}")
-        return []
\ No newline at end of file
+        return {n: [] for n in levels}
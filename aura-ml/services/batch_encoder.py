@@ -0,0 +1,142 @@
+import os
+import queue
+import threading
+import time
+from collections import deque, Counter
+from concurrent.futures import Future
+import numpy as np
+
+class BatchEncoder:
+    """
+    Micro-Batching Scheduler for SentenceTransformer.
+
+    Concurrent requests each need a single query embedding; encoding them one-by-one on
+    separate worker threads wastes CPU on per-call overhead and thread contention.
+    This service funnels them into one background thread that runs a single vectorised
+    `model.encode` per batch and fans the rows back out to the waiting callers.
+
+    Tuning (latency vs throughput):
+    - max_batch_size: upper bound on texts per forward pass (AURA_ENCODER_MAX_BATCH).
+    - max_wait_ms: how long the first queued request may wait for company (AURA_ENCODER_MAX_WAIT_MS).
+
+    Exposes the same `encode(str | list)` interface as the model, so it can sit behind the
+    EmbeddingCache unchanged. Async callers can use `submit()` and await the returned Future.
+    """
+
+    def __init__(self, model, max_batch_size: int = None, max_wait_ms: float = None, window: int = 1024):
+        self.model = model
+        self.max_batch_size = max_batch_size or int(os.getenv("AURA_ENCODER_MAX_BATCH", "32"))
+        wait_ms = max_wait_ms if max_wait_ms is not None else float(os.getenv("AURA_ENCODER_MAX_WAIT_MS", "5"))
+        self.max_wait = wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # Metrics (sliding windows so long-running workers report recent behaviour)
+        self._stats_lock = threading.Lock()
+        self.total_batches = 0
+        self.total_requests = 0
+        self._batch_sizes = deque(maxlen=window)
+        self._queue_waits = deque(maxlen=window)
+        self._encode_times = deque(maxlen=window)
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="batch-encoder", daemon=True)
+                    self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queues a single text and returns a Future resolving to its embedding."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def encode(self, texts):
+        """Blocking, model-compatible entry point: a str yields a vector, a list yields a 2-D array."""
+        if isinstance(texts, str):
+            return self.submit(texts).result()
+        futures = [self.submit(t) for t in texts]
+        return np.stack([f.result() for f in futures])
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown sentinel: finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            # Callers that gave up (e.g. a cancelled `asyncio.wrap_future` awaiter) are dropped here;
+            # the rest are marked running, so a late cancel can no longer invalidate their result
+            batch = [item for item in self._collect(first) if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._encode_batch(batch)
+            except Exception as e:
+                # Never let one batch kill the only worker thread
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _encode_batch(self, batch):
+        started = time.perf_counter()
+        texts = [text for text, _, _ in batch]
+        vectors = self.model.encode(texts, batch_size=len(texts))
+        finished = time.perf_counter()
+
+        for (_, future, _), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+        with self._stats_lock:
+            self.total_batches += 1
+            self.total_requests += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._queue_waits.extend((started - enqueued) * 1000 for _, _, enqueued in batch)
+            self._encode_times.append((finished - started) * 1000)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self):
+        with self._stats_lock:
+            sizes = list(self._batch_sizes)
+            waits = np.array(self._queue_waits) if self._queue_waits else np.zeros(1)
+            encode_ms = np.array(self._encode_times) if self._encode_times else np.zeros(1)
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "total_batches": self.total_batches,
+                "total_requests": self.total_requests,
+                "queue_depth": self._queue.qsize(),
+                "avg_batch_size": round(float(np.mean(sizes)), 2) if sizes else 0.0,
+                "batch_size_histogram": dict(sorted(Counter(sizes).items())),
+                "queue_wait_ms": {
+                    "avg": round(float(waits.mean()), 3),
+                    "p50": round(float(np.percentile(waits, 50)), 3),
+                    "p95": round(float(np.percentile(waits, 95)), 3),
+                    "max": round(float(waits.max()), 3),
+                },
+                "encode_ms_avg": round(float(encode_ms.mean()), 3),
+            }
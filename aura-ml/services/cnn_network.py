@@ -0,0 +1,114 @@
+import os
+import copy
+import warnings
+import torch
+import torch.nn as nn
+from core.onnx_export import parity_report
+
+# Imported lazily by services/custom_cnn.py on first model load (keeps torch off the startup path).
+
+# ---------------------------------------------------------
+# Neural Network Architecture
+# 4-Layer 2D Convolutional Neural Network (CNN) optimized for 
+# Mel-Spectrogram classification (UrbanSound8K taxonomy).
+# ---------------------------------------------------------
+class AudioCNN(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv1 = nn.Sequential(
+            nn.Conv2d(1, 8, kernel_size=3, stride=1, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(kernel_size=2, stride=2)
+        )
+        self.conv2 = nn.Sequential(
+            nn.Conv2d(8, 16, kernel_size=3, stride=1, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(kernel_size=2, stride=2)
+        )
+        self.conv3 = nn.Sequential(
+            nn.Conv2d(16, 32, kernel_size=3, stride=1, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(kernel_size=2, stride=2)
+        )
+        self.conv4 = nn.Sequential(
+            nn.Conv2d(32, 64, kernel_size=3, stride=1, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(kernel_size=2, stride=2)
+        )
+        self.flatten = nn.Flatten()
+        self.linear = nn.Linear(64 * 4 * 2, 10) 
+
+    def forward(self, x):
+        x = self.conv1(x)
+        x = self.conv2(x)
+        x = self.conv3(x)
+        x = self.conv4(x)
+        x = self.flatten(x)
+        logits = self.linear(x)
+        return logits
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aura_cnn_v1.pth")
+INPUT_SHAPE = (1, 64, 32)  # (channels, mels, frames) for 1 second @ 16kHz
+INFERENCE_MODES = ("eager", "scripted", "quantized", "compiled")
+CALIBRATION_SEED = 4321  # static quantization calibrates on different inputs than the parity check
+
+def reference_spectrograms(n: int = 32, seed: int = 1234):
+    """Fixed, seeded batch of normalised (0-1) log-mel inputs used for parity checks and benchmarks."""
+    generator = torch.Generator().manual_seed(seed)
+    return torch.rand((n,) + INPUT_SHAPE, generator=generator)
+
+def quantize_static(model, calibration):
+    """
+    Post-training static int8 quantization (FX graph mode) for the active quantized engine
+    (x86/fbgemm on servers, qnnpack on ARM): Conv+ReLU pairs are fused and the convs and pools run
+    in int8, with activation ranges observed on `calibration`. The 512->10 Linear head stays fp32:
+    it costs nothing measurable and halves the probability error vs eager.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    engine = torch.backends.quantized.engine
+    qconfig_mapping = get_default_qconfig_mapping(engine).set_object_type(nn.Linear, None)
+    prepared = prepare_fx(copy.deepcopy(model).eval(), qconfig_mapping, example_inputs=(calibration[:1],))
+    with torch.no_grad():
+        prepared(calibration)
+    return convert_fx(prepared)
+
+def build_inference_model(model, mode: str):
+    """
+    Produces an optimized CPU inference variant of an eval-mode AudioCNN:
+    - scripted:  TorchScript trace + freeze (constant-folded weights, fused graph, no Python dispatch).
+    - quantized: static int8 quantization of the conv stack (see `quantize_static`), calibrated on
+                 a seeded spectrogram set disjoint from the parity set, then traced + frozen like 'scripted'.
+    - compiled:  torch.compile (Inductor); compiles lazily on the first call.
+    """
+    if mode == "eager":
+        return model
+    example = reference_spectrograms(1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # torch.jit / torch.ao deprecation notices
+        if mode == "compiled":
+            return torch.compile(model)
+        if mode == "quantized":
+            model = quantize_static(model, reference_spectrograms(256, seed=CALIBRATION_SEED))
+        with torch.no_grad():
+            return torch.jit.freeze(torch.jit.trace(model, example))
+
+def check_parity(reference, candidate, inputs=None, tolerance: float = 0.05):
+    """
+    Compares a candidate model against the eager reference on the fixed spectrogram set.
+    Passes when every top-1 label agrees and no class probability differs by more than `tolerance`.
+    """
+    inputs = reference_spectrograms() if inputs is None else inputs
+    with torch.no_grad():
+        ref_probs = torch.softmax(reference(inputs), dim=1)
+        cand_probs = torch.softmax(candidate(inputs), dim=1)
+    return parity_report(ref_probs.numpy(), cand_probs.numpy(), tolerance)
+
+def load_eager_model(path: str = MODEL_PATH):
+    model = AudioCNN()
+    # Load weights (map_location='cpu' is crucial for deployment compatibility)
+    state_dict = torch.load(path, map_location=torch.device('cpu'))
+    model.load_state_dict(state_dict)
+    model.eval() # Set to inference mode
+    return model
@@ -1,49 +1,9 @@
-import torch
-import torch.nn as nn
+import os
+import time
 import librosa
 import numpy as np
-import io
-import requests
-
-# ---------------------------------------------------------
-# Neural Network Architecture
-# 4-Layer 2D Convolutional Neural Network (CNN) optimized for 
-# Mel-Spectrogram classification (UrbanSound8K taxonomy).
-# ---------------------------------------------------------
-class AudioCNN(nn.Module):
-    def __init__(self):
-        super().__init__()
-        self.conv1 = nn.Sequential(
-            nn.Conv2d(1, 8, kernel_size=3, stride=1, padding=1),
-            nn.ReLU(),
-            nn.MaxPool2d(kernel_size=2, stride=2)
-        )
-        self.conv2 = nn.Sequential(
-            nn.Conv2d(8, 16, kernel_size=3, stride=1, padding=1),
-            nn.ReLU(),
-            nn.MaxPool2d(kernel_size=2, stride=2)
-        )
-        self.conv3 = nn.Sequential(
-            nn.Conv2d(16, 32, kernel_size=3, stride=1, padding=1),
-            nn.ReLU(),
-            nn.MaxPool2d(kernel_size=2, stride=2)
-        )
-        self.conv4 = nn.Sequential(
-            nn.Conv2d(32, 64, kernel_size=3, stride=1, padding=1),
-            nn.ReLU(),
-            nn.MaxPool2d(kernel_size=2, stride=2)
-        )
-        self.flatten = nn.Flatten()
-        self.linear = nn.Linear(64 * 4 * 2, 10) 
-
-    def forward(self, x):
-        x = self.conv1(x)
-        x = self.conv2(x)
-        x = self.conv3(x)
-        x = self.conv4(x)
-        x = self.flatten(x)
-        logits = self.linear(x)
-        return logits
+from services.audio_loader import AudioLoader
+from core.model_registry import ModelRegistry
 
 # Training taxonomy labels from the UrbanSound8K dataset
 LABELS = [
@@ -51,29 +11,117 @@ LABELS = [
     "Drilling", "Engine Idling", "Gun Shot", "Jackhammer", "Siren", "Street Music"
 ]
 
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 16000  # the CNN was trained on 1-second clips
+MAX_WINDOWS = int(os.getenv("AURA_CNN_MAX_WINDOWS", "512"))
+POOLING_MODES = ("mean", "max")
+MODEL_NAME = "Custom CNN (UrbanSound8K)"
+
+# The network itself (and torch) lives in services/cnn_network.py and is only imported when the
+# model is first loaded, so importing this module stays cheap.
+
 class CustomModelLoader:
     """
     Lazy-loading Singleton for the Custom CNN.
     Manages the lifecycle of the PyTorch model implementation to minimize memory overhead.
+
+    Inference mode is selected with AURA_CNN_MODE (eager | scripted | quantized | compiled).
+    Optimized variants are only served if they pass the parity check against the eager model;
+    otherwise the loader falls back to eager.
     """
     _model = None
+    mode = "eager"
+    parity = None
 
     @classmethod
     def get_model(cls):
+        return ModelRegistry.get_instance().get("custom_cnn")
+
+    @classmethod
+    def load(cls):
         if cls._model is None:
             print("Loading Custom CNN Weights...")
-            model = AudioCNN()
-            # Load weights (map_location='cpu' is crucial for deployment compatibility)
             try:
-                state_dict = torch.load("aura_cnn_v1.pth", map_location=torch.device('cpu'))
-                model.load_state_dict(state_dict)
-                model.eval() # Set to inference mode
-                cls._model = model
+                from services.cnn_network import load_eager_model
+                model = load_eager_model()
+                cls._model, cls.mode = model, "eager"
                 print("✅ Custom CNN Loaded Successfully")
             except Exception as e:
                 print(f"❌ Failed to load model: {e}")
+                return cls._model
+
+            requested = os.getenv("AURA_CNN_MODE", "eager").lower()
+            if requested != "eager":
+                cls._optimize(model, requested)
         return cls._model
 
+    @classmethod
+    def _optimize(cls, model, requested):
+        from services.cnn_network import INFERENCE_MODES, build_inference_model, check_parity
+        if requested not in INFERENCE_MODES:
+            print(f"⚠️ Unknown AURA_CNN_MODE '{requested}'. Serving eager model.")
+            return
+        try:
+            started = time.perf_counter()
+            optimized = build_inference_model(model, requested)
+            cls.parity = check_parity(model, optimized, tolerance=float(os.getenv("AURA_CNN_PARITY_TOL", "0.05")))
+            if cls.parity["passed"]:
+                cls._model, cls.mode = optimized, requested
+                print(f"✅ Custom CNN optimized ({requested}) in {time.perf_counter() - started:.2f}s. Parity: {cls.parity}")
+            else:
+                print(f"⚠️ Custom CNN {requested} variant failed parity {cls.parity}. Serving eager model.")
+        except Exception as e:
+            print(f"⚠️ Custom CNN {requested} optimization failed ({e}). Serving eager model.")
+
+    @classmethod
+    def unload(cls):
+        cls._model, cls.mode, cls.parity = None, "eager", None
+
+ModelRegistry.get_instance().register("custom_cnn", CustomModelLoader.load, CustomModelLoader.unload, default_policy="lazy")
+
+def log_mel_batch(frames: np.ndarray) -> np.ndarray:
+    """
+    Vectorized training-aligned preprocessing for a (n_windows, 16000) batch of 1-second frames.
+
+    Equivalent to running, per frame: melspectrogram (64 mels, 1024 FFT, hop 512) ->
+    power_to_db(ref=np.max, top_db=80) -> min/max normalization to 0-1.
+    The STFT/mel projection runs once over the whole batch; the dB reference, top_db floor and
+    normalization are applied per frame so every window matches single-clip inference.
+    """
+    mel = librosa.feature.melspectrogram(
+        y=np.ascontiguousarray(frames, dtype=np.float32), sr=SAMPLE_RATE, n_mels=64, n_fft=1024, hop_length=512
+    )
+    amin = 1e-10
+    ref = np.maximum(amin, mel.max(axis=(1, 2), keepdims=True))
+    mel_db = 10.0 * np.log10(np.maximum(amin, mel)) - 10.0 * np.log10(ref)
+    mel_db = np.maximum(mel_db, mel_db.max(axis=(1, 2), keepdims=True) - 80.0)
+
+    lo = mel_db.min(axis=(1, 2), keepdims=True)
+    hi = mel_db.max(axis=(1, 2), keepdims=True)
+    return (mel_db - lo) / (hi - lo + 1e-6)
+
+def frame_signal(signal: np.ndarray, hop_seconds: float = 0.5):
+    """
+    Splits a full-length signal into 1-second windows (strided view via librosa.util.frame).
+    Clips shorter than a window are zero-padded to one window; the tail is padded so it is covered too.
+    Long files are evenly subsampled to at most AURA_CNN_MAX_WINDOWS windows to bound the batch.
+
+    Returns (frames, start offsets in samples).
+    """
+    hop = max(1, int(hop_seconds * SAMPLE_RATE))
+    if len(signal) <= WINDOW_SAMPLES:
+        signal = np.pad(signal, (0, WINDOW_SAMPLES - len(signal)))
+    else:
+        remainder = (len(signal) - WINDOW_SAMPLES) % hop
+        if remainder:
+            signal = np.pad(signal, (0, hop - remainder))
+    frames = librosa.util.frame(signal, frame_length=WINDOW_SAMPLES, hop_length=hop, axis=0)
+    positions = np.arange(len(frames))
+    if len(frames) > MAX_WINDOWS:
+        positions = np.linspace(0, len(frames) - 1, MAX_WINDOWS).round().astype(int)
+        frames = frames[positions]
+    return frames, positions * hop
+
 def predict_with_custom_model(file_url):
     """
     Executes inference using the bespoke CNN model.
@@ -85,38 +133,30 @@ def predict_with_custom_model(file_url):
     4. Normalize pixel values (0-1).
     5. Tensor Transformation (Add batch/channel dimensions).
     """
+    import torch
     try:
-        # Download & Preprocess
-        response = requests.get(file_url)
-        audio_bytes = io.BytesIO(response.content)
-        
+        # Download & Preprocess (shared AudioLoader cache)
         # Load 1 second of audio at 16k sample rate
-        signal, sr = librosa.load(audio_bytes, sr=16000)
+        signal, sr = AudioLoader.get_instance().load(file_url, sr=SAMPLE_RATE)
         
         # Pad or Cut to 16000 samples (1 sec)
-        if len(signal) > 16000:
-            signal = signal[:16000]
+        if len(signal) > WINDOW_SAMPLES:
+            signal = signal[:WINDOW_SAMPLES]
         else:
-            padding = 16000 - len(signal)
+            padding = WINDOW_SAMPLES - len(signal)
             signal = np.pad(signal, (0, padding))
 
-        # Mel Spectrogram
-        mel_spec = librosa.feature.melspectrogram(
-            y=signal, sr=16000, n_mels=64, n_fft=1024, hop_length=512
-        )
-        mel_spec = librosa.power_to_db(mel_spec, ref=np.max)
+        # Mel Spectrogram -> dB -> Normalize 0-1
+        mel_spec = log_mel_batch(signal[np.newaxis])
         
-        # Normalize 0-1
-        mel_spec = (mel_spec - mel_spec.min()) / (mel_spec.max() - mel_spec.min() + 1e-6)
-        
-        # Tensorize (Add batch and channel dims: 1, 1, 64, 32)
-        input_tensor = torch.tensor(mel_spec, dtype=torch.float32).unsqueeze(0).unsqueeze(0)
+        # Tensorize (Add channel dim: 1, 1, 64, 32)
+        input_tensor = torch.from_numpy(mel_spec).float().unsqueeze(1)
 
         # Predict
         model = CustomModelLoader.get_model()
         if not model: return {"error": "Model not loaded"}
         
-        with torch.no_grad():
+        with torch.inference_mode():
             logits = model(input_tensor)
             probs = torch.nn.functional.softmax(logits, dim=1)
             
@@ -125,8 +165,53 @@ def predict_with_custom_model(file_url):
         return {
             "label": LABELS[index.item()],
             "confidence": float(score.item()),
-            "model": "Custom CNN (UrbanSound8K)"
+            "model": MODEL_NAME
+        }
+
+    except Exception as e:
+        return {"error": str(e)}
+
+def predict_windowed(file_url, hop_seconds: float = 0.5, pooling: str = "mean", top_k: int = 3):
+    """
+    Sliding-Window Classification for full-length audio.
+
+    Process Flow:
+    1. Decode the whole file at 16kHz (shared AudioLoader cache).
+    2. Frame into 1-second windows with a `hop_seconds` hop.
+    3. Compute every window's log-mel spectrogram in one vectorized pass.
+    4. Run all windows through the CNN as a single batched forward call.
+    5. Pool window probabilities ('mean' or 'max') into the file-level prediction.
+    """
+    if pooling not in POOLING_MODES:
+        return {"error": f"Unknown pooling '{pooling}'. Use one of {POOLING_MODES}."}
+    import torch
+    try:
+        signal, _ = AudioLoader.get_instance().load(file_url, sr=SAMPLE_RATE)
+        frames, starts = frame_signal(signal, hop_seconds)
+        input_tensor = torch.from_numpy(log_mel_batch(frames)).float().unsqueeze(1)
+
+        model = CustomModelLoader.get_model()
+        if not model: return {"error": "Model not loaded"}
+
+        with torch.inference_mode():
+            probs = torch.nn.functional.softmax(model(input_tensor), dim=1)
+
+        pooled = probs.mean(dim=0) if pooling == "mean" else probs.max(dim=0).values
+        window_scores, window_indices = probs.max(dim=1)
+        top_scores, top_indices = torch.topk(pooled, min(top_k, len(LABELS)))
+        return {
+            "label": LABELS[int(top_indices[0])],
+            "confidence": float(top_scores[0]),
+            "model": MODEL_NAME,
+            "pooling": pooling,
+            "predictions": [
+                {"label": LABELS[int(i)], "score": float(s)} for s, i in zip(top_scores, top_indices)
+            ],
+            "windows": [
+                {"start": round(float(start) / SAMPLE_RATE, 3), "label": LABELS[int(i)], "confidence": float(s)}
+                for start, s, i in zip(starts, window_scores, window_indices)
+            ],
         }
 
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from collections import OrderedDict
+import numpy as np
+
+class EmbeddingCache:
+    """
+    Query-Embedding Cache.
+    Sits in front of `SentenceTransformer.encode` so repeated queries (Face DJ vibes,
+    "Surprise Me" scenarios, popular searches) skip the transformer forward pass.
+
+    Design:
+    - Keys are normalised text (lower-cased, whitespace-collapsed). 'all-MiniLM-L6-v2' uses an
+      uncased tokenizer, so this never changes the resulting embedding.
+    - Bounded LRU (OrderedDict) with thread-safe access for FastAPI's worker threads.
+    - Pinned entries (pre-embedded at startup) are never evicted.
+    - Cached vectors are read-only and shared between requests.
+    """
+
+    def __init__(self, encoder, max_size: int = 2048):
+        self.encoder = encoder
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pinned = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _lookup(self, key):
+        with self._lock:
+            vector = self._pinned.get(key)
+            if vector is None:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+            if vector is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return vector
+
+    def _store(self, key, vector, pin=False):
+        vector = np.asarray(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        with self._lock:
+            if pin:
+                self._pinned[key] = vector
+                self._entries.pop(key, None)
+                return vector
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return vector
+
+    def encode(self, text: str):
+        """Returns the embedding for a single text, encoding it only on a cache miss."""
+        key = self.normalize(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = self._store(key, self.encoder.encode(key))
+        return vector
+
+    async def aencode(self, text: str):
+        """
+        Async variant for `async def` endpoints. Misses are awaited on the encoder's Future
+        (BatchEncoder) or offloaded to a worker thread, so the event loop never blocks.
+        """
+        key = self.normalize(text)
+        vector = self._lookup(key)
+        if vector is None:
+            if hasattr(self.encoder, "submit"):
+                encoded = await asyncio.wrap_future(self.encoder.submit(key))
+            else:
+                encoded = await asyncio.to_thread(self.encoder.encode, key)
+            vector = self._store(key, encoded)
+        return vector
+
+    def encode_many(self, texts, pin: bool = False):
+        """Returns embeddings for several texts; all misses are encoded in a single batch."""
+        keys = [self.normalize(t) for t in texts]
+        vectors = [None if pin else self._lookup(k) for k in keys]
+        missing = list(dict.fromkeys(k for k, v in zip(keys, vectors) if v is None))
+
+        if missing:
+            encoded = dict(zip(missing, self.encoder.encode(missing)))
+            vectors = [v if v is not None else self._store(k, encoded[k], pin=pin) for k, v in zip(keys, vectors)]
+        return vectors
+
+    def warm(self, texts):
+        """Pre-embeds and pins a fixed vocabulary (e.g. emotion vibe strings) at startup."""
+        self.encode_many(list(texts), pin=True)
+        print(f"✅ Embedding Cache warmed with {len(self._pinned)} pinned queries.")
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "pinned": len(self._pinned),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -1,74 +1,181 @@
+import os
 import base64
 import io
 from PIL import Image
-from transformers import pipeline
+from core.model_registry import ModelRegistry
+
+MODEL_NAME = "dima806/facial_emotions_image_detection"
+# Serving backend: pipeline (eager PyTorch) | onnx | onnx-int8 (ONNX Runtime, see services/emotion_onnx.py)
+BACKENDS = ("pipeline", "onnx", "onnx-int8")
+
+# ViT input resolution: frames are decoded straight to (at least) this size instead of full resolution
+FACE_INPUT_SIZE = int(os.getenv("AURA_FACE_INPUT_SIZE", "224"))
+# Frames per forward pass in detect_emotions
+FACE_BATCH_SIZE = int(os.getenv("AURA_FACE_BATCH_SIZE", "8"))
 
 class EmotionClassifier:
     """
     Computer Vision Pipeline Singleton.
     Wraps the Hugging Face Transformers pipeline for facial emotion recognition.
     Utilizes a model fine-tuned on the FER-2013 dataset for high-accuracy emotion detection.
+
+    Backend is selected with AURA_EMOTION_BACKEND (pipeline | onnx | onnx-int8).
+    ONNX variants are only served if they passed the parity check against the pipeline;
+    otherwise (or if onnxruntime is not installed) the pipeline is served.
     """
     _instance = None
+    backend = "pipeline"
+    parity = None
 
     @classmethod
     def get_instance(cls):
+        return ModelRegistry.get_instance().get("emotion")
+
+    @classmethod
+    def load(cls):
+        if cls._instance is None:
+            requested = os.getenv("AURA_EMOTION_BACKEND", "pipeline").lower()
+            if requested not in BACKENDS:
+                print(f"⚠️ Unknown AURA_EMOTION_BACKEND '{requested}'. Serving the pipeline.")
+            elif requested != "pipeline":
+                cls._load_onnx(requested)
         if cls._instance is None:
             print("⏳ Loading Vision Model (Facial Emotion)...")
-            from transformers import logging
+            from transformers import logging, pipeline
             logging.set_verbosity_error() # <--- Suppress warnings
             
             # We use a high-performance model fine-tuned on FER-2013
             cls._instance = pipeline(
                 "image-classification", 
-                model="dima806/facial_emotions_image_detection" 
+                model=MODEL_NAME
             )
+            cls.backend = "pipeline"
             print("✅ Vision Model Loaded.")
         return cls._instance
 
-def detect_emotion(base64_image: str):
+    @classmethod
+    def _load_onnx(cls, requested):
+        try:
+            from services.emotion_onnx import load_onnx_classifier
+            classifier, cls.parity = load_onnx_classifier(
+                MODEL_NAME, quantized=requested == "onnx-int8",
+                threads=int(os.getenv("AURA_EMOTION_ONNX_THREADS", "0")),
+                tolerance=float(os.getenv("AURA_EMOTION_PARITY_TOL", "0.05")),
+            )
+            if cls.parity["passed"]:
+                cls._instance, cls.backend = classifier, requested
+                print(f"✅ Vision Model Loaded ({requested}). Parity: {cls.parity}")
+            else:
+                print(f"⚠️ Emotion {requested} variant failed parity {cls.parity}. Serving the pipeline.")
+        except Exception as e:
+            print(f"⚠️ Emotion {requested} backend unavailable ({e}). Serving the pipeline.")
+
+    @classmethod
+    def unload(cls):
+        cls._instance, cls.backend, cls.parity = None, "pipeline", None
+
+ModelRegistry.get_instance().register("emotion", EmotionClassifier.load, EmotionClassifier.unload, default_policy="eager")
+
+def decode_frame(frame, size: int = FACE_INPUT_SIZE) -> Image.Image:
     """
-    Performs emotion inference on a base64 encoded image.
-    
+    Webcam frame -> RGB image whose short side is between `size` and 2 * `size`.
+
+    Accepts raw image bytes, base64 or a data URL ("data:image/jpeg;base64,...").
+    - JPEG: `draft` decodes at 1/2, 1/4 or 1/8 scale inside the DCT, so the full-resolution
+      frame is never materialized.
+    - Other formats (PNG, WebP): integer box `reduce` right after decode.
+    The pipeline's processor still does the final resize to the model's input size.
+    """
+    if isinstance(frame, str):
+        # Clean up the Base64 string (remove "data:image/jpeg;base64,")
+        if "," in frame:
+            frame = frame.split(",", 1)[1]
+        frame = base64.b64decode(frame)
+
+    image = Image.open(io.BytesIO(frame))
+    image.draft("RGB", (size, size))  # no-op for non-JPEG
+    factor = min(image.size) // size
+    if factor >= 2:
+        image = image.reduce(factor)
+    return image.convert("RGB")
+
+def pick_emotion(predictions):
+    """
+    Chooses the reported emotion from the pipeline's ranked predictions.
+
     Includes heuristic post-processing to reduce "Neutral Bias":
     - Since 'neutral' is a common default catch-all state, this logic prioritizes 
       stronger emotional signals (e.g., 'happy', 'sad') if they are detected 
       with sufficiently high confidence nearby the top score.
     """
-    try:
-        # 1. Clean up the Base64 string (remove "data:image/jpeg;base64,")
-        if "," in base64_image:
-            base64_image = base64_image.split(",")[1]
-        
-        # 2. Decode Image
-        image_bytes = base64.b64decode(base64_image)
-        image = Image.open(io.BytesIO(image_bytes))
-
-        # 3. Run Inference
-        classifier = EmotionClassifier.get_instance()
-        predictions = classifier(image)
-        
-        # 4. Get Top Predictions (Top 3)
-        top_preds = predictions[:3]
-        top_emotion = top_preds[0]
-        
-        # --- LOGIC IMPROVEMENT: Anti-Neutral Bias ---
-        # If 'neutral' is #1, but a strong emotion is a close second, pick the strong one.
-        if top_emotion['label'] == 'neutral' and len(top_preds) > 1:
-            second_emotion = top_preds[1]
-            # If the gap is small (< 20%)
-            if (top_emotion['score'] - second_emotion['score']) < 0.2:
-                print(f"🔄 Override Neutral: Picking '{second_emotion['label']}' ({second_emotion['score']:.2f})")
-                top_emotion = second_emotion
-
-        # Threshold check (ignore very weak predictions)
-        if top_emotion['score'] < 0.25:
-             print(f"⚠️ Low Confidence ({top_emotion['score']:.2f}). Defaulting to Neutral.")
-             return {"label": "neutral", "score": 0.0}
-
-        print(f"👁️ Detected: {top_emotion['label']} ({top_emotion['score']:.2f})")
-        return top_emotion
+    # Get Top Predictions (Top 3)
+    top_preds = predictions[:3]
+    top_emotion = top_preds[0]
+    
+    # --- LOGIC IMPROVEMENT: Anti-Neutral Bias ---
+    # If 'neutral' is #1, but a strong emotion is a close second, pick the strong one.
+    if top_emotion['label'] == 'neutral' and len(top_preds) > 1:
+        second_emotion = top_preds[1]
+        # If the gap is small (< 20%)
+        if (top_emotion['score'] - second_emotion['score']) < 0.2:
+            print(f"🔄 Override Neutral: Picking '{second_emotion['label']}' ({second_emotion['score']:.2f})")
+            top_emotion = second_emotion
+
+    # Threshold check (ignore very weak predictions)
+    if top_emotion['score'] < 0.25:
+         print(f"⚠️ Low Confidence ({top_emotion['score']:.2f}). Defaulting to Neutral.")
+         return {"label": "neutral", "score": 0.0}
+
+    print(f"👁️ Detected: {top_emotion['label']} ({top_emotion['score']:.2f})")
+    return top_emotion
+
+def classify_images(images, batch_size: int = FACE_BATCH_SIZE):
+    """Ranked [{"label", "score"}, ...] predictions for each decoded image, in batched forward passes."""
+    classifier = EmotionClassifier.get_instance()
+    return classifier(images, batch_size=max(1, min(batch_size, len(images))))
+
+def detect_emotions(frames, batch_size: int = FACE_BATCH_SIZE):
+    """
+    Emotion inference for several frames in batched forward passes.
+
+    Process Flow:
+    1. Decode every frame at (close to) the model's input size; undecodable frames report neutral.
+    2. One pipeline call over all decoded images (`batch_size` images per forward pass).
+    3. Per-frame anti-neutral post-processing (`pick_emotion`).
+    Returns one {"label", "score"} per input frame, in order.
+    """
+    results = [{"label": "neutral", "score": 0.0} for _ in frames]
+    images, positions = [], []
+    for pos, frame in enumerate(frames):
+        try:
+            images.append(decode_frame(frame))
+            positions.append(pos)
+        except Exception as e:
+            print(f"❌ Vision Error (frame {pos}): {e}")
+    if not images:
+        return results
 
+    try:
+        predictions = classify_images(images, batch_size)
+        for pos, frame_predictions in zip(positions, predictions):
+            results[pos] = pick_emotion(frame_predictions)
     except Exception as e:
         print(f"❌ Vision Error: {e}")
-        return {"label": "neutral", "score": 0.0}
\ No newline at end of file
+    return results
+
+def dominant_emotion(results):
+    """Label with the highest total score over a batch of frame results (neutral for an empty batch)."""
+    totals = {}
+    for result in results:
+        totals[result['label']] = totals.get(result['label'], 0.0) + result['score']
+    if not totals:
+        return {"label": "neutral", "score": 0.0}
+    label = max(totals, key=totals.get)
+    return {"label": label, "score": totals[label] / sum(1 for r in results if r['label'] == label)}
+
+def detect_emotion(frame):
+    """
+    Performs emotion inference on one image (raw bytes, base64 or data URL).
+    Same decode and anti-neutral post-processing as `detect_emotions`.
+    """
+    return detect_emotions([frame])[0]
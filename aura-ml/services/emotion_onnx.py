@@ -0,0 +1,130 @@
+import os
+import json
+import tempfile
+import numpy as np
+from PIL import Image
+from core.onnx_export import export_onnx, quantize_onnx, create_session, softmax, model_slug, staged, parity_passed, parity_report
+
+# -------------------------------------------------
+# ONNX Runtime backend for the face-emotion model (AURA_EMOTION_BACKEND=onnx | onnx-int8)
+#
+# The transformers model is exported once and cached under AURA_EMOTION_ONNX_DIR/<model>/:
+#   model.onnx, model-int8.onnx      fp32 graph / dynamic int8 quantization of its weights
+#   config.json, preprocessor_*.json labels and image preprocessing (no hub access needed later)
+#   parity-<variant>.json            parity against the eager pipeline, measured at export
+# onnxruntime (optional dependency) serves the graph with full graph optimizations and
+# AURA_EMOTION_ONNX_THREADS intra-op threads. Outputs use the pipeline's label/score format.
+# -------------------------------------------------
+VARIANT_FILES = {"fp32": "model.onnx", "int8": "model-int8.onnx"}
+
+def onnx_dir() -> str:
+    """Export cache directory (AURA_EMOTION_ONNX_DIR, default: system temp dir)."""
+    return os.getenv("AURA_EMOTION_ONNX_DIR", os.path.join(tempfile.gettempdir(), "aura-emotion-onnx"))
+
+def reference_images(n: int = 16, size: int = 224, seed: int = 1234):
+    """Fixed, seeded RGB images (random gradients plus noise) used for parity checks and benchmarks."""
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(0, 1, size)
+    images = []
+    for _ in range(n):
+        angle = rng.uniform(0, np.pi)
+        field = np.cos(angle) * ramp[None, :] + np.sin(angle) * ramp[:, None]
+        pixels = field[..., None] * rng.uniform(60, 255, 3) + rng.normal(0, 12, (size, size, 3))
+        images.append(Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)))
+    return images
+
+class OnnxImageClassifier:
+    """
+    Drop-in for the transformers `image-classification` pipeline, served by ONNX Runtime.
+    `classifier(images, batch_size=8, top_k=5)` returns ranked [{"label", "score"}, ...] per image
+    (a single list for a single image), exactly like the pipeline.
+    """
+
+    def __init__(self, model_dir: str, model_path: str, threads: int = 0):
+        from transformers import AutoConfig, AutoImageProcessor
+
+        self.session = create_session(model_path, threads)
+        self.processor = AutoImageProcessor.from_pretrained(model_dir)
+        config = AutoConfig.from_pretrained(model_dir)
+        self.labels = [config.id2label[i] for i in range(config.num_labels)]
+        self.path = model_path
+
+    def probabilities(self, images, batch_size: int = 8) -> np.ndarray:
+        batches = []
+        for start in range(0, len(images), batch_size):
+            pixels = self.processor(images=images[start:start + batch_size], return_tensors="np")["pixel_values"]
+            batches.append(softmax(self.session.run(None, {"pixel_values": pixels.astype(np.float32)})[0]))
+        return np.concatenate(batches)
+
+    def __call__(self, images, batch_size: int = 8, top_k: int = 5):
+        single = not isinstance(images, (list, tuple))
+        probs = self.probabilities([images] if single else list(images), max(1, batch_size))
+        top_k = min(top_k, len(self.labels))
+        results = [[{"label": self.labels[i], "score": float(row[i])} for i in np.argsort(-row, kind="stable")[:top_k]]
+                   for row in probs]
+        return results[0] if single else results
+
+    def memory_bytes(self) -> int:
+        return os.path.getsize(self.path)
+
+def check_parity(reference, candidate, images=None, tolerance: float = 0.05):
+    """
+    Compares a candidate classifier against the eager pipeline on the fixed reference images.
+    Passes when every top-1 label agrees and no class probability differs by more than `tolerance`.
+    """
+    images = reference_images() if images is None else images
+    labels = candidate.labels
+    return parity_report(label_probabilities(reference, images, labels),
+                         label_probabilities(candidate, images, labels), tolerance)
+
+def label_probabilities(classifier, images, labels):
+    """[n, classes] probabilities in `labels` order, from a classifier's ranked label/score output."""
+    rows = []
+    for ranked in classifier(images, batch_size=8, top_k=len(labels)):
+        scores = {p["label"]: p["score"] for p in ranked}
+        rows.append([scores[label] for label in labels])
+    return rows
+
+def export_pipeline(reference, target_dir: str, quantized: bool = False):
+    """
+    Writes the pipeline's model as ONNX (dynamic batch axis) plus its config and image processor.
+    With `quantized`, also writes the dynamic int8 variant. Files appear atomically.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    fp32_path = os.path.join(target_dir, VARIANT_FILES["fp32"])
+    if not os.path.exists(fp32_path):
+        example = reference.image_processor(images=reference_images(1), return_tensors="pt")["pixel_values"]
+        reference.model.config.save_pretrained(target_dir)
+        reference.image_processor.save_pretrained(target_dir)
+        export_onnx(reference.model, example, fp32_path, "pixel_values")
+
+    int8_path = os.path.join(target_dir, VARIANT_FILES["int8"])
+    if quantized and not os.path.exists(int8_path):
+        quantize_onnx(fp32_path, int8_path)
+
+def load_onnx_classifier(model_name: str, quantized: bool = False, threads: int = 0, tolerance: float = 0.05):
+    """
+    Returns (OnnxImageClassifier, parity) for `model_name`, exporting it on first use.
+    Export loads the eager pipeline once, both to trace the graph and as the parity reference;
+    later loads only read the cache.
+    """
+    target_dir = os.path.join(onnx_dir(), model_slug(model_name))
+    variant = "int8" if quantized else "fp32"
+    model_path = os.path.join(target_dir, VARIANT_FILES[variant])
+    parity_path = os.path.join(target_dir, f"parity-{variant}.json")
+
+    if os.path.exists(model_path) and os.path.exists(parity_path):
+        with open(parity_path) as f:
+            parity = json.load(f)
+        parity["passed"] = parity_passed(parity, tolerance)
+        return OnnxImageClassifier(target_dir, model_path, threads), parity
+
+    print(f"⏳ Exporting {model_name} to ONNX ({variant})...")
+    from transformers import pipeline
+    reference = pipeline("image-classification", model=model_name)
+    export_pipeline(reference, target_dir, quantized)
+    classifier = OnnxImageClassifier(target_dir, model_path, threads)
+    parity = check_parity(reference, classifier, tolerance=tolerance)
+    with staged(parity_path) as staging, open(staging, "w") as f:
+        json.dump(parity, f)
+    return classifier, parity
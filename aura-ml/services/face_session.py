@@ -0,0 +1,145 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+from services.emotion_classifier import decode_frame, classify_images, pick_emotion
+
+def frame_hash(image: Image.Image) -> int:
+    """64-bit difference hash (dHash): brightness gradients of a 9x8 grayscale thumbnail."""
+    pixels = np.asarray(image.convert("L").resize((9, 8), Image.Resampling.BILINEAR), dtype=np.int16)
+    return int.from_bytes(np.packbits(pixels[:, :-1] > pixels[:, 1:]).tobytes(), "big")
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class FaceSession:
+    """Per-client Face DJ state: last inferred frame, smoothed emotion scores and the mix being played."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.digest = None       # exact bytes of the last frame
+        self.hash = None         # dHash of the last *inferred* frame
+        self.predictions = None  # raw predictions of the last inferred frame
+        self.smoothed = {}       # label -> EMA score
+        self.emotion = None
+        self.mix = None
+        self.last_seen = time.monotonic()
+
+class FaceSessionStore:
+    """
+    Session Mode for Face DJ.
+    A webcam client streams near-identical frames; each used to cost a vision forward pass,
+    a vibe encode and a vector search. Keyed by a client session id, this store skips all three
+    when nothing meaningful changed.
+
+    Process Flow (per frame):
+    1. Byte-identical to the previous frame, or dHash within `hash_distance` bits of the last
+       inferred frame -> reuse that frame's predictions (no inference).
+    2. Otherwise run the vision model and remember the frame's hash.
+    3. Blend the predictions into an EMA over emotion scores (`alpha` = weight of the new frame).
+    4. The smoothed scores go through the usual anti-neutral pick; the caller re-queries the
+       mix only when that smoothed emotion changes.
+
+    Mixes are also cached per emotion (shared by all sessions) for `mix_ttl_seconds`.
+    Sessions idle for `ttl_seconds` or beyond `max_sessions` (LRU) are dropped.
+    """
+
+    def __init__(self, alpha: float = 0.3, hash_distance: int = 4, ttl_seconds: float = 600,
+                 max_sessions: int = 1000, mix_ttl_seconds: float = 300):
+        self.alpha = alpha
+        self.hash_distance = hash_distance
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.mix_ttl_seconds = mix_ttl_seconds
+        self.frames = 0
+        self.inferences = 0
+        self._sessions = OrderedDict()
+        self._mixes = {}
+        self._lock = threading.Lock()
+
+    def _session(self, session_id: str) -> FaceSession:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None and now - session.last_seen >= self.ttl_seconds:
+                session = None
+            while self._sessions:
+                oldest_id, oldest = next(iter(self._sessions.items()))
+                if now - oldest.last_seen < self.ttl_seconds and len(self._sessions) < self.max_sessions:
+                    break
+                del self._sessions[oldest_id]
+            session = session or FaceSession()
+            session.last_seen = now
+            self._sessions[session_id] = session
+            self.frames += 1
+            return session
+
+    def observe(self, session_id: str, frame):
+        """
+        Feeds one frame (raw bytes, base64 or data URL) into the session.
+        Returns {"label", "score", "inferred", "changed", "mix"}; `mix` is the session's current
+        mix, to be replaced by the caller (`set_mix`) when `changed` is True or it is None.
+        """
+        session = self._session(session_id)
+        with session.lock:
+            raw = frame.encode() if isinstance(frame, str) else frame
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            inferred = False
+            if digest != session.digest or session.predictions is None:
+                try:
+                    image = decode_frame(frame)
+                    image_hash = frame_hash(image)
+                    if session.hash is None or hamming(image_hash, session.hash) > self.hash_distance:
+                        session.predictions = classify_images([image])[0]
+                        session.hash = image_hash
+                        inferred = True
+                        with self._lock:
+                            self.inferences += 1
+                except Exception as e:
+                    # A bad frame keeps the session's last reading (neutral if there is none yet)
+                    print(f"❌ Vision Error (session {session_id[:16]}): {e}")
+                    session.predictions = session.predictions or [{"label": "neutral", "score": 0.0}]
+            session.digest = digest
+
+            # EMA over every label seen so far (labels missing from a frame's top-k count as 0)
+            scores = {p['label']: p['score'] for p in session.predictions}
+            if not session.smoothed:
+                session.smoothed = dict(scores)
+            else:
+                for label in set(session.smoothed) | set(scores):
+                    previous = session.smoothed.get(label, 0.0)
+                    session.smoothed[label] = (1 - self.alpha) * previous + self.alpha * scores.get(label, 0.0)
+
+            ranked = sorted(({'label': l, 'score': s} for l, s in session.smoothed.items()), key=lambda p: -p['score'])
+            picked = pick_emotion(ranked)
+            changed = picked['label'] != session.emotion
+            session.emotion = picked['label']
+            return {"label": picked['label'], "score": round(float(picked['score']), 4), "inferred": inferred,
+                    "changed": changed, "mix": session.mix}
+
+    def set_mix(self, session_id: str, mix):
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is not None:
+            session.mix = mix
+
+    def cached_mix(self, emotion: str):
+        """The mix retrieved for `emotion` within the last `mix_ttl_seconds`, else None."""
+        entry = self._mixes.get(emotion)
+        if entry is None or time.monotonic() - entry[0] > self.mix_ttl_seconds:
+            return None
+        return entry[1]
+
+    def store_mix(self, emotion: str, mix):
+        self._mixes[emotion] = (time.monotonic(), mix)
+
+    def stats(self):
+        return {
+            "sessions": len(self._sessions),
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "skip_rate": round(1 - self.inferences / self.frames, 3) if self.frames else 0.0,
+            "cached_mixes": len(self._mixes),
+        }
@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+class FeatureCache:
+    """
+    Per-Audio AST Feature Cache.
+    AST always consumes a fixed (1024 x 128) log-mel filterbank grid, so a clip's features are
+    reusable for any later classification of the same audio. Re-classifying with another `top_k`
+    or `aggregate` (vibe) mode skips the download, decode and filterbank extraction.
+
+    Design:
+    - Keyed by (file URL, AudioLoader content version): once the loader revalidates a changed
+      file (new ETag / content hash), its old features and probabilities are never served again.
+    - Each entry holds the features plus the output probabilities per backend (527 floats each),
+      so a repeat request with the same backend skips the forward pass too.
+    - Bounded LRU by bytes (AURA_AST_FEATURE_CACHE_MB); cached arrays are read-only.
+    """
+    _instance = None
+
+    def __init__(self, max_mb: float = 64):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.feature_hits = 0
+        self.prob_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> {"features": ndarray | None, "probs": {backend: ndarray}}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = FeatureCache(float(os.getenv("AURA_AST_FEATURE_CACHE_MB", "64")))
+        return cls._instance
+
+    @staticmethod
+    def _frozen(array):
+        array = np.array(array, dtype=np.float32)
+        array.flags.writeable = False
+        return array
+
+    @staticmethod
+    def _entry_bytes(entry):
+        features = entry["features"]
+        return (features.nbytes if features is not None else 0) + sum(p.nbytes for p in entry["probs"].values())
+
+    def lookup(self, key, backend: str):
+        """
+        (probs, features) for `key`: probs when this backend already classified it, else features if cached.
+        The returned arrays stay valid for the caller even if the entry is evicted afterwards.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            probs = entry["probs"].get(backend)
+            if probs is not None:
+                self.prob_hits += 1
+                return probs, entry["features"]
+            if entry["features"] is not None:
+                self.feature_hits += 1
+            else:
+                self.misses += 1
+            return None, entry["features"]
+
+    def store(self, key, backend: str, features=None, probs=None):
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            entry = self._entries.pop(key, None) or {"features": None, "probs": {}}
+            self._bytes -= self._entry_bytes(entry)
+            if features is not None:
+                entry["features"] = self._frozen(features)
+            if probs is not None:
+                entry["probs"][backend] = self._frozen(probs)
+            self._entries[key] = entry
+            self._bytes += self._entry_bytes(entry)
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._entry_bytes(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "mb": round(self._bytes / 1024 / 1024, 1),
+            "max_mb": round(self.max_bytes / 1024 / 1024, 1),
+            "prob_hits": self.prob_hits,
+            "feature_hits": self.feature_hits,
+            "misses": self.misses,
+        }
@@ -1,9 +1,430 @@
-import pandas as pd
 import numpy as np
 import random
 import os
-from sklearn.decomposition import TruncatedSVD
+import copy
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
 from supabase import create_client
+from core.paged_reader import PagedReader, IdEncoder, InteractionLog, read_interactions
+from services.recommender_artifact import default_root, save_snapshot, current_artifact, load_snapshot_fields
+from services.vector_index import SoundVectorIndex
+from core.model_registry import ModelRegistry
+
+# Neighbours precomputed per sound at training time; larger top_k requests rank one row on demand.
+NEIGHBOUR_K = int(os.getenv("AURA_RECOMMENDER_NEIGHBOURS", "32"))
+# Rows per similarity block: peak memory is SIMILARITY_BLOCK x n_sounds scores, never n x n.
+SIMILARITY_BLOCK = int(os.getenv("AURA_RECOMMENDER_BLOCK", "1024"))
+# Full retrains run in a separate process so the GIL-heavy work never competes with serving threads.
+RETRAIN_IN_SUBPROCESS = os.getenv("AURA_RECOMMENDER_SUBPROCESS", "1") == "1"
+# A published artifact younger than this is adopted by scheduled refreshes instead of retraining
+# (so with several workers, one retrains and the others map its result).
+ARTIFACT_MAX_AGE_MINUTES = float(os.getenv("AURA_RECOMMENDER_ARTIFACT_MAX_AGE_MINUTES", "25"))
+# Hybrid blend weight of the collaborative score (1 = interactions only, 0 = sound embeddings only).
+HYBRID_ALPHA = float(os.getenv("AURA_RECOMMENDER_HYBRID_ALPHA", "0.7"))
+
+def interaction_matrix(log: InteractionLog):
+    """
+    Implicit-feedback CSR matrix (users x sounds) from an integer-coded interaction log.
+    Codes are sorted-id ordered (the same row/column order pivot_table produced);
+    repeated (user, sound) pairs collapse to 1.
+    Returns (matrix, user index, sound index).
+    """
+    matrix = sparse.csr_matrix(
+        (np.ones(len(log), dtype=np.float32), (log.user_codes, log.item_codes)),
+        shape=(len(log.user_ids), len(log.item_ids)),
+    )
+    matrix.data[:] = 1.0  # duplicates were summed on construction
+    return matrix, log.user_ids, log.item_ids
+
+def build_interaction_matrix_codes(user_ids, sound_ids):
+    """Sorted-id integer codes for parallel in-memory id sequences: (user codes, sound codes, user ids, sound ids)."""
+    users, items = IdEncoder(), IdEncoder()
+    user_codes, item_codes = users.encode(user_ids), items.encode(sound_ids)
+    sorted_users, user_remap = users.sorted_remap()
+    sorted_items, item_remap = items.sorted_remap()
+    return user_remap[user_codes], item_remap[item_codes], sorted_users, sorted_items
+
+def build_interaction_matrix(user_ids, sound_ids):
+    """Same as `interaction_matrix`, from parallel in-memory id sequences (synthetic data, benchmarks)."""
+    return interaction_matrix(InteractionLog(*build_interaction_matrix_codes(user_ids, sound_ids)))
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    """L2-normalizes each row so that `z[i] @ z[j]` is a cosine similarity; all-zero rows stay zero."""
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+def item_factors(components: np.ndarray, singular_values: np.ndarray) -> np.ndarray:
+    """
+    Sound embeddings from a fitted TruncatedSVD: `components_.T` (one row per sound) scaled by the
+    singular values, i.e. each sound's interaction column projected onto the latent space, then
+    L2-normalized so the dot product of two rows is their cosine similarity. float32 for serving.
+    """
+    return normalize_rows(np.asarray(components).T * singular_values).astype(np.float32)
+
+def blocked_top_k(factors: np.ndarray, n_rows: int, n_cols: int, k: int, block_rows: int = SIMILARITY_BLOCK, rows=None):
+    """
+    Top-k most similar columns (< n_cols) for each of the first `n_rows` factor rows
+    (or only the given `rows`), self excluded.
+    Similarities are produced one block of rows at a time and reduced to top-k immediately,
+    so the full similarity matrix is never materialized.
+    """
+    rows = np.arange(n_rows) if rows is None else np.asarray(rows)
+    k = min(k, n_cols - 1)
+    neighbours = np.empty((len(rows), max(k, 0)), dtype=np.int32)
+    candidates = factors[:n_cols].T
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        scores = np.nan_to_num(factors[block] @ candidates, nan=-np.inf)
+        in_range = block < n_cols
+        scores[np.flatnonzero(in_range), block[in_range]] = -np.inf  # never recommend the sound itself
+        neighbours[start:start + len(block)] = top_k_neighbours(scores, k)
+    return neighbours
+
+def refresh_top_k(factors: np.ndarray, neighbours: np.ndarray, changed, n_rows: int, k: int):
+    """
+    Updates a neighbour table after the factor rows in `changed` moved (or were appended).
+
+    Only affected lists are recomputed:
+    - changed rows, and rows whose current list contains a changed row, are re-ranked in full;
+    - every other row keeps its list and merges in the changed rows as new candidates
+      (its scores against unchanged rows are unchanged, so the merge is exact).
+    """
+    old_rows = len(neighbours)
+    # Newly addressable rows are new candidates for everyone
+    changed = np.union1d(np.asarray(changed, dtype=np.int64), np.arange(old_rows, n_rows))
+    changed = changed[changed < n_rows]
+    k = min(k, n_rows - 1)
+    if neighbours.shape[1] != max(k, 0) or len(changed) * 4 > n_rows:
+        return blocked_top_k(factors, n_rows, n_rows, k)
+
+    table = np.empty((n_rows, neighbours.shape[1]), dtype=np.int32)
+    table[:old_rows] = neighbours
+
+    stale = np.zeros(n_rows, dtype=bool)
+    stale[changed] = True
+    stale[old_rows:] = True
+    stale[:old_rows] |= np.isin(neighbours, changed).any(axis=1)
+
+    rerank = np.flatnonzero(stale)
+    if len(rerank):
+        table[rerank] = blocked_top_k(factors, n_rows, n_rows, k, rows=rerank)
+
+    merge = np.flatnonzero(~stale)
+    if len(merge) and len(changed):
+        for start in range(0, len(merge), SIMILARITY_BLOCK):
+            block = merge[start:start + SIMILARITY_BLOCK]
+            current = table[block]
+            candidates = np.concatenate([current, np.broadcast_to(changed, (len(block), len(changed)))], axis=1)
+            scores = np.einsum("rd,rcd->rc", factors[block], factors[candidates])
+            best = top_k_neighbours(np.nan_to_num(scores, nan=-np.inf), k)
+            table[block] = np.take_along_axis(candidates, best, axis=1)
+    return table
+
+def top_k_neighbours(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Row-wise top-k column indices of a score matrix, highest first.
+    Uses argpartition (O(n) per row) and only sorts the k survivors.
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int32)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1).astype(np.int32)
+
+class HybridScorer:
+    """
+    Blends collaborative and content similarity for one snapshot and one published vector index:
+
+        score = alpha * collaborative + (1 - alpha) * content
+
+    Content similarity is cosine over the cached 384-d `all-MiniLM-L6-v2` sound embeddings
+    (SoundVectorIndex.matrix, already L2-normalized). Candidates are every sound with an embedding;
+    candidates the interaction matrix has never seen (new uploads) score on content alone, and a
+    query without interactions gets pure content neighbours.
+
+    Built once per (snapshot, index) pair so a batch of queries costs two matmuls and one top-K.
+    """
+
+    def __init__(self, snapshot, index):
+        self.snapshot = snapshot
+        self.matrix = index.matrix
+        self.positions = index.positions
+        self.ids = np.asarray(index.ids, dtype=object)
+
+        # Embedding row -> factor row (-1 when the sound has no interactions), over the
+        # same addressable region as the neighbour table
+        self.n_rows = len(snapshot.neighbours)
+        collab = np.array([snapshot.item_index.get(s, -1) for s in self.ids], dtype=np.int64)
+        collab[collab >= self.n_rows] = -1
+        self.collab_positions = collab
+        self.has_collab = collab >= 0
+
+    def matches(self, snapshot, index) -> bool:
+        return self.snapshot is snapshot and self.matrix is index.matrix
+
+    def scores(self, sound_ids, alpha: float) -> np.ndarray:
+        """(len(sound_ids), n_candidates) blended scores; -inf where nothing can be scored (and for the query itself)."""
+        content_q = [(i, self.positions.get(s)) for i, s in enumerate(sound_ids)]
+        content_q = [(i, p) for i, p in content_q if p is not None]
+        collab_q = [(i, self.snapshot.item_index.get(s)) for i, s in enumerate(sound_ids)] if alpha > 0 else []
+        collab_q = [(i, c) for i, c in collab_q if c is not None and c < self.n_rows]
+
+        shape = (len(sound_ids), len(self.ids))
+        content = collab = None
+        if content_q:
+            content = np.full(shape, np.nan, dtype=np.float32)
+            content[[i for i, _ in content_q]] = self.matrix[[p for _, p in content_q]] @ self.matrix.T
+        if collab_q:
+            factors = self.snapshot.factors
+            sims = factors[[c for _, c in collab_q]] @ factors[:self.n_rows].T
+            block = np.full((len(collab_q), shape[1]), np.nan, dtype=np.float32)
+            block[:, self.has_collab] = sims[:, self.collab_positions[self.has_collab]]
+            collab = np.full(shape, np.nan, dtype=np.float32)
+            collab[[i for i, _ in collab_q]] = block
+
+        if content is not None and collab is not None:
+            blended = alpha * collab + (1 - alpha) * content
+            # Whichever side is missing (unseen candidate, query without embedding) falls back to the other
+            blended = np.where(np.isnan(collab), content, blended)
+            blended = np.where(np.isnan(content), collab, blended)
+        else:
+            blended = content if content is not None else collab
+
+        scores = np.full(shape, -np.inf, dtype=np.float32) if blended is None else np.nan_to_num(blended, nan=-np.inf)
+        for i, sound_id in enumerate(sound_ids):
+            own = self.positions.get(sound_id)
+            if own is not None:
+                scores[i, own] = -np.inf
+        return scores
+
+    def top_k(self, sound_ids, top_k: int, alpha: float) -> dict:
+        """{sound_id: [neighbour ids]} for every query with at least one scored candidate."""
+        if not sound_ids or len(self.ids) == 0:
+            return {}
+        scores = self.scores(sound_ids, alpha)
+        results = {}
+        for sound_id, row_scores, row in zip(sound_ids, scores, top_k_neighbours(scores, top_k)):
+            picked = [self.ids[j] for j in row if np.isfinite(row_scores[j])]
+            if picked:
+                results[sound_id] = picked
+        return results
+
+class RecommenderSnapshot:
+    """
+    Complete trained state of the recommender.
+
+    Built off to the side (in a training process or by an incremental update) and treated as
+    immutable once published: the engine swaps in a new snapshot with a single reference
+    assignment, so every request reads one consistent model, never a half-updated mix.
+    """
+    FIELDS = ("sound_ids", "model", "user_item_matrix", "user_ids", "user_index", "item_ids",
+              "item_index", "matrix_reduced", "factors", "neighbours", "watermark", "artifact")
+
+    def __init__(self, sound_ids=(), model=None, user_item_matrix=None, user_ids=None, item_ids=None,
+                 matrix_reduced=None, factors=None, neighbours=None, watermark=None, artifact=None):
+        self.sound_ids = list(sound_ids)
+        self.model = model
+        self.user_item_matrix = user_item_matrix
+        self.user_ids = np.empty(0, dtype=object) if user_ids is None else user_ids
+        self.item_ids = np.empty(0, dtype=object) if item_ids is None else item_ids
+        self._user_index = None
+        self.item_index = {sound_id: i for i, sound_id in enumerate(self.item_ids)}
+        self.matrix_reduced = matrix_reduced
+        self.factors = factors
+        self.neighbours = np.empty((0, 0), dtype=np.int32) if neighbours is None else neighbours
+        self.watermark = watermark  # created_at of the newest interaction folded into the model
+        self.artifact = artifact    # version directory this snapshot was saved to / mapped from
+
+    @property
+    def user_index(self):
+        # Only incremental updates need it; built on first use so mapped artifacts load instantly
+        if self._user_index is None:
+            self._user_index = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        return self._user_index
+
+def fetch_training_data(reader: PagedReader, max_retries: int = 3):
+    """Streams interactions and the sound catalogue, retrying transient DB failures."""
+    for attempt in range(max_retries):
+        try:
+            print(f"🔄 Training Recommendation Model (Attempt {attempt+1}/{max_retries})...")
+            
+            # 1. Stream Real Interactions from DB (paged, integer-coded)
+            real_interactions = read_interactions(reader)
+            
+            # 2. Fetch All Sound IDs (for validation)
+            sound_ids = reader.read_column("sounds", "id")
+            return real_interactions, sound_ids
+        except Exception:
+            if attempt == max_retries - 1:
+                raise
+            time.sleep(1)
+
+def fit_snapshot(real_interactions: InteractionLog, sound_ids) -> RecommenderSnapshot:
+    """Trains a complete snapshot from fetched data (no shared state is touched)."""
+    # --- HYBRID TRAINING STRATEGY ---
+    if len(real_interactions) > 50:
+        print(f"✅ Found {len(real_interactions)} REAL user interactions! Training on real data.")
+        # Already integer-coded by the reader (1 = implicit like)
+        log = real_interactions
+    else:
+        user_ids, interaction_sound_ids = [], []
+        print(f"⚠️ Only {len(real_interactions)} interactions found. Using SYNTHETIC data for Cold Start.")
+        # Fallback to Synthetic Data (so the demo always works)
+        for sound_id in sound_ids:
+            # Ensure every sound has at least some activity
+            for _ in range(3):
+                user_ids.append(f"mock_user_{random.randint(1, 50)}")
+                interaction_sound_ids.append(sound_id)
+        
+        # Add random noise
+        for _ in range(200):
+            user_ids.append(f"mock_user_{random.randint(1, 50)}")
+            interaction_sound_ids.append(random.choice(sound_ids))
+        # Synthetic cold-start models are never updated incrementally (no watermark)
+        log = InteractionLog(*build_interaction_matrix_codes(user_ids, interaction_sound_ids))
+
+    # 3. Create Matrix
+    user_item_matrix, user_ids, item_ids = interaction_matrix(log)
+
+    # 4. Train SVD
+    n_features = user_item_matrix.shape[1]
+    n_components = min(12, n_features - 1)
+    n_components = max(1, n_components)
+
+    from sklearn.decomposition import TruncatedSVD  # deferred: ~1.5s import, only needed to train
+    model = TruncatedSVD(n_components=n_components, random_state=42)
+    matrix_reduced = model.fit_transform(user_item_matrix)  # user factors (U * sigma), kept for fold-in
+    factors = item_factors(model.components_, model.singular_values_)
+
+    # 5. Neighbour table: cosine top-K over the item factors, one row per sound
+    neighbours = blocked_top_k(factors, len(item_ids), len(item_ids), NEIGHBOUR_K)
+
+    print(f"✅ Model Trained. Matrix Shape: {user_item_matrix.shape} ({user_item_matrix.nnz} interactions)")
+    return RecommenderSnapshot(sound_ids, model, user_item_matrix, user_ids, item_ids,
+                               matrix_reduced, factors, neighbours, log.watermark)
+
+def train_snapshot(reader: PagedReader):
+    """Fetch + fit. Returns None when the DB is unreachable, empty or training fails."""
+    try:
+        real_interactions, sound_ids = fetch_training_data(reader)
+    except Exception as e:
+        print(f"⚠️ Recommender Offline: Could not connect to DB ({str(e)}).")
+        return None
+
+    if not sound_ids:
+        print("❌ No sounds found in DB.")
+        return None
+
+    try:
+        return fit_snapshot(real_interactions, sound_ids)
+    except Exception as e:
+        print(f"❌ Recommender Training Error: {e}")
+        return None
+
+def _train_in_child_process(url, key, artifact_root):
+    """
+    Training process entry point: opens its own Supabase client and trains.
+    With persistence enabled the child writes the artifact and only its path travels back
+    (the parent memory-maps it); otherwise the snapshot itself is pickled back.
+    """
+    snapshot = train_snapshot(PagedReader(create_client(url, key)))
+    if snapshot is None or not artifact_root:
+        return snapshot
+    return save_snapshot(snapshot, artifact_root)
+
+def fresh_artifact(root: str):
+    """(path, manifest) of the active artifact if it was published within ARTIFACT_MAX_AGE_MINUTES, else None."""
+    found = current_artifact(root) if root else None
+    if found is None or time.time() - found[1]["created_at"] >= ARTIFACT_MAX_AGE_MINUTES * 60:
+        return None
+    return found
+
+def covers(watermark, served_watermark) -> bool:
+    """True if a snapshot at `watermark` includes every interaction a snapshot at `served_watermark` has seen."""
+    if served_watermark is None:
+        return True
+    return watermark is not None and watermark >= served_watermark
+
+def load_artifact(root: str, fresh_only: bool = False):
+    """Memory-maps the active artifact under `root`; None if there is no usable (or, with `fresh_only`, recent) one."""
+    found = fresh_artifact(root) if fresh_only else (current_artifact(root) if root else None)
+    if found is None:
+        return None
+    try:
+        return RecommenderSnapshot(**load_snapshot_fields(*found))
+    except Exception as e:
+        print(f"⚠️ Recommender artifact unreadable ({e}).")
+        return None
+
+def fold_in(snapshot: RecommenderSnapshot, rows) -> RecommenderSnapshot:
+    """
+    Returns a new snapshot with `rows` (new interactions) folded into `snapshot`, which is left untouched.
+
+    - Unseen users/sounds are appended to the sparse matrix (existing positions never move).
+    - New sounds get SVD components from the current user factors (v = x_col . U_reduced / sigma^2).
+    - Touched users are re-projected onto the components (u = x_row . V), i.e. `model.transform`
+      for just those rows.
+    - Every sound that received interactions is folded in again from the updated user factors,
+      so new plays move its item factor.
+    - Only the neighbour lists the changed item factors can affect are re-ranked.
+    """
+    # 1. Extend id encodings (appended, so serving positions stay valid)
+    user_ids, item_ids = list(snapshot.user_ids), list(snapshot.item_ids)
+    user_index, item_index = dict(snapshot.user_index), dict(snapshot.item_index)
+    for row in rows:
+        if row['user_id'] not in user_index:
+            user_index[row['user_id']] = len(user_ids)
+            user_ids.append(row['user_id'])
+        if row['sound_id'] not in item_index:
+            item_index[row['sound_id']] = len(item_ids)
+            item_ids.append(row['sound_id'])
+
+    # 2. Merge the delta into a copy of the CSR matrix
+    n_old_users, n_old_items = snapshot.user_item_matrix.shape
+    shape = (len(user_ids), len(item_ids))
+    user_codes = np.array([user_index[row['user_id']] for row in rows])
+    item_codes = np.array([item_index[row['sound_id']] for row in rows])
+    delta = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (user_codes, item_codes)), shape=shape)
+    matrix = snapshot.user_item_matrix.copy()
+    matrix.resize(shape)
+    matrix = (matrix + delta).tocsr()
+    matrix.data[:] = 1.0
+
+    # 3a. Fold-in new sounds: component columns from the existing user factors
+    model = copy.copy(snapshot.model)
+    sigma_sq = np.maximum(model.singular_values_ ** 2, 1e-12)
+    components = np.array(model.components_)  # copy: the served (possibly mapped) array is never written
+    if shape[1] > n_old_items:
+        new_cols = matrix[:n_old_users, n_old_items:].T @ snapshot.matrix_reduced / sigma_sq
+        components = np.hstack([components, np.asarray(new_cols).T])
+
+    # 3b. Re-project touched and new users onto the components
+    touched = np.unique(user_codes)
+    matrix_reduced = np.zeros((shape[0], components.shape[0]))
+    matrix_reduced[:n_old_users] = snapshot.matrix_reduced
+    matrix_reduced[touched] = np.asarray(matrix[touched] @ components.T)
+
+    # 3c. Re-fold the sounds that received interactions from the updated user factors
+    changed = np.unique(item_codes)
+    components[:, changed] = np.asarray(matrix[:, changed].T @ matrix_reduced / sigma_sq).T
+    model.components_ = components
+    factors = np.zeros((shape[1], components.shape[0]), dtype=np.float32)
+    factors[:n_old_items] = snapshot.factors
+    factors[changed] = item_factors(components[:, changed], model.singular_values_)
+
+    # 4. Re-rank affected neighbour lists only
+    neighbours = refresh_top_k(factors, snapshot.neighbours, changed, shape[1], NEIGHBOUR_K)
+
+    print(f"✅ Incremental update: {len(rows)} interactions, {len(touched)} users re-projected, "
+          f"{len(changed)} sounds re-folded ({shape[1] - n_old_items} new). Matrix Shape: {shape}")
+    return RecommenderSnapshot(
+        snapshot.sound_ids, model, matrix, np.array(user_ids, dtype=object), np.array(item_ids, dtype=object),
+        matrix_reduced, factors, neighbours, max(row['created_at'] for row in rows),
+    )
 
 class RecommenderSystem:
     """
@@ -13,10 +434,24 @@ class RecommenderSystem:
     to discover latent patterns in user-sound interactions.
     
     Architecture:
-    - Data Ingestion: Fetches interaction logs (user_id, sound_id) from Supabase.
-    - Matrix Construction: Pivot table representing Implicit Feedback (1 = interaction).
-    - Dimensionality Reduction: SVD compression to find 'n' latent features.
-    - Similarity: Pearson correlation coefficient on reduced feature vectors.
+    - Data Ingestion: Streams interaction logs (user_id, sound_id) from Supabase in parallel pages,
+      encoding each page straight into integer NumPy codes.
+    - Matrix Construction: Sparse CSR matrix of integer-encoded ids representing Implicit Feedback (1 = interaction).
+    - Dimensionality Reduction: Sparse SVD compression to find 'n' latent features.
+    - Item Factors: every sound is embedded as its SVD component column (`components_.T`, scaled by
+      the singular values) and L2-normalized (see `item_factors`).
+    - Similarity: cosine between item factors, computed by blocked matmul and reduced to the top-K
+      straight away (no dense n x n similarity matrix). Quality is tracked with recall@K on
+      held-out interactions (services/recommender_eval.py, scripts/evaluate_recommender.py).
+    - Incremental Updates: Interactions newer than a watermark are folded into the existing
+      factorization between full retrains (see `update_incremental`).
+    - Serving: A sound_id -> index dict and a top-K neighbour table are precomputed at training
+      time, so a recommendation is two O(1) lookups instead of a list scan + full argsort.
+    - Publication: Every (re)train builds a complete RecommenderSnapshot off to the side and
+      publishes it with one reference swap. Full retrains run in a separate process.
+    - Hybrid Scoring: When the local vector index is ready, collaborative similarity is blended
+      with cosine similarity over the sound embeddings (see `HybridScorer`), so sounds nobody has
+      interacted with yet get content neighbours instead of a random sample.
     
     Strategy: 
     - Hybrid Startup: Uses Real data if sufficient (>50 rows), otherwise falls back 
@@ -29,138 +464,242 @@ class RecommenderSystem:
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_KEY")
         self.supabase = create_client(self.url, self.key)
-        self.model = None
-        self.user_item_matrix = None
-        self.sound_ids = []
+        self.reader = PagedReader(self.supabase)
+        self._snapshot = RecommenderSnapshot()
+        self._update_lock = threading.Lock()  # serializes writers; readers never lock
+        self._pool = None
+        self._scorer = None  # HybridScorer for the current (snapshot, vector index) pair
+        self.artifact_root = default_root()
         
-        # Train immediately on startup
-        self.train_mock_model()
+        # Map the persisted artifact if it is recent (milliseconds, shared with other workers);
+        # otherwise train immediately on startup (in-process: nothing is being served yet).
+        # A stale artifact is only mapped when that training fails (e.g. the DB is unreachable).
+        started = time.perf_counter()
+        snapshot = load_artifact(self.artifact_root, fresh_only=True)
+        if snapshot is not None:
+            self._snapshot = snapshot
+            print(f"✅ Recommender loaded from artifact {os.path.basename(snapshot.artifact)} "
+                  f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+            return
+        self.train_mock_model(use_process=False)
+        if self._snapshot.model is None:
+            snapshot = load_artifact(self.artifact_root)
+            if snapshot is not None:
+                self._snapshot = snapshot
+                print(f"⚠️ Training unavailable. Serving stale artifact {os.path.basename(snapshot.artifact)}.")
+
+    def __getattr__(self, name):
+        # Read-only views of the published snapshot (recommender.model, .neighbours, ...)
+        if name in RecommenderSnapshot.FIELDS:
+            return getattr(self.__dict__["_snapshot"], name)
+        raise AttributeError(name)
+
+    @property
+    def snapshot(self) -> RecommenderSnapshot:
+        return self._snapshot
 
     @classmethod
     def get_instance(cls):
+        return ModelRegistry.get_instance().get("recommender")
+
+    @classmethod
+    def load(cls):
         if cls._instance is None:
             cls._instance = RecommenderSystem()
         return cls._instance
 
-    def train_mock_model(self):
-        max_retries = 3
-        for attempt in range(max_retries):
+    @classmethod
+    def unload(cls):
+        if cls._instance is not None:
+            cls._instance.close()
+        cls._instance = None
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the published snapshot's arrays (mapped artifacts count at full size)."""
+        snapshot = self._snapshot
+        arrays = [snapshot.matrix_reduced, snapshot.factors, snapshot.neighbours, snapshot.item_ids, snapshot.user_ids]
+        if snapshot.user_item_matrix is not None:
+            matrix = snapshot.user_item_matrix
+            arrays += [matrix.data, matrix.indices, matrix.indptr]
+        if snapshot.model is not None:
+            arrays.append(snapshot.model.components_)
+        return sum(a.nbytes for a in arrays if isinstance(a, np.ndarray))
+
+    def train_mock_model(self, use_process=None):
+        """
+        Full retrain. The new snapshot is built without touching the one being served
+        (in a child process unless AURA_RECOMMENDER_SUBPROCESS=0) and then swapped in.
+        If the DB is unreachable or training fails, the current snapshot keeps serving.
+        """
+        use_process = RETRAIN_IN_SUBPROCESS if use_process is None else use_process
+        with self._update_lock:
+            snapshot = self._train_in_process_pool() if use_process else self._train_and_save()
+            if snapshot is None:
+                if self._snapshot.model is None:
+                    print("⚠️ No recommendation model available. Using random fallback.")
+                return
+            self._snapshot = snapshot
+
+    def _train_and_save(self):
+        snapshot = train_snapshot(self.reader)
+        if snapshot is not None and self.artifact_root:
             try:
-                print(f"🔄 Training Recommendation Model (Attempt {attempt+1}/{max_retries})...")
-                
-                # 1. Fetch Real Interactions from DB
-                response = self.supabase.table("user_interactions").select("user_id, sound_id").execute()
-                real_interactions = response.data
-                
-                # 2. Fetch All Sound IDs (for validation)
-                sound_res = self.supabase.table("sounds").select("id").execute()
-                self.sound_ids = [s['id'] for s in sound_res.data]
-                break # Success!
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    print(f"⚠️ Recommender Offline: Could not connect to DB ({str(e)}). Using random fallback.")
-                    self.sound_ids = [] # Empty list triggers fallback in recommend_for_sound
-                    return
-                import time
-                time.sleep(1)
-
-        if not self.sound_ids:
-            print("❌ No sounds found in DB.")
-            return
+                snapshot.artifact = save_snapshot(snapshot, self.artifact_root)
+            except OSError as e:
+                print(f"⚠️ Could not persist recommender artifact ({e}).")
+        return snapshot
+
+    def refresh(self):
+        """
+        Scheduled refresh. Adopts an artifact another worker published within
+        AURA_RECOMMENDER_ARTIFACT_MAX_AGE_MINUTES (mmap, no retrain); otherwise runs a full
+        retrain, which publishes a new artifact for the others. Returns "loaded", "current" or "trained".
+
+        Artifacts are compared by watermark, not path: a snapshot that already folded in newer
+        interactions (incremental updates are never persisted) is kept rather than replaced.
+        """
+        found = fresh_artifact(self.artifact_root)
+        if found is not None:
+            path, manifest = found
+            served = self._snapshot
+            if path == served.artifact or not covers(manifest.get("watermark"), served.watermark):
+                return "current"
+            snapshot = load_artifact(self.artifact_root, fresh_only=True)
+            if snapshot is not None:
+                with self._update_lock:
+                    if covers(snapshot.watermark, self._snapshot.watermark):
+                        self._snapshot = snapshot
+                print(f"✅ Recommender refreshed from artifact {os.path.basename(path)}")
+                return "loaded"
+        self.train_mock_model()
+        return "trained"
 
+    def _train_in_process_pool(self):
         try:
+            if self._pool is None:
+                # spawn: a clean interpreter, no inherited model threads or locks
+                self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            result = self._pool.submit(_train_in_child_process, self.url, self.key, self.artifact_root).result()
+        except Exception as e:  # BrokenProcessPool, spawn or pickling failures
+            print(f"⚠️ Training process failed ({e}). Retraining in-process.")
+            self.close()
+            return self._train_and_save()
+        return load_artifact(self.artifact_root) if isinstance(result, str) else result
 
-            data = []
-            
-            # --- HYBRID TRAINING STRATEGY ---
-            if len(real_interactions) > 50:
-                print(f"✅ Found {len(real_interactions)} REAL user interactions! Training on real data.")
-                # Convert DB rows to Matrix format (1 = implicit like)
-                for row in real_interactions:
-                    data.append([row['user_id'], row['sound_id'], 1])
-            else:
-                print(f"⚠️ Only {len(real_interactions)} interactions found. Using SYNTHETIC data for Cold Start.")
-                # Fallback to Synthetic Data (so the demo always works)
-                for sound_id in self.sound_ids:
-                    # Ensure every sound has at least some activity
-                    for _ in range(3):
-                        user_id = f"mock_user_{random.randint(1, 50)}"
-                        data.append([user_id, sound_id, 1])
-                
-                # Add random noise
-                for _ in range(200):
-                    user_id = f"mock_user_{random.randint(1, 50)}"
-                    sound_id = random.choice(self.sound_ids)
-                    data.append([user_id, sound_id, 1])
-
-            # 3. Create Matrix
-            df = pd.DataFrame(data, columns=['user_id', 'sound_id', 'rating'])
-            
-            self.user_item_matrix = df.pivot_table(
-                index='user_id', 
-                columns='sound_id', 
-                values='rating'
-            ).fillna(0)
-
-            # 4. Train SVD
-            n_features = self.user_item_matrix.shape[1]
-            n_components = min(12, n_features - 1)
-            n_components = max(1, n_components)
-
-            self.model = TruncatedSVD(n_components=n_components, random_state=42)
-            self.matrix_reduced = self.model.fit_transform(self.user_item_matrix)
-            
-            self.corr_matrix = np.corrcoef(self.matrix_reduced)
-            
-            print(f"✅ Model Trained. Matrix Shape: {self.user_item_matrix.shape}")
+    def close(self):
+        """Stops the training process (called on application shutdown)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
-        except Exception as e:
-            print(f"❌ Recommender Training Error: {e}")
+    def update_incremental(self):
+        """
+        Incremental Update (between full retrains).
 
-    def recommend_for_sound(self, sound_id, top_k=4):
-        # Fallback Helper
-        def get_random_fallback():
-            print(f"⚠️ Fallback: Returning random sounds for {sound_id}")
-            candidates = [s for s in self.sound_ids if s != sound_id]
-            return random.sample(candidates, min(len(candidates), top_k))
+        Process Flow:
+        1. Fetch only interactions with created_at > watermark.
+        2. Fold them into a copy of the current snapshot (see `fold_in`).
+        3. Publish the new snapshot with one reference swap.
 
-        if not self.model or not self.sound_ids:
-            return []
+        Does nothing when there is no real-data model to update (cold start or offline);
+        building one is left to the scheduled full retrain (`retrain_task`).
+        Returns "noop" or "incremental".
+        """
+        snapshot = self._snapshot
+        if snapshot.model is None or snapshot.watermark is None or snapshot.user_item_matrix is None:
+            print("⏭️ No incremental baseline (cold start or offline). Waiting for the next full retrain.")
+            return "noop"
 
-        try:
-            # Check if sound exists in our training matrix
-            if sound_id not in self.user_item_matrix.columns:
-                return get_random_fallback()
+        with self._update_lock:
+            snapshot = self._snapshot  # a full retrain may have landed while waiting
+            try:
+                watermark = snapshot.watermark
+                pages = self.reader.iter_pages("user_interactions", "user_id, sound_id, created_at",
+                                               apply=lambda q: q.gt("created_at", watermark))
+                rows = [row for page in pages for row in page]
+            except Exception as e:
+                print(f"⚠️ Incremental fetch failed ({e}). Keeping current model.")
+                return "noop"
+            if not rows:
+                return "noop"
 
-            # Find index
-            sound_idx = list(self.user_item_matrix.columns).index(sound_id)
-            
-            # Get correlations
-            if sound_idx >= len(self.corr_matrix):
-                return get_random_fallback()
+            self._snapshot = fold_in(snapshot, rows)
+            return "incremental"
 
-            corr_scores = self.corr_matrix[sound_idx]
-            
-            # Sort (highest correlation first)
-            similar_indices = np.argsort(corr_scores)[::-1]
-            
-            # Convert indices back to IDs
-            recommendations = []
-            for idx in similar_indices:
-                candidate_id = self.user_item_matrix.columns[idx]
-                if candidate_id != sound_id:
-                    recommendations.append(candidate_id)
-                    if len(recommendations) >= top_k:
-                        break
-            
-            if not recommendations:
-                return get_random_fallback()
+    @staticmethod
+    def _random_fallback(snapshot, sound_id, top_k):
+        print(f"⚠️ Fallback: Returning random sounds for {sound_id}")
+        candidates = [s for s in snapshot.sound_ids if s != sound_id]
+        return random.sample(candidates, min(len(candidates), top_k))
+
+    @staticmethod
+    def _lookup(snapshot, sound_idx, top_k):
+        """Neighbour ids for a matrix position: table slice, or a one-off row ranking for top_k beyond the table."""
+        if top_k <= snapshot.neighbours.shape[1]:
+            return snapshot.item_ids[snapshot.neighbours[sound_idx, :top_k]].tolist()
+        candidates = snapshot.factors[:len(snapshot.neighbours)]
+        row = np.nan_to_num(candidates @ snapshot.factors[sound_idx], nan=-np.inf)
+        row[sound_idx] = -np.inf
+        return snapshot.item_ids[top_k_neighbours(row[np.newaxis], min(top_k, len(row) - 1))[0]].tolist()
+
+    def _hybrid_scorer(self, snapshot):
+        index = SoundVectorIndex.get_instance()
+        if not index.ready or len(index.ids) == 0:
+            return None
+        scorer = self._scorer
+        if scorer is None or not scorer.matches(snapshot, index):
+            scorer = self._scorer = HybridScorer(snapshot, index)
+        return scorer
 
-            return recommendations
+    @staticmethod
+    def _collaborative(snapshot, sound_ids, top_k):
+        """Neighbour-table recommendations for the sounds the interaction matrix knows."""
+        known = [(s, snapshot.item_index.get(s)) for s in sound_ids]
+        known = [(s, i) for s, i in known if i is not None and i < len(snapshot.neighbours)]
+        if not known:
+            return {}
+        if top_k <= snapshot.neighbours.shape[1]:
+            rows = snapshot.item_ids[snapshot.neighbours[[i for _, i in known], :top_k]]
+            return {s: row.tolist() for (s, _), row in zip(known, rows)}
+        return {s: RecommenderSystem._lookup(snapshot, i, top_k) for s, i in known}
 
+    def recommend_for_sound(self, sound_id, top_k=4, alpha=None):
+        return self.recommend_many([sound_id], top_k, alpha)[sound_id]
+
+    def recommend_many(self, sound_ids, top_k=4, alpha=None):
+        """
+        Bulk recommendations: {sound_id: [recommended ids]} for every requested sound.
+
+        Process Flow:
+        1. alpha < 1 and vector index ready: one blended score matrix for the whole batch (HybridScorer).
+        2. alpha = 1 (or no index): single fancy-index gather over the collaborative neighbour table.
+        3. Sounds unknown to the interaction matrix: content neighbours from their embedding.
+        4. Last resort (no interactions, no embedding): random sample.
+        """
+        snapshot = self._snapshot  # one consistent model for the whole request
+        if not snapshot.model or not snapshot.sound_ids:
+            return {sound_id: [] for sound_id in sound_ids}
+
+        alpha = HYBRID_ALPHA if alpha is None else min(max(float(alpha), 0.0), 1.0)
+        unique = list(dict.fromkeys(sound_ids))
+        results = {}
+        try:
+            scorer = self._hybrid_scorer(snapshot)
+            if scorer is not None and alpha < 1:
+                results.update(scorer.top_k(unique, top_k, alpha))
+            results.update(self._collaborative(snapshot, [s for s in unique if not results.get(s)], top_k))
+            pending = [s for s in unique if not results.get(s)]
+            if scorer is not None and pending:
+                results.update(scorer.top_k(pending, top_k, 0.0))
         except Exception as e:
             print(f"Recommendation Error: {e}")
-            return get_random_fallback()
+
+        for sound_id in unique:
+            if not results.get(sound_id):
+                results[sound_id] = self._random_fallback(snapshot, sound_id, top_k)
+        return results
+
+ModelRegistry.get_instance().register("recommender", RecommenderSystem.load, RecommenderSystem.unload, default_policy="eager")
 
 # Standalone test
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import numpy as np
+from scipy import sparse
+
+# -------------------------------------------------
+# Recommender Model Artifact
+# A trained snapshot persisted as a directory of .npy arrays + manifest.json, so a process can
+# start serving by memory-mapping the arrays (milliseconds, no DB fetch or SVD). Every uvicorn
+# worker that maps the same files shares one copy in the OS page cache.
+#
+# Layout:
+#   <root>/CURRENT                 -> name of the active version directory (replaced atomically)
+#   <root>/v2-<time_ns>-<pid>/     -> manifest.json + one .npy per array
+#
+# Version 2: `factors`/`neighbours` are item-space (one row per sound); version 1 artifacts held
+# user-space correlation factors and are ignored.
+# -------------------------------------------------
+FORMAT_VERSION = 2
+ARRAYS = ("sound_ids", "user_ids", "item_ids", "matrix_data", "matrix_indices", "matrix_indptr",
+          "matrix_reduced", "factors", "neighbours", "components", "singular_values")
+
+def default_root():
+    """Artifact directory (AURA_RECOMMENDER_ARTIFACT_DIR); an empty value disables persistence."""
+    return os.getenv("AURA_RECOMMENDER_ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "aura-recommender"))
+
+def save_snapshot(snapshot, root: str, keep: int = 3) -> str:
+    """
+    Writes `snapshot` as a new version directory and points CURRENT at it.
+    The directory is complete before the pointer moves, so readers never see a partial artifact.
+    Returns the version directory path.
+    """
+    os.makedirs(root, exist_ok=True)
+    name = f"v{FORMAT_VERSION}-{time.time_ns()}-{os.getpid()}"
+    staging = os.path.join(root, f".{name}.tmp")
+    os.makedirs(staging)
+
+    matrix = snapshot.user_item_matrix.tocsr()
+    arrays = {
+        "sound_ids": np.asarray(snapshot.sound_ids, dtype=str),
+        "user_ids": np.asarray(snapshot.user_ids, dtype=str),
+        "item_ids": np.asarray(snapshot.item_ids, dtype=str),
+        "matrix_data": matrix.data,
+        "matrix_indices": matrix.indices,
+        "matrix_indptr": matrix.indptr,
+        "matrix_reduced": snapshot.matrix_reduced,
+        "factors": snapshot.factors,
+        "neighbours": snapshot.neighbours,
+        "components": snapshot.model.components_,
+        "singular_values": snapshot.model.singular_values_,
+    }
+    for key, value in arrays.items():
+        np.save(os.path.join(staging, f"{key}.npy"), np.ascontiguousarray(value))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created_at": time.time(),
+        "watermark": snapshot.watermark,
+        "shape": list(matrix.shape),
+        "n_components": int(snapshot.model.components_.shape[0]),
+    }
+    with open(os.path.join(staging, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    path = os.path.join(root, name)
+    os.replace(staging, path)
+    pointer = os.path.join(root, f".CURRENT.{os.getpid()}")
+    with open(pointer, "w") as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(root, "CURRENT"))
+
+    _prune(root, keep)
+    return path
+
+def _prune(root, keep):
+    # Unlinking files another worker still has mapped is safe: the mapping stays valid.
+    versions = sorted(d for d in os.listdir(root) if d.startswith(f"v{FORMAT_VERSION}-"))
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+def current_artifact(root: str):
+    """(path, manifest) of the active artifact, or None if missing, unreadable or another format version."""
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            path = os.path.join(root, f.read().strip())
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format_version") != FORMAT_VERSION:
+        return None
+    return path, manifest
+
+def load_snapshot_fields(path: str, manifest: dict) -> dict:
+    """
+    Memory-maps an artifact. Returns RecommenderSnapshot keyword arguments;
+    numeric arrays are read-only mmaps (copy-on-write is never needed: updates build new arrays).
+    """
+    arrays = {key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r") for key in ARRAYS}
+    matrix = sparse.csr_matrix(
+        (arrays["matrix_data"], arrays["matrix_indices"], arrays["matrix_indptr"]), shape=tuple(manifest["shape"]), copy=False
+    )
+    from sklearn.decomposition import TruncatedSVD
+    model = TruncatedSVD(n_components=manifest["n_components"])
+    model.components_ = arrays["components"]
+    model.singular_values_ = arrays["singular_values"]
+    return {
+        "sound_ids": arrays["sound_ids"].tolist(),
+        "model": model,
+        "user_item_matrix": matrix,
+        "user_ids": arrays["user_ids"],
+        "item_ids": arrays["item_ids"],
+        "matrix_reduced": arrays["matrix_reduced"],
+        "factors": arrays["factors"],
+        "neighbours": arrays["neighbours"],
+        "watermark": manifest.get("watermark"),
+        "artifact": path,
+    }
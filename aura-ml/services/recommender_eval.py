@@ -0,0 +1,71 @@
+import numpy as np
+from core.paged_reader import InteractionLog
+
+# -------------------------------------------------
+# Recommender Evaluation (recall@K on held-out interactions)
+#
+# Protocol (leave-one-out):
+# 1. For every user with at least `min_history` distinct sounds, one random interaction is held out;
+#    the model is trained on the rest.
+# 2. The user's remaining sounds are the query, exactly as the service is used ("more like what you
+#    played"): every history sound votes for its served neighbour list, weighted 1 / (1 + rank).
+# 3. A hit is the held-out sound appearing in the top-K of the vote; recall@K = hits / users.
+# -------------------------------------------------
+
+def holdout_split(log: InteractionLog, seed: int = 42, min_history: int = 2):
+    """
+    Leave-one-out split of an integer-coded log.
+    Returns (train log, held-out user codes, held-out item codes). Id vocabularies are unchanged,
+    so held-out codes index the same matrix positions as the training log.
+    """
+    pairs = np.unique(np.stack([log.user_codes, log.item_codes], axis=1), axis=0)
+    rng = np.random.default_rng(seed)
+    pairs = pairs[rng.permutation(len(pairs))]
+    users, first, counts = np.unique(pairs[:, 0], return_index=True, return_counts=True)
+    eligible = first[counts >= min_history]
+
+    keep = np.ones(len(pairs), dtype=bool)
+    keep[eligible] = False
+    train = InteractionLog(pairs[keep, 0].astype(np.int32), pairs[keep, 1].astype(np.int32),
+                           log.user_ids, log.item_ids, log.watermark)
+    return train, pairs[eligible, 0], pairs[eligible, 1]
+
+def recommend_from_history(neighbours: np.ndarray, history, k: int, n_items: int) -> np.ndarray:
+    """Top-k sounds by rank-weighted votes of the history sounds' neighbour lists (history excluded)."""
+    history = history[history < len(neighbours)]
+    scores = np.zeros(n_items)
+    if len(history):
+        lists = neighbours[history]
+        weights = np.broadcast_to(1.0 / (1.0 + np.arange(lists.shape[1])), lists.shape)
+        np.add.at(scores, lists.ravel(), weights.ravel())
+    scores[history] = -np.inf
+    k = min(k, n_items)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def recall_at_k(neighbours: np.ndarray, matrix, held_users, held_items, ks=(5, 10, 20)) -> dict:
+    """
+    recall@K for every K in `ks`, from a neighbour table (rows = sound positions) and the training
+    CSR matrix (users x sounds). Users whose whole history falls outside the table count as misses.
+    """
+    max_k = max(ks)
+    hits = {k: 0 for k in ks}
+    n_items = matrix.shape[1]
+    for user, item in zip(held_users, held_items):
+        history = matrix.indices[matrix.indptr[user]:matrix.indptr[user + 1]]
+        ranked = recommend_from_history(neighbours, history, max_k, n_items)
+        position = np.flatnonzero(ranked == item)
+        for k in ks:
+            hits[k] += int(len(position) > 0 and position[0] < k)
+    total = max(len(held_users), 1)
+    return {k: hits[k] / total for k in ks}
+
+def popularity_table(matrix, k: int) -> np.ndarray:
+    """Baseline neighbour table: every sound's neighbours are the globally most played sounds."""
+    popularity = np.asarray(matrix.sum(axis=0)).ravel()
+    width = min(k, matrix.shape[1] - 1)
+    head = np.argsort(-popularity, kind="stable")[:width + 1]
+    table = np.empty((matrix.shape[1], width), dtype=np.int32)
+    for item in range(matrix.shape[1]):
+        table[item] = head[head != item][:width]
+    return table
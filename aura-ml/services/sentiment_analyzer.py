@@ -1,5 +1,3 @@
-from textblob import TextBlob
-
 def analyze_sentiment(text: str):
     """
     Natural Language Processing Utility.
@@ -7,6 +5,7 @@ def analyze_sentiment(text: str):
     Maps continuous polarity scores to discrete categories (POSITIVE, NEGATIVE, NEUTRAL)
     for downstream logic in the AI Coach.
     """
+    from textblob import TextBlob  # deferred: pulls in nltk (~2s) on first use only
     blob = TextBlob(text)
     polarity = blob.sentiment.polarity # -1.0 to 1.0
 
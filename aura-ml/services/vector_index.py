@@ -0,0 +1,212 @@
+import os
+import json
+import numpy as np
+from core.paged_reader import PagedReader
+
+try:
+    import hnswlib  # Optional: ANN backend for large sound libraries
+except ImportError:
+    hnswlib = None
+
+class SoundVectorIndex:
+    """
+    In-Process Vector Index for the 'sounds' library.
+
+    Replaces the per-request `match_sounds` RPC round trip with a local scan over
+    the 384-d `all-MiniLM-L6-v2` embeddings, hydrating results from an in-memory row cache.
+
+    Architecture:
+    - Row Cache: Every `sounds` row keyed by id, holding exactly the columns the `match_sounds` RPC returns
+      (learned from one probe call at build time, or AURA_INDEX_ROW_COLUMNS when set).
+    - Exact Backend: L2-normalised float32 matrix; one matmul per query (small libraries).
+    - HNSW Backend: `hnswlib` cosine graph for large libraries (if installed).
+
+    Semantics mirror the `match_sounds` SQL function:
+    - similarity = 1 - cosine distance
+    - strictly greater than `match_threshold`, ordered by similarity desc, limited to `match_count`
+    - rows without an embedding never match
+
+    The exact backend reproduces the RPC's results. The HNSW backend is approximate: it can miss a true
+    neighbour the RPC would return, so results may differ from the RPC. Raise AURA_INDEX_EXACT_LIMIT to keep
+    the exact scan when that matters more than query latency.
+    """
+    _instance = None
+
+    # Libraries larger than this switch to the HNSW backend (when available)
+    EXACT_LIMIT = int(os.getenv("AURA_INDEX_EXACT_LIMIT", "20000"))
+    # Optional override of the hydration columns; by default they are taken from the RPC's own rows
+    ROW_COLUMNS = os.getenv("AURA_INDEX_ROW_COLUMNS", "")
+    # Columns the RPC adds on top of the table row
+    RPC_ONLY_COLUMNS = ("similarity",)
+
+    def __init__(self):
+        self.rows = {}
+        self.ids = []
+        self.positions = {}
+        self.matrix = None
+        self.backend = None
+        self._ann = None
+        self.ready = False
+        self.columns = None
+        self.error = None
+        self.rpc_fallbacks = 0
+        self._fallback_logged = False
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = SoundVectorIndex()
+        return cls._instance
+
+    @staticmethod
+    def is_enabled():
+        return os.getenv("AURA_LOCAL_INDEX", "1").lower() not in ("0", "false", "no")
+
+    def build(self, supabase, reader: PagedReader = None):
+        """
+        Reads the whole 'sounds' table in `.range()` pages and (re)builds the index.
+        Vectors come from an `id, embedding` read, hydration rows from a read of the RPC's row columns.
+        Swaps state atomically on success; on failure the previous state (or the RPC) keeps serving.
+        """
+        try:
+            print("⏳ Building local vector index...")
+            reader = reader or PagedReader(supabase)
+            vectors = [row for page in reader.iter_pages("sounds", "id, embedding") for row in page]
+            probe = next((v for v in map(self._parse_embedding, (row.get("embedding") for row in vectors)) if v is not None), None)
+            if probe is None:
+                # Nothing can match, exactly like the RPC over an empty library
+                columns, rows = "id", {}
+            else:
+                columns = self.ROW_COLUMNS or self.rpc_columns(supabase, probe)
+                rows = {row["id"]: row for page in reader.iter_pages("sounds", columns) for row in page}
+            self.load_rows(vectors, rows=rows)
+            self.columns, self.error = columns, None
+            print(f"✅ Vector Index Ready: {len(self.ids)} vectors ({self.backend}), {len(self.rows)} rows cached [{columns}].")
+        except Exception as e:
+            self.error = str(e)
+            self._fallback_logged = False
+            state = "keeps serving the previous index" if self.ready else "is served by the match_sounds RPC"
+            print(f"⚠️ Vector Index build failed ({e}). Vector search {state}.")
+
+    def rpc_columns(self, supabase, probe):
+        """
+        Learns the RPC's row shape from one `match_sounds` call (threshold below any cosine similarity,
+        one row), so hydrated rows carry the same columns as the RPC's rows.
+        """
+        response = supabase.rpc("match_sounds", {
+            "query_embedding": list(probe),
+            "match_threshold": -2.0,
+            "match_count": 1,
+        }).execute()
+        if not response.data:
+            raise RuntimeError("match_sounds probe returned no rows; cannot learn its row shape")
+        return ", ".join(k for k in response.data[0] if k not in self.RPC_ONLY_COLUMNS)
+
+    def record_fallback(self):
+        """Counts a search served by the RPC; logs the first one after each failed or pending build."""
+        self.rpc_fallbacks += 1
+        if not self._fallback_logged:
+            self._fallback_logged = True
+            reason = self.error or "index not built yet"
+            print(f"🔁 Vector search served by match_sounds RPC ({reason}).")
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "backend": self.backend,
+            "vectors": len(self.ids),
+            "rows": len(self.rows),
+            "columns": self.columns,
+            "error": self.error,
+            "rpc_fallbacks": self.rpc_fallbacks,
+        }
+
+    def load_rows(self, data, rows: dict = None):
+        """
+        Indexes `data` (dicts with 'id' and 'embedding'). Hydration rows are taken from `data` itself,
+        or from `rows` when given, as-is (a sound missing from `rows`, e.g. inserted between the two reads, is skipped).
+        """
+        cached = rows is not None
+        rows = dict(rows or {})
+        ids = []
+        vectors = []
+
+        for item in data:
+            sound_id = item["id"]
+            if not cached:
+                rows[sound_id] = {k: v for k, v in item.items() if k != "embedding"}
+            elif sound_id not in rows:
+                continue
+
+            vector = self._parse_embedding(item.get("embedding"))
+            if vector is not None:
+                ids.append(sound_id)
+                vectors.append(vector)
+
+        if vectors:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.maximum(norms, 1e-12)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        ann = None
+        backend = "exact"
+        if hnswlib is not None and len(ids) > self.EXACT_LIMIT:
+            ann = hnswlib.Index(space="cosine", dim=matrix.shape[1])
+            ann.init_index(max_elements=len(ids), ef_construction=200, M=16)
+            ann.add_items(matrix, np.arange(len(ids)))
+            backend = "hnsw"
+
+        # Publish the new state in one go so concurrent queries never see a half-built index
+        positions = {sound_id: i for i, sound_id in enumerate(ids)}
+        self.rows, self.ids, self.positions, self.matrix, self._ann, self.backend = rows, ids, positions, matrix, ann, backend
+        self.ready = True
+
+    @staticmethod
+    def _parse_embedding(embedding):
+        if embedding is None:
+            return None
+        if isinstance(embedding, str):
+            try:
+                embedding = json.loads(embedding)
+            except ValueError:
+                return None
+        if not isinstance(embedding, (list, tuple)) or len(embedding) == 0:
+            return None
+        return embedding
+
+    def get_embedding(self, sound_id):
+        """Returns the normalised embedding for a cached sound, or None if it has none."""
+        idx = self.positions.get(sound_id)
+        return None if idx is None else self.matrix[idx]
+
+    def query(self, query_vector, match_threshold, match_count):
+        """Returns hydrated rows with a 'similarity' score, identical in shape to the RPC response."""
+        if match_count <= 0 or len(self.ids) == 0:
+            return []
+
+        q = np.asarray(query_vector, dtype=np.float32)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+        if self._ann is not None:
+            k = min(match_count, len(self.ids))
+            self._ann.set_ef(max(50, k))
+            labels, distances = self._ann.knn_query(q, k=k)
+            candidates = labels[0]
+            sims = 1.0 - distances[0]
+        else:
+            sims = self.matrix @ q
+            k = min(match_count, len(sims))
+            candidates = np.argpartition(-sims, k - 1)[:k]
+            sims = sims[candidates]
+
+        order = np.argsort(-sims, kind="stable")
+        results = []
+        for pos in order:
+            score = float(sims[pos])
+            if score <= match_threshold:
+                break
+            sound_id = self.ids[candidates[pos]]
+            results.append({**self.rows[sound_id], "similarity": score})
+        return results
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.paged_reader import PagedReader
+from services.analysis_store import AnalysisStore, compute_analysis
+from test_recommender import fake_supabase
+
+class TestAnalysisStore(unittest.TestCase):
+    """
+    Unit Verification for Precomputed Analysis Serving.
+
+    Validates:
+    1. Stored results are looked up by file URL; unknown URLs return None (live fallback).
+    2. Partially analysed rows only serve the columns that exist.
+    3. Error payloads from the live pipelines are never persisted.
+    4. The store is built from every page of the catalogue, not just the first.
+    """
+
+    def setUp(self):
+        self.store = AnalysisStore()
+        self.store.load_rows([
+            {"file_url": "https://cdn/rain.mp3", "waveform": [0.1, 1.0],
+             "ast_predictions": [{"label": "Rainfall", "original_label": "Rain", "score": 0.9}],
+             "cnn_prediction": {"label": "Air Conditioner", "confidence": 0.7, "model": "Custom CNN (UrbanSound8K)"}},
+            {"file_url": "https://cdn/fire.mp3", "waveform": [0.5, 1.0], "ast_predictions": None, "cnn_prediction": None},
+            {"file_url": "https://cdn/new.mp3", "waveform": None, "ast_predictions": None, "cnn_prediction": None},
+        ])
+
+    def test_lookup(self):
+        """Verifies catalogue URLs resolve to stored results and unknown ones fall through."""
+        self.assertEqual(self.store.get("https://cdn/rain.mp3", "waveform"), [0.1, 1.0])
+        self.assertEqual(self.store.get("https://cdn/rain.mp3", "cnn_prediction")["label"], "Air Conditioner")
+        self.assertIsNone(self.store.get("https://elsewhere/upload.mp3", "waveform"))
+
+    def test_partial_rows(self):
+        """Verifies missing columns fall back to live inference individually."""
+        self.assertEqual(self.store.get("https://cdn/fire.mp3", "waveform"), [0.5, 1.0])
+        self.assertIsNone(self.store.get("https://cdn/fire.mp3", "ast_predictions"))
+        self.assertNotIn("https://cdn/new.mp3", self.store.results)
+
+    def test_build_reads_all_pages(self):
+        """Verifies rows beyond the first page are served from the store."""
+        rows = [{"id": f"s{i:04d}", "file_url": f"https://cdn/{i}.mp3", "waveform": [i, 1.0]} for i in range(25)]
+        store = AnalysisStore()
+        store.build(None, reader=PagedReader(fake_supabase({"sounds": rows}), page_size=10, workers=2))
+        self.assertEqual(len(store.results), 25)
+        self.assertEqual(store.get("https://cdn/24.mp3", "waveform"), [24, 1.0])
+
+    @patch('services.analysis_store.predict_with_custom_model', return_value={"error": "Model not loaded"})
+    @patch('services.analysis_store.predict_sound_class', return_value=[{"label": "Error: timeout", "score": 0.0}])
+    @patch('services.analysis_store.extract_waveform', return_value=[0.2, 1.0])
+    def test_errors_not_persisted(self, *_):
+        """Verifies failed stages come back as None so they are never written to the DB."""
+        results = compute_analysis("https://cdn/rain.mp3")
+        self.assertEqual(results["waveform"], [0.2, 1.0])
+        self.assertIsNone(results["ast_predictions"])
+        self.assertIsNone(results["cnn_prediction"])
+
+    def test_build_without_columns(self):
+        """Verifies a schema without the analysis columns leaves the store empty instead of failing startup."""
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.execute.side_effect = Exception("column sounds.waveform does not exist")
+        store = AnalysisStore()
+        store.build(supabase)
+        self.assertEqual(store.results, {})
+
+if __name__ == '__main__':
+    unittest.main()
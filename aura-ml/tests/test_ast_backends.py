@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import shutil
+import tempfile
+import importlib.util
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import audio_classifier
+from services.audio_classifier import AudioClassifier, predict_sound_class
+from services.ast_backends import OnnxAudioModel, build_backend, check_parity, reference_clips, reference_features
+from services.feature_cache import FeatureCache
+from test_audio_classifier import LABELS
+
+HAS_ONNXRUNTIME = importlib.util.find_spec("onnxruntime") is not None
+
+def save_tiny_ast(path):
+    """A randomly initialised 2-layer AST over a 100-frame window (no hub download needed)."""
+    import torch
+    from transformers import ASTConfig, ASTFeatureExtractor, ASTForAudioClassification
+    torch.manual_seed(0)
+    config = ASTConfig(hidden_size=32, num_hidden_layers=2, num_attention_heads=2, intermediate_size=64,
+                       max_length=100, num_mel_bins=128, num_labels=len(LABELS),
+                       id2label=dict(enumerate(LABELS)), label2id={l: i for i, l in enumerate(LABELS)})
+    ASTForAudioClassification(config).save_pretrained(path)
+    ASTFeatureExtractor(max_length=100).save_pretrained(path)
+
+class TestAstBackends(unittest.TestCase):
+    """
+    Unit Verification for the Optimized AST Backends.
+
+    Validates:
+    1. Dynamic int8 (PyTorch) and ONNX Runtime backends match the eager model on the fixture clips.
+    2. The ONNX export is cached and reused.
+    3. AudioClassifier serves a backend only when it passes parity, behind the same predict_sound_class API.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from transformers import pipeline
+        cls.root = tempfile.mkdtemp()
+        cls.model_dir = os.path.join(cls.root, "tiny-ast")
+        save_tiny_ast(cls.model_dir)
+        cls.pipeline = pipeline("audio-classification", model=cls.model_dir)
+        cls.features = reference_features(cls.pipeline)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self):
+        self.env = patch.dict(os.environ, {"AURA_AST_ONNX_DIR": tempfile.mkdtemp(dir=self.root)})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        AudioClassifier.unload()
+        FeatureCache.get_instance().clear()
+
+    def test_fixture_clips(self):
+        """Verifies the fixture audio is deterministic, normalised 16 kHz float32."""
+        clips = reference_clips()
+        self.assertEqual(len(clips), 4)
+        for clip, again in zip(clips, reference_clips()):
+            self.assertEqual(clip.dtype, np.float32)
+            self.assertEqual(len(clip), 32000)
+            self.assertAlmostEqual(float(np.abs(clip).max()), 0.5, places=5)
+            np.testing.assert_array_equal(clip, again)
+
+    def test_quantized_parity(self):
+        """Verifies dynamic int8 keeps every top-1 class and probabilities close to eager."""
+        candidate = build_backend(self.pipeline, "quantized", self.model_dir)
+        parity = check_parity(self.pipeline.model, candidate, self.features)
+        self.assertTrue(parity["passed"], parity)
+        self.assertIsNot(candidate, self.pipeline.model)
+
+    @unittest.skipUnless(HAS_ONNXRUNTIME, "onnxruntime not installed")
+    def test_onnx_parity_and_cache(self):
+        """Verifies the ONNX graph reproduces eager probabilities and later builds reuse the exported file."""
+        candidate = build_backend(self.pipeline, "onnx", self.model_dir)
+        self.assertIsInstance(candidate, OnnxAudioModel)
+        parity = check_parity(self.pipeline.model, candidate, self.features)
+        self.assertEqual(parity["top1_agreement"], 1.0)
+        self.assertLess(parity["max_prob_diff"], 1e-4)
+
+        with patch("services.ast_backends.export_onnx", side_effect=AssertionError("re-export")):
+            self.assertEqual(build_backend(self.pipeline, "onnx", self.model_dir).path, candidate.path)
+        int8 = build_backend(self.pipeline, "onnx-int8", self.model_dir)
+        self.assertTrue(int8.path.endswith("model-int8.onnx"))
+        self.assertEqual(int8(input_values=self.features).logits.shape, (len(self.features), len(LABELS)))
+
+    def test_backend_selection_behind_same_api(self):
+        """Verifies AURA_AST_BACKEND swaps the served model, predictions keep their format, and failed parity serves eager."""
+        loader = MagicMock()
+        loader.load.return_value = (reference_clips(1)[0], 16000)
+        with patch.object(audio_classifier, "MODEL_NAME", self.model_dir), \
+             patch.object(audio_classifier.AudioLoader, "get_instance", return_value=loader), \
+             patch.object(AudioClassifier, "get_instance", side_effect=AudioClassifier.load):
+            eager = predict_sound_class("https://cdn/tone.wav", top_k=3)
+            AudioClassifier.unload()
+            FeatureCache.get_instance().clear()
+
+            with patch.dict(os.environ, {"AURA_AST_BACKEND": "quantized"}):
+                served = AudioClassifier.load()
+                self.assertEqual(AudioClassifier.backend, "quantized")
+                self.assertTrue(AudioClassifier.parity["passed"])
+                quantized = predict_sound_class("https://cdn/tone.wav", top_k=3)
+                AudioClassifier.unload()
+
+                with patch.dict(os.environ, {"AURA_AST_PARITY_TOL": "-1"}):
+                    AudioClassifier.load()
+                self.assertEqual(AudioClassifier.backend, "eager")
+
+        self.assertEqual([p["original_label"] for p in quantized], [p["original_label"] for p in eager])
+        self.assertEqual(set(quantized[0]), {"label", "original_label", "score"})
+        for ours, theirs in zip(quantized, eager):
+            self.assertAlmostEqual(ours["score"], theirs["score"], delta=0.05)
+        self.assertIsNot(served.model, None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+import numpy as np
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import audio_classifier
+from services.feature_cache import FeatureCache
+from services.audio_classifier import (
+    VIBE_MAP, VibeTable, AudioClassifier, AudioLoader, predict_sound_classes, clip_to_model_window, resolve_vibe
+)
+
+LABELS = ["Speech", "Rain", "Heavy rain on roof", "Raindrop", "Fire", "Crackling, fire", "Music", "Wind noise"]
+
+def legacy_resolve(original_label):
+    """Reference: the original per-prediction VIBE_MAP scan."""
+    friendly_label = VIBE_MAP.get(original_label)
+    if not friendly_label:
+        for key, val in VIBE_MAP.items():
+            if key.lower() in original_label.lower():
+                friendly_label = val
+                break
+    return friendly_label or original_label
+
+def legacy_map_to_vibes(raw_predictions):
+    """Reference: the original pipeline-output post-processing (one VIBE_MAP scan per prediction)."""
+    return [{
+        "label": legacy_resolve(p['label']),
+        "original_label": p['label'],
+        "score": float(p['score'])
+    } for p in raw_predictions]
+
+class FakeASTPipeline:
+    """Stand-in for the AST pipeline: fixed-shape features and deterministic logits per clip."""
+
+    def __init__(self):
+        self.feature_extractor = MagicMock(sampling_rate=16000, max_length=1024)
+        self.feature_extractor.side_effect = self.extract
+        self.model = MagicMock(side_effect=self.forward)
+        self.model.config.id2label = dict(enumerate(LABELS))
+        self.batch_sizes = []
+
+    def extract(self, batch, sampling_rate, return_tensors):
+        self.batch_sizes.append(len(batch))
+        # Encode each clip's length so logits differ per clip
+        return {"input_values": torch.tensor([[float(len(a))] for a in batch])}
+
+    def forward(self, input_values):
+        logits = torch.zeros(len(input_values), len(LABELS))
+        logits[:, 1] = 3.0                                  # "Rain" wins
+        logits[:, 2] = 2.0                                  # "Heavy rain on roof"
+        logits[:, 4] = input_values[:, 0] / 160000.0        # "Fire" grows with clip length
+        return MagicMock(logits=logits)
+
+class TestAudioClassifier(unittest.TestCase):
+    """
+    Unit Verification for AST Post-processing and Batched Inference.
+
+    Validates:
+    1. The precomputed VibeTable reproduces the original "first substring match" mapping.
+    2. Vibe-aggregated top-k sums probabilities per vibe.
+    3. Clipping to the 1024-frame AST window.
+    4. Batch classification preserves input order and isolates per-URL failures.
+    """
+
+    def setUp(self):
+        AudioClassifier._vibe_table = None
+        FeatureCache.get_instance().clear()
+        # A loader created by these tests never touches the shared on-disk audio cache
+        cache_tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_tmp.cleanup)
+        for patcher in (patch.dict(os.environ, {"AURA_AUDIO_CACHE_DIR": cache_tmp.name}),
+                        patch.object(AudioLoader, "_instance", None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        AudioClassifier._vibe_table = None
+
+    def test_resolver_matches_legacy_scan(self):
+        """Verifies exact, substring and passthrough resolution against the original loop."""
+        for label in LABELS + ["Rain on surface", "Bird vocalization, bird call, bird song", "Zither"]:
+            self.assertEqual(resolve_vibe(label), legacy_resolve(label))
+
+    def test_table_top_k_matches_legacy_mapping(self):
+        """Verifies the array lookup yields the same records as mapping sorted pipeline output."""
+        table = VibeTable(dict(enumerate(LABELS)))
+        probs = np.array([0.05, 0.4, 0.3, 0.1, 0.08, 0.04, 0.02, 0.01])
+        expected = legacy_map_to_vibes([{"label": LABELS[i], "score": probs[i]} for i in np.argsort(-probs)[:5]])
+        self.assertEqual(table.top_k(probs, 5), expected)
+
+    def test_top_k_by_vibe(self):
+        """Verifies classes sharing a vibe are pooled ("Rain" + "Heavy rain on roof" -> "Rainfall")."""
+        table = VibeTable(dict(enumerate(LABELS)))
+        probs = np.array([0.35, 0.2, 0.2, 0.1, 0.08, 0.04, 0.02, 0.01])
+        top = table.top_k_by_vibe(probs, 2)
+        self.assertEqual([t["label"] for t in top], ["Rainfall", "Speech"])
+        self.assertAlmostEqual(top[0]["score"], 0.4)
+        self.assertEqual(top[0]["original_label"], "Rain")
+
+    def test_clip_to_model_window(self):
+        """Verifies the clip keeps exactly the samples needed for 1024 frames (400 + 1023 * 160)."""
+        classifier = FakeASTPipeline()
+        self.assertEqual(len(clip_to_model_window(np.zeros(16000 * 60), classifier)), 164080)
+        self.assertEqual(len(clip_to_model_window(np.zeros(8000), classifier)), 8000)
+
+    def test_batch_order_and_failures(self):
+        """Verifies batched forward passes, per-URL results in input order, and isolated errors."""
+        classifier = FakeASTPipeline()
+        loader = MagicMock()
+
+        def load(url, sr):
+            if "broken" in url:
+                raise ValueError("404 Not Found")
+            seconds = int(url.split("/")[-1].split(".")[0])
+            return np.zeros(16000 * seconds, dtype=np.float32), sr
+
+        loader.load.side_effect = load
+        urls = ["https://cdn/20.mp3", "https://cdn/broken.mp3", "https://cdn/2.mp3", "https://cdn/5.mp3"]
+
+        with patch.object(audio_classifier.AudioLoader, "get_instance", return_value=loader), \
+             patch.object(audio_classifier.AudioClassifier, "get_instance", return_value=classifier):
+            results = predict_sound_classes(urls, batch_size=2, top_k=3)
+
+        self.assertEqual([r["file_url"] for r in results], urls)
+        self.assertEqual(results[0]["predictions"][0]["label"], "Rainfall")
+        self.assertEqual(len(results[0]["predictions"]), 3)
+        self.assertTrue(results[1]["predictions"][0]["label"].startswith("Error:"))
+        self.assertEqual(classifier.batch_sizes, [2, 1])
+
+        # Long clips were clipped to the model window before feature extraction
+        fire_long = next(p["score"] for p in results[0]["predictions"] if p["original_label"] == "Fire")
+        probs = torch.tensor([0.0, 3.0, 2.0, 0.0, 164080 / 160000.0, 0.0, 0.0, 0.0]).softmax(-1)
+        self.assertAlmostEqual(fire_long, float(probs[4]), places=5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import functools
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.audio_loader import AudioLoader, ByteBudgetLRU, DiskCache
+from core.http_client import close_http_client
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler (supports If-Modified-Since -> 304) that counts full downloads."""
+    downloads = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send_head(self):
+        f = super().send_head()
+        if f is not None:
+            QuietHandler.downloads += 1
+        return f
+
+class TestAudioLoader(unittest.TestCase):
+    """
+    Unit Verification for the Shared Audio Fetch-and-Decode Layer.
+
+    Serves a generated WAV from a local HTTP server and validates:
+    1. One download and one decode per (url, sample_rate), however many services ask.
+    2. Conditional revalidation (304) reuses cached bytes and decoded PCM.
+    3. The disk tier warms a fresh process without touching the network.
+    4. Memory tiers are bounded by bytes, evicting least recently used entries.
+    5. The async path keeps disk I/O off the event loop; per-key locks are released after use.
+       A cancelled caller never cancels a download other callers share.
+    6. The disk tier tracks its size without rescanning on every write.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.serve_tmp = tempfile.TemporaryDirectory()
+        cls.serve_dir = cls.serve_tmp.name
+        tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(22050 * 2) / 22050).astype(np.float32)
+        sf.write(os.path.join(cls.serve_dir, "tone.wav"), tone, 22050)
+
+        handler = functools.partial(QuietHandler, directory=cls.serve_dir)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/tone.wav"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.serve_tmp.cleanup()
+
+    def setUp(self):
+        QuietHandler.downloads = 0
+        # Every loader in these tests (including a default one) caches under a per-test temp dir
+        cache_tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_tmp.cleanup)
+        self.cache_dir = cache_tmp.name
+        env = patch.dict(os.environ, {"AURA_AUDIO_CACHE_DIR": self.cache_dir})
+        env.start()
+        self.addCleanup(env.stop)
+        self.loader = AudioLoader(memory_mb=64, disk_mb=64, cache_dir=self.cache_dir, revalidate_seconds=300)
+
+    def test_single_download_and_decode(self):
+        """Verifies repeated loads share bytes and PCM; a new sample rate only re-decodes."""
+        y1, sr1 = self.loader.load(self.url, sr=16000)
+        y2, _ = self.loader.load(self.url, sr=16000)
+        native, native_sr = self.loader.load(self.url, sr=None)
+
+        self.assertIs(y1, y2)
+        self.assertEqual(sr1, 16000)
+        self.assertEqual(native_sr, 22050)
+        self.assertEqual(len(native), 44100)
+        self.assertEqual(QuietHandler.downloads, 1)
+        self.assertEqual(self.loader.counters["pcm_decodes"], 2)
+
+    def test_conditional_revalidation(self):
+        """Verifies stale entries are revalidated with If-Modified-Since instead of re-downloaded."""
+        loader = AudioLoader(memory_mb=64, disk_mb=64, cache_dir=self.cache_dir, revalidate_seconds=0)
+        loader.load(self.url, sr=16000)
+        loader.load(self.url, sr=16000)
+        self.assertEqual(QuietHandler.downloads, 1)
+        self.assertEqual(loader.counters["bytes_revalidated"], 1)
+        self.assertEqual(loader.counters["pcm_decodes"], 1)
+
+    def test_disk_tier(self):
+        """Verifies a new loader (e.g. another worker) is served from disk with no network or decode."""
+        y, _ = self.loader.load(self.url, sr=16000)
+        fresh = AudioLoader(memory_mb=64, disk_mb=64, cache_dir=self.cache_dir, revalidate_seconds=300)
+        y_disk, sr = fresh.load(self.url, sr=16000)
+
+        np.testing.assert_array_equal(y, y_disk)
+        self.assertEqual(sr, 16000)
+        self.assertEqual(QuietHandler.downloads, 1)
+        self.assertEqual(fresh.counters["bytes_disk_hits"], 1)
+        self.assertEqual(fresh.counters["pcm_disk_hits"], 1)
+        self.assertEqual(fresh.counters["pcm_decodes"], 0)
+
+    def test_async_fetch_is_deduplicated(self):
+        """Verifies concurrent async fetches of one URL share a single download."""
+        async def fetch_three():
+            try:
+                return await asyncio.gather(*(self.loader.afetch_bytes(self.url) for _ in range(3)))
+            finally:
+                await close_http_client()
+
+        results = asyncio.run(fetch_three())
+        self.assertEqual(len({len(r) for r in results}), 1)
+        self.assertEqual(QuietHandler.downloads, 1)
+
+    def test_cancelled_waiter_keeps_shared_download(self):
+        """Verifies cancelling one of two concurrent async fetches still completes the other's shared download."""
+        download = self.loader._adownload
+
+        async def fetch_and_cancel():
+            gate = asyncio.Event()
+
+            async def gated_download(url, entry):
+                await gate.wait()  # hold the shared download until both callers wait on it
+                return await download(url, entry)
+
+            try:
+                with patch.object(self.loader, "_adownload", gated_download):
+                    first = asyncio.ensure_future(self.loader.afetch_bytes(self.url))
+                    second = asyncio.ensure_future(self.loader.afetch_bytes(self.url))
+                    while self.url not in self.loader._inflight:
+                        await asyncio.sleep(0.001)
+                    await asyncio.sleep(0.01)
+                    first.cancel()
+                    await asyncio.sleep(0)
+                    gate.set()
+                    return first, await second
+            finally:
+                await close_http_client()
+
+        first, content = asyncio.run(fetch_and_cancel())
+        self.assertTrue(first.cancelled())
+        self.assertEqual(content, self.loader.fetch_bytes(self.url))
+        self.assertEqual(QuietHandler.downloads, 1)
+
+    def test_async_disk_io_off_event_loop(self):
+        """Verifies async fetches read and write the disk tier from worker threads only."""
+        loop_threads, disk_threads = set(), []
+        read, write = DiskCache.read, DiskCache.write
+
+        def record(func):
+            def wrapper(cache, *args):
+                disk_threads.append(threading.get_ident())
+                return func(cache, *args)
+            return wrapper
+
+        async def fetch_twice():
+            loop_threads.add(threading.get_ident())
+            try:
+                await self.loader.afetch_bytes(self.url)  # download -> disk write
+                fresh = AudioLoader(memory_mb=64, disk_mb=64, cache_dir=self.cache_dir, revalidate_seconds=300)
+                await fresh.afetch_bytes(self.url)  # disk read
+                return fresh
+            finally:
+                await close_http_client()
+
+        with patch.object(DiskCache, "read", record(read)), patch.object(DiskCache, "write", record(write)):
+            fresh = asyncio.run(fetch_twice())
+        self.assertEqual(fresh.counters["bytes_disk_hits"], 1)
+        self.assertTrue(disk_threads)
+        self.assertFalse(loop_threads & set(disk_threads))
+
+    def test_key_locks_released(self):
+        """Verifies per-key locks do not accumulate one entry per URL."""
+        self.loader.load(self.url, sr=16000)
+        self.loader.load(self.url, sr=None)
+        self.assertEqual(self.loader._key_locks, {})
+
+    def test_disk_running_total(self):
+        """Verifies writes keep a running total and eviction only rescans past the budget, down to the low-water mark."""
+        cache = DiskCache(self.cache_dir, max_bytes=1000)
+        with patch.object(DiskCache, "_scan", wraps=cache._scan) as scan:
+            for i in range(4):
+                cache.write(f"f{i}", b"x" * 200)
+            cache.write("f0", b"x" * 300)  # overwrite: only the size difference counts
+            self.assertEqual(cache.used_bytes, 900)
+            self.assertEqual(scan.call_count, 0)
+            cache.write("f4", b"x" * 200)
+        self.assertEqual(scan.call_count, 1)
+        self.assertLessEqual(cache.used_bytes, 900)
+        self.assertEqual(cache.used_bytes, sum(os.path.getsize(os.path.join(self.cache_dir, n)) for n in os.listdir(self.cache_dir)))
+        self.assertEqual(DiskCache(self.cache_dir, max_bytes=1000).used_bytes, cache.used_bytes)
+
+    def test_byte_budget_eviction(self):
+        """Verifies the memory tier evicts by total size, oldest first."""
+        lru = ByteBudgetLRU(max_bytes=100)
+        lru.put("a", "A", 40)
+        lru.put("b", "B", 40)
+        lru.get("a")
+        lru.put("c", "C", 40)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), "A")
+        self.assertEqual(lru.used_bytes, 80)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import audio_processor
+from services.audio_processor import EnvelopeAccumulator, extract_waveform, extract_waveform_levels
+
+def legacy_waveform(y, n_points):
+    """Reference: the original per-chunk Python loop (mean |y|, normalised over the returned points)."""
+    y_abs = np.abs(y)
+    step = len(y_abs) // n_points
+    waveform = [float(np.mean(y_abs[i:i+step])) for i in range(0, step * n_points, step)]
+    max_val = max(waveform)
+    return [x / max_val for x in waveform]
+
+class TestAudioProcessor(unittest.TestCase):
+    """
+    Unit Verification for the Streaming Waveform Extractor.
+
+    Validates:
+    1. Block-streamed reductions equal a whole-signal computation, whatever the block alignment.
+    2. 'mean' mode reproduces the original loop; 'rms' and 'peak' are correct.
+    3. Multi-resolution output returns every level from one decode.
+    4. Out-of-range point counts are rejected before any allocation.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.signal = (rng.normal(size=48_013) * np.linspace(0.1, 1.0, 48_013)).astype(np.float32)
+
+    def stream(self, y, n_points, mode, block):
+        acc = EnvelopeAccumulator(len(y), n_points, mode)
+        for offset in range(0, len(y), block):
+            acc.add(y[offset:offset+block], offset)
+        return acc.result()
+
+    def test_streaming_matches_whole_signal(self):
+        """Verifies unaligned, aligned and single-block reductions agree."""
+        for mode in ("mean", "rms", "peak"):
+            whole = self.stream(self.signal, 50, mode, len(self.signal))
+            for block in (777, 960, 4096):
+                np.testing.assert_allclose(self.stream(self.signal, 50, mode, block), whole, rtol=1e-6)
+
+    def test_mean_matches_legacy_loop(self):
+        """Verifies the default statistic matches the original implementation."""
+        np.testing.assert_allclose(self.stream(self.signal, 50, "mean", 1000), legacy_waveform(self.signal, 50), rtol=1e-5)
+
+    def test_rms_and_peak(self):
+        """Verifies RMS and peak per segment against direct reshape computations."""
+        step = len(self.signal) // 10
+        segments = self.signal[:step * 10].reshape(10, step).astype(np.float64)
+        rms = np.sqrt((segments ** 2).mean(axis=1))
+        peak = np.abs(segments).max(axis=1)
+        np.testing.assert_allclose(self.stream(self.signal, 10, "rms", 333), rms / rms.max(), rtol=1e-6)
+        np.testing.assert_allclose(self.stream(self.signal, 10, "peak", 333), peak / peak.max(), rtol=1e-6)
+
+    def test_file_levels_single_pass(self):
+        """Verifies stereo files are mixed to mono and every requested level is produced."""
+        stereo = np.stack([self.signal, 0.5 * self.signal], axis=1)
+        buffer = io.BytesIO()
+        sf.write(buffer, stereo, 44100, format="WAV", subtype="FLOAT")
+
+        with patch.object(audio_processor.AudioLoader, "get_instance") as get_instance:
+            get_instance.return_value.fetch_bytes.return_value = buffer.getvalue()
+            levels = extract_waveform_levels("https://cdn/tone.wav", levels=[1000, 50, 200])
+            single = extract_waveform("https://cdn/tone.wav", n_points=50)
+
+        self.assertEqual(sorted(levels), [50, 200, 1000])
+        self.assertEqual([len(levels[n]) for n in (50, 200, 1000)], [50, 200, 1000])
+        mono = stereo.mean(axis=1)
+        np.testing.assert_allclose(single, legacy_waveform(mono, 50), rtol=1e-5)
+        np.testing.assert_allclose(levels[50], single, rtol=1e-6)
+
+    def test_short_audio(self):
+        """Verifies clips shorter than n_points return an empty waveform instead of failing."""
+        self.assertEqual(self.stream(self.signal[:20], 50, "mean", 8), [])
+
+    def test_invalid_levels_rejected(self):
+        """Verifies zero, negative, oversized and too many levels raise ValueError instead of failing mid-decode."""
+        for n_points in (0, -5, audio_processor.MAX_POINTS + 1):
+            with self.assertRaises(ValueError):
+                EnvelopeAccumulator(1000, n_points)
+        with patch.object(audio_processor, "_stream_envelopes") as stream:
+            for levels in ([0, 50], [-1], [10 ** 9], [], list(range(1, audio_processor.MAX_LEVELS + 2))):
+                with self.assertRaises(ValueError):
+                    extract_waveform_levels("https://cdn/tone.wav", levels=levels)
+            stream.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
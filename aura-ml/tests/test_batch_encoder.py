@@ -0,0 +1,96 @@
+import unittest
+import asyncio
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.batch_encoder import BatchEncoder
+
+class SlowModel:
+    """Stand-in for SentenceTransformer: fixed per-call cost, records batch sizes."""
+
+    def __init__(self, fail=False):
+        self.batch_sizes = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def encode(self, texts, batch_size=32):
+        time.sleep(0.02)
+        if self.fail:
+            raise RuntimeError("encode failed")
+        with self.lock:
+            self.batch_sizes.append(len(texts))
+        return np.stack([np.full(3, float(len(t)), dtype=np.float32) for t in texts])
+
+class TestBatchEncoder(unittest.TestCase):
+    """
+    Unit Verification for the Micro-Batching Encoder.
+
+    Validates:
+    1. Concurrent callers are coalesced into fewer forward passes, never above max_batch_size.
+    2. Every caller receives the row belonging to its own text.
+    3. Model failures propagate to all waiting callers.
+    4. Cancelled callers never take down the worker thread.
+    """
+
+    def test_concurrent_requests_are_batched(self):
+        """Verifies 32 concurrent encodes run in a handful of capped batches with correct fan-out."""
+        model = SlowModel()
+        encoder = BatchEncoder(model, max_batch_size=8, max_wait_ms=10)
+        texts = ["x" * (i + 1) for i in range(32)]
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            vectors = list(pool.map(encoder.encode, texts))
+        encoder.close()
+
+        for text, vector in zip(texts, vectors):
+            self.assertEqual(vector[0], float(len(text)))
+        self.assertLess(len(model.batch_sizes), len(texts))
+        self.assertLessEqual(max(model.batch_sizes), 8)
+
+        stats = encoder.stats()
+        self.assertEqual(stats["total_requests"], 32)
+        self.assertEqual(stats["total_batches"], len(model.batch_sizes))
+        self.assertGreater(stats["avg_batch_size"], 1)
+
+    def test_list_input_matches_model_interface(self):
+        """Verifies list input returns a stacked 2-D array like SentenceTransformer.encode."""
+        encoder = BatchEncoder(SlowModel(), max_batch_size=4, max_wait_ms=5)
+        matrix = encoder.encode(["a", "bb", "ccc"])
+        encoder.close()
+        self.assertEqual(matrix.shape, (3, 3))
+        self.assertEqual(list(matrix[:, 0]), [1.0, 2.0, 3.0])
+
+    def test_errors_propagate(self):
+        """Verifies a failing forward pass raises in the caller instead of hanging it."""
+        encoder = BatchEncoder(SlowModel(fail=True), max_batch_size=4, max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            encoder.encode("rain")
+        encoder.close()
+
+    def test_cancelled_awaiter_keeps_worker_alive(self):
+        """Verifies cancelling `asyncio.wrap_future` awaiters (queued or in flight) leaves later encodes working."""
+        encoder = BatchEncoder(SlowModel(), max_batch_size=1, max_wait_ms=0)
+
+        async def cancel_awaiters():
+            # The first is picked up by the worker, the second still queued behind it
+            waiters = [asyncio.ensure_future(asyncio.wrap_future(encoder.submit(t))) for t in ("rain", "wind")]
+            await asyncio.sleep(0.005)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            return await asyncio.wait_for(asyncio.wrap_future(encoder.submit("thunder")), timeout=2)
+
+        vector = asyncio.run(cancel_awaiters())
+        self.assertEqual(vector[0], float(len("thunder")))
+        self.assertEqual(encoder.encode("sea")[0], 3.0)
+        self.assertTrue(encoder._thread.is_alive())
+        encoder.close()
+
+if __name__ == '__main__':
+    unittest.main()
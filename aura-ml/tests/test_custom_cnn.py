@@ -0,0 +1,131 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import numpy as np
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import custom_cnn
+from services.custom_cnn import LABELS, CustomModelLoader, frame_signal, predict_with_custom_model, predict_windowed
+from services.cnn_network import (
+    MODEL_PATH, CALIBRATION_SEED, load_eager_model, build_inference_model, check_parity, quantize_static,
+    reference_spectrograms
+)
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH), "aura_cnn_v1.pth not available")
+class TestCustomCNN(unittest.TestCase):
+    """
+    Unit Verification for Optimized Custom CNN Inference Modes.
+
+    Validates:
+    1. TorchScript and static int8 variants agree with the eager model on the reference set,
+       and the int8 variant really runs the convs quantized.
+    2. The parity check rejects a variant whose predictions drift.
+    3. The loader serves the requested optimized mode, and falls back to eager otherwise.
+    4. Windowed classification framing, and one batched forward pass matching per-window inference.
+    """
+
+    def setUp(self):
+        CustomModelLoader._model, CustomModelLoader.mode, CustomModelLoader.parity = None, "eager", None
+        self.eager = load_eager_model()
+
+    def tearDown(self):
+        CustomModelLoader._model, CustomModelLoader.mode, CustomModelLoader.parity = None, "eager", None
+
+    def test_optimized_variants_pass_parity(self):
+        """Verifies scripted output is identical and quantized output stays within tolerance."""
+        scripted = check_parity(self.eager, build_inference_model(load_eager_model(), "scripted"))
+        self.assertTrue(scripted["passed"])
+        self.assertLess(scripted["max_prob_diff"], 1e-5)
+
+        quantized = check_parity(self.eager, build_inference_model(load_eager_model(), "quantized"))
+        self.assertTrue(quantized["passed"])
+        self.assertEqual(quantized["top1_agreement"], 1.0)
+
+    def test_static_quantization_covers_convs(self):
+        """Verifies every conv becomes a fused int8 Conv+ReLU and the source model stays fp32."""
+        static = quantize_static(self.eager, reference_spectrograms(16, seed=CALIBRATION_SEED))
+        convs = [m for m in static.modules() if type(m).__name__ == "ConvReLU2d"]
+        self.assertEqual(len(convs), 4)
+        self.assertTrue(all(m.weight().is_quantized for m in convs))
+        self.assertFalse(self.eager.conv1[0].weight.is_quantized)
+
+    def test_parity_rejects_drift(self):
+        """Verifies a model with perturbed weights is flagged."""
+        drifted = load_eager_model()
+        with torch.no_grad():
+            drifted.linear.weight.add_(torch.randn_like(drifted.linear.weight))
+        self.assertFalse(check_parity(self.eager, drifted)["passed"])
+
+    def test_loader_serves_requested_mode(self):
+        """Verifies AURA_CNN_MODE selects the optimized variant after a passing parity check."""
+        with patch.dict(os.environ, {"AURA_CNN_MODE": "scripted"}):
+            model = CustomModelLoader.get_model()
+        self.assertEqual(CustomModelLoader.mode, "scripted")
+        self.assertIsInstance(model, torch.jit.ScriptModule)
+        self.assertTrue(CustomModelLoader.parity["passed"])
+
+    def test_loader_falls_back_to_eager(self):
+        """Verifies unknown modes and failed parity both keep the eager model."""
+        with patch.dict(os.environ, {"AURA_CNN_MODE": "tensorrt"}):
+            CustomModelLoader.get_model()
+        self.assertEqual(CustomModelLoader.mode, "eager")
+
+        CustomModelLoader._model = None
+        with patch.dict(os.environ, {"AURA_CNN_MODE": "quantized", "AURA_CNN_PARITY_TOL": "0"}):
+            model = CustomModelLoader.get_model()
+        self.assertEqual(CustomModelLoader.mode, "eager")
+        self.assertFalse(CustomModelLoader.parity["passed"])
+        self.assertIsInstance(model, torch.nn.Module)
+        self.assertNotIsInstance(model, torch.jit.ScriptModule)
+
+    def test_frame_signal(self):
+        """Verifies 1-second windows with hop, tail padding, short-clip padding and the window cap."""
+        frames, starts = frame_signal(np.arange(1, 38001, dtype=np.float32), hop_seconds=0.5)
+        self.assertEqual(frames.shape, (4, 16000))
+        self.assertEqual(list(starts), [0, 8000, 16000, 24000])
+        self.assertEqual(frames[3, -1], 0.0)  # tail window is zero-padded past the end
+
+        frames, starts = frame_signal(np.ones(4000, dtype=np.float32))
+        self.assertEqual(frames.shape, (1, 16000))
+
+        with patch.object(custom_cnn, "MAX_WINDOWS", 10):
+            frames, starts = frame_signal(np.zeros(16000 * 60, dtype=np.float32), hop_seconds=1.0)
+        self.assertEqual(len(frames), 10)
+        self.assertEqual((starts[0], starts[-1]), (0, 59 * 16000))
+
+    def test_windowed_single_forward_pass(self):
+        """Verifies every window is scored in one forward call and matches single-clip inference."""
+        rng = np.random.default_rng(7)
+        seconds = [rng.normal(scale=s, size=16000).astype(np.float32) for s in (0.01, 0.5, 0.1)]
+        signal = np.concatenate(seconds)
+        calls = []
+        eager = self.eager
+
+        def counting_model(x):
+            calls.append(x.shape[0])
+            return eager(x)
+
+        clips = {f"https://cdn/{i}.wav": s for i, s in enumerate(seconds)}
+        clips["https://cdn/full.wav"] = signal
+        with patch.object(custom_cnn.AudioLoader, "get_instance") as get_instance, \
+             patch.object(CustomModelLoader, "get_model", return_value=counting_model):
+            get_instance.return_value.load.side_effect = lambda url, sr: (clips[url], sr)
+            windowed = predict_windowed("https://cdn/full.wav", hop_seconds=1.0, pooling="mean")
+            singles = [predict_with_custom_model(f"https://cdn/{i}.wav") for i in range(3)]
+            pooled_max = predict_windowed("https://cdn/full.wav", hop_seconds=1.0, pooling="max")
+
+        self.assertEqual(calls[0], 3)
+        self.assertEqual([w["start"] for w in windowed["windows"]], [0.0, 1.0, 2.0])
+        for window, single in zip(windowed["windows"], singles):
+            self.assertEqual(window["label"], single["label"])
+            self.assertAlmostEqual(window["confidence"], single["confidence"], places=5)
+
+        self.assertGreaterEqual(pooled_max["confidence"], windowed["confidence"])
+        self.assertIn(windowed["label"], LABELS)
+        self.assertIn("error", predict_windowed("https://cdn/full.wav", pooling="median"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.embedding_cache import EmbeddingCache
+
+class FakeEncoder:
+    """Deterministic stand-in for SentenceTransformer that records every encode call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(texts)
+        if isinstance(texts, str):
+            return np.full(4, float(len(texts)), dtype=np.float32)
+        return np.stack([np.full(4, float(len(t)), dtype=np.float32) for t in texts])
+
+class TestEmbeddingCache(unittest.TestCase):
+    """
+    Unit Verification for the Query-Embedding Cache.
+
+    Validates:
+    1. Normalised keys share one entry and one encode call.
+    2. LRU eviction respects the size bound, and pinned entries survive it.
+    3. Hit/miss counters reflect cache behaviour.
+    """
+
+    def setUp(self):
+        self.encoder = FakeEncoder()
+        self.cache = EmbeddingCache(self.encoder, max_size=2)
+
+    def test_normalised_hits(self):
+        """Verifies case/whitespace variants hit the same cached vector."""
+        first = self.cache.encode("Deep  Focus")
+        second = self.cache.encode("  deep focus ")
+        self.assertIs(first, second)
+        self.assertEqual(self.encoder.calls, ["deep focus"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Verifies the least recently used entry is evicted once the bound is exceeded."""
+        self.cache.encode("rain")
+        self.cache.encode("ocean")
+        self.cache.encode("rain")       # refresh 'rain'
+        self.cache.encode("fire")       # evicts 'ocean'
+        self.assertEqual(self.cache.stats()["size"], 2)
+        self.cache.encode("rain")
+        self.cache.encode("ocean")
+        self.assertEqual(self.encoder.calls, ["rain", "ocean", "fire", "ocean"])
+
+    def test_pinned_entries_survive(self):
+        """Verifies warmed vocabulary is encoded in one batch and never evicted."""
+        self.cache.warm(["calm zen meditation", "focus deep work"])
+        self.assertEqual(len(self.encoder.calls), 1)
+        for text in ["a", "bb", "ccc", "dddd"]:
+            self.cache.encode(text)
+        self.cache.encode("calm zen meditation")
+        self.assertEqual(len(self.encoder.calls), 5)
+        self.assertEqual(self.cache.stats()["pinned"], 2)
+
+    def test_encode_many_batches_misses(self):
+        """Verifies bulk lookups encode only the distinct misses, in a single call."""
+        self.cache.encode("rain")
+        vectors = self.cache.encode_many(["rain", "sleep", "Sleep"])
+        self.assertEqual(len(vectors), 3)
+        self.assertEqual(self.encoder.calls[-1], ["sleep"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+import base64
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.emotion_classifier import EmotionClassifier, decode_frame, detect_emotion, detect_emotions, dominant_emotion
+
+def encode_frame(size, fmt="JPEG", seed=0):
+    """A noisy RGB frame of `size` (width, height), encoded as `fmt` bytes."""
+    pixels = np.random.default_rng(seed).integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+class FakeClassifier:
+    """Stands in for the image-classification pipeline: scores derived from image width, records calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, images, batch_size=1):
+        self.calls.append((len(images), batch_size))
+        return [[{'label': 'happy', 'score': 0.9}, {'label': 'neutral', 'score': 0.05}] if image.width % 2 == 0
+                else [{'label': 'neutral', 'score': 0.5}, {'label': 'sad', 'score': 0.4}] for image in images]
+
+class TestEmotionClassifier(unittest.TestCase):
+    """
+    Unit Verification for the Face Emotion Preprocessing and Batching.
+
+    Validates:
+    1. Large JPEG/PNG frames are decoded close to the model's input size (short side in [224, 448)).
+    2. Raw bytes, base64 and data URLs decode to the same image.
+    3. Batches run as one pipeline call and match per-frame results; bad frames report neutral.
+    4. The anti-neutral override and the dominant emotion across frames.
+    """
+
+    def setUp(self):
+        self.classifier = FakeClassifier()
+        self.patcher = patch.object(EmotionClassifier, 'get_instance', return_value=self.classifier)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_decode_downscales_large_frames(self):
+        """Verifies 1080p JPEG and PNG frames are reduced to just above the input size, keeping the aspect ratio."""
+        for fmt in ("JPEG", "PNG"):
+            image = decode_frame(encode_frame((1920, 1080), fmt))
+            self.assertEqual(image.mode, "RGB")
+            self.assertGreaterEqual(min(image.size), 224)
+            self.assertLess(min(image.size), 448)
+            self.assertAlmostEqual(image.width / image.height, 1920 / 1080, places=1)
+
+        # Small frames are left at their own resolution
+        self.assertEqual(decode_frame(encode_frame((160, 120))).size, (160, 120))
+
+    def test_encodings_decode_identically(self):
+        """Verifies raw bytes, plain base64 and a data URL yield the same pixels."""
+        raw = encode_frame((640, 480))
+        encoded = base64.b64encode(raw).decode()
+        expected = np.asarray(decode_frame(raw))
+        for frame in (encoded, "data:image/jpeg;base64," + encoded):
+            np.testing.assert_array_equal(np.asarray(decode_frame(frame)), expected)
+
+    def test_batch_matches_singles(self):
+        """Verifies one pipeline call for the whole batch, per-frame results equal to single calls, and neutral for bad frames."""
+        frames = [encode_frame((300, 300)), b"not an image", encode_frame((301, 300), "PNG")]
+        results = detect_emotions(frames, batch_size=8)
+        self.assertEqual(self.classifier.calls, [(2, 2)])
+        self.assertEqual(results[1], {'label': 'neutral', 'score': 0.0})
+        self.assertEqual(results[0], detect_emotion(frames[0]))
+        self.assertEqual(results[2], detect_emotion(frames[2]))
+
+    def test_anti_neutral_and_dominant(self):
+        """Verifies a close second emotion overrides neutral, and the dominant label sums scores across frames."""
+        results = detect_emotions([encode_frame((301, 300)), encode_frame((300, 300)), encode_frame((301, 300))])
+        self.assertEqual([r['label'] for r in results], ['sad', 'happy', 'sad'])
+        self.assertEqual(dominant_emotion(results), {'label': 'happy', 'score': 0.9})  # 0.9 > 0.4 + 0.4
+        self.assertEqual(dominant_emotion([])['label'], 'neutral')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import tempfile
+import importlib.util
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import emotion_classifier
+from services.emotion_classifier import EmotionClassifier, classify_images
+from services.emotion_onnx import OnnxImageClassifier, load_onnx_classifier, reference_images
+
+HAS_ONNXRUNTIME = importlib.util.find_spec("onnxruntime") is not None
+EMOTIONS = ["angry", "disgust", "fear", "happy", "neutral", "sad", "surprise"]
+
+def save_tiny_vit(path):
+    """A randomly initialised 2-layer ViT with the face model's labels (no hub download needed)."""
+    import torch
+    from transformers import ViTConfig, ViTForImageClassification, ViTImageProcessor
+    torch.manual_seed(0)
+    config = ViTConfig(image_size=32, patch_size=8, hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                       intermediate_size=64, num_labels=len(EMOTIONS),
+                       id2label=dict(enumerate(EMOTIONS)), label2id={l: i for i, l in enumerate(EMOTIONS)})
+    ViTForImageClassification(config).save_pretrained(path)
+    ViTImageProcessor(size={"height": 32, "width": 32}).save_pretrained(path)
+
+@unittest.skipUnless(HAS_ONNXRUNTIME, "onnxruntime not installed")
+class TestEmotionOnnx(unittest.TestCase):
+    """
+    Unit Verification for the ONNX Runtime Emotion Backend.
+
+    Validates:
+    1. The fp32 export matches the transformers pipeline (labels, ranking and scores).
+    2. Exports are cached: later loads never touch the eager model.
+    3. The int8 variant keeps the pipeline's output format.
+    4. EmotionClassifier serves the ONNX backend when it passes parity, and falls back to the pipeline otherwise.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls.model_dir = os.path.join(cls.root, "tiny-vit")
+        save_tiny_vit(cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(dir=self.root)
+        self.env = patch.dict(os.environ, {"AURA_EMOTION_ONNX_DIR": self.cache_dir})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        EmotionClassifier.unload()
+
+    def test_fp32_matches_pipeline(self):
+        """Verifies ONNX outputs equal the pipeline's for single images and batches."""
+        from transformers import pipeline
+        classifier, parity = load_onnx_classifier(self.model_dir)
+        self.assertTrue(parity["passed"])
+        self.assertLess(parity["max_prob_diff"], 1e-4)
+
+        reference = pipeline("image-classification", model=self.model_dir)
+        images = reference_images(6, size=48)
+        expected, served = reference(images, batch_size=4), classifier(images, batch_size=4)
+        for ref, out in zip(expected, served):
+            self.assertEqual([p["label"] for p in ref], [p["label"] for p in out])
+            for p, q in zip(ref, out):
+                self.assertAlmostEqual(p["score"], q["score"], places=4)
+        self.assertEqual(classifier(images[0]), served[0])
+
+    def test_export_is_cached(self):
+        """Verifies a second load reads the cached graph and parity without rebuilding the pipeline."""
+        _, parity = load_onnx_classifier(self.model_dir)
+        with patch("transformers.pipeline", side_effect=AssertionError("re-export")):
+            classifier, cached = load_onnx_classifier(self.model_dir)
+        self.assertEqual(cached, parity)
+        self.assertIsInstance(classifier, OnnxImageClassifier)
+
+    def test_int8_output_format(self):
+        """Verifies the quantized variant returns ranked top-5 label/score dicts."""
+        classifier, parity = load_onnx_classifier(self.model_dir, quantized=True)
+        self.assertTrue(classifier.path.endswith("model-int8.onnx"))
+        self.assertEqual(set(parity), {"passed", "top1_agreement", "max_prob_diff"})
+        for predictions in classifier(reference_images(3, size=48)):
+            self.assertEqual(len(predictions), 5)
+            self.assertTrue(set(p["label"] for p in predictions) <= set(EMOTIONS))
+            scores = [p["score"] for p in predictions]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_backend_selection_and_fallback(self):
+        """Verifies AURA_EMOTION_BACKEND=onnx serves ONNX through classify_images, and failed parity serves the pipeline."""
+        with patch.object(emotion_classifier, "MODEL_NAME", self.model_dir), \
+             patch.dict(os.environ, {"AURA_EMOTION_BACKEND": "onnx"}):
+            self.assertIsInstance(EmotionClassifier.load(), OnnxImageClassifier)
+            self.assertEqual(EmotionClassifier.backend, "onnx")
+            with patch.object(EmotionClassifier, "get_instance", EmotionClassifier.load):
+                onnx_results = classify_images(reference_images(4, size=48))
+            EmotionClassifier.unload()
+
+            with patch.dict(os.environ, {"AURA_EMOTION_PARITY_TOL": "-1"}):
+                pipeline = EmotionClassifier.load()
+            self.assertEqual(EmotionClassifier.backend, "pipeline")
+            self.assertNotIsInstance(pipeline, OnnxImageClassifier)
+            with patch.object(EmotionClassifier, "get_instance", EmotionClassifier.load):
+                pipeline_results = classify_images(reference_images(4, size=48))
+
+        for ours, theirs in zip(onnx_results, pipeline_results):
+            self.assertEqual([p["label"] for p in ours], [p["label"] for p in theirs])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.emotion_classifier import EmotionClassifier
+from services.face_session import FaceSessionStore, frame_hash, hamming
+
+def webcam_frame(mood, seed=0):
+    """A 320x240 JPEG: bright left-to-right gradient for 'happy', dark right-to-left for 'sad', plus sensor noise."""
+    gradient = np.linspace(0, 100, 320)
+    base = 120 + gradient if mood == "happy" else 100 - gradient
+    noise = np.random.default_rng(seed).integers(-3, 4, (240, 320))
+    pixels = np.clip(base[None, :] + noise, 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(np.stack([pixels] * 3, axis=-1)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+class BrightnessClassifier:
+    """Stands in for the vision pipeline: bright frames are happy, dark frames sad. Counts forward passes."""
+
+    def __init__(self):
+        self.images = 0
+
+    def __call__(self, images, batch_size=1):
+        self.images += len(images)
+        return [[{'label': 'happy', 'score': 0.9}, {'label': 'neutral', 'score': 0.05}]
+                if np.asarray(image).mean() > 100 else
+                [{'label': 'sad', 'score': 0.8}, {'label': 'neutral', 'score': 0.1}] for image in images]
+
+class TestFaceSession(unittest.TestCase):
+    """
+    Unit Verification for Face DJ Session Mode.
+
+    Validates:
+    1. The perceptual hash ignores sensor noise and separates different scenes.
+    2. Repeated and near-identical frames skip inference.
+    3. EMA smoothing ignores a one-frame outlier and reports `changed` only when the smoothed emotion flips.
+    4. Per-emotion mix cache expiry and session LRU eviction.
+    """
+
+    def setUp(self):
+        self.classifier = BrightnessClassifier()
+        self.patcher = patch.object(EmotionClassifier, 'get_instance', return_value=self.classifier)
+        self.patcher.start()
+        self.store = FaceSessionStore(alpha=0.3, hash_distance=4)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_frame_hash(self):
+        """Verifies noisy re-captures of a scene hash within a few bits, and a different scene hashes far away."""
+        decode = lambda data: Image.open(io.BytesIO(data))
+        happy = frame_hash(decode(webcam_frame("happy", seed=1)))
+        self.assertLessEqual(hamming(happy, frame_hash(decode(webcam_frame("happy", seed=2)))), 4)
+        self.assertGreater(hamming(happy, frame_hash(decode(webcam_frame("sad")))), 32)
+
+    def test_unchanged_frames_skip_inference(self):
+        """Verifies identical and near-identical frames reuse the last prediction."""
+        frame = webcam_frame("happy")
+        states = [self.store.observe("s1", f) for f in (frame, frame, webcam_frame("happy", seed=5))]
+        self.assertEqual([s['inferred'] for s in states], [True, False, False])
+        self.assertEqual([s['changed'] for s in states], [True, False, False])
+        self.assertEqual(self.classifier.images, 1)
+        self.assertEqual(states[-1]['label'], 'happy')
+
+        # Sessions are independent
+        self.assertTrue(self.store.observe("s2", frame)['inferred'])
+        self.assertEqual(self.store.stats()['inferences'], 2)
+
+    def test_smoothing_and_change_detection(self):
+        """Verifies a single sad frame does not flip a happy session, but a sustained sad face does, once."""
+        for seed in range(3):
+            self.store.observe("s", webcam_frame("happy", seed))
+        outlier = self.store.observe("s", webcam_frame("sad"))
+        self.assertEqual((outlier['label'], outlier['changed']), ('happy', False))
+
+        states = [self.store.observe("s", webcam_frame("sad", seed)) for seed in range(1, 6)]
+        self.assertEqual(states[-1]['label'], 'sad')
+        self.assertEqual(sum(s['changed'] for s in states), 1)
+
+    def test_mix_cache_and_eviction(self):
+        """Verifies cached mixes expire after their TTL and the least recently seen session is dropped first."""
+        store = FaceSessionStore(max_sessions=2, mix_ttl_seconds=60)
+        store.store_mix("happy", [{'id': 's1'}])
+        self.assertEqual(store.cached_mix("happy"), [{'id': 's1'}])
+        self.assertIsNone(store.cached_mix("sad"))
+        with patch('services.face_session.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(store.cached_mix("happy"))
+
+        frame = webcam_frame("happy")
+        for session_id in ("a", "b", "a", "c"):
+            store.observe(session_id, frame)
+        store.set_mix("a", ["mix"])
+        self.assertEqual(store.observe("a", frame)['mix'], ["mix"])
+        self.assertEqual(store.stats()['sessions'], 2)
+        self.assertIsNone(store.observe("b", frame)['mix'])  # 'b' was evicted and starts over
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import audio_classifier
+from services.audio_classifier import AudioClassifier, predict_sound_class, predict_sound_classes
+from services.feature_cache import FeatureCache
+from test_audio_classifier import FakeASTPipeline
+
+class TestFeatureCache(unittest.TestCase):
+    """
+    Unit Verification for the Per-Audio AST Feature Cache.
+
+    Validates:
+    1. Re-classification with another top_k / aggregate skips download, extraction and the forward pass.
+    2. A different backend reuses cached features but runs its own forward pass.
+    3. Batch classification only loads and extracts uncached files, with unchanged results.
+    4. Byte-bounded LRU eviction and read-only cached arrays.
+    5. Changed content (new loader version) is re-extracted; eviction after lookup never fails a request.
+    """
+
+    def setUp(self):
+        self.cache = FeatureCache(max_mb=1)
+        self.classifier = FakeASTPipeline()
+        self.loader = MagicMock()
+        self.loader.load.side_effect = lambda url, sr: (np.zeros(16000 * int(url.split("/")[-1].split(".")[0]), dtype=np.float32), sr)
+        self.versions = {}
+        self.loader.version.side_effect = lambda url: self.versions.get(url, "etag-1")
+        self.patchers = [
+            patch.object(FeatureCache, "_instance", self.cache),
+            patch.object(audio_classifier.AudioLoader, "get_instance", return_value=self.loader),
+            patch.object(AudioClassifier, "get_instance", return_value=self.classifier),
+            patch.object(AudioClassifier, "_vibe_table", None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_reclassification_skips_work(self):
+        """Verifies a second request for the same file only re-runs post-processing."""
+        first = predict_sound_class("https://cdn/4.mp3", top_k=5)
+        again = predict_sound_class("https://cdn/4.mp3", top_k=2, aggregate="vibe")
+
+        self.assertEqual(self.loader.load.call_count, 1)
+        self.assertEqual(self.classifier.batch_sizes, [1])
+        self.assertEqual(self.classifier.model.call_count, 1)
+        self.assertEqual(len(again), 2)
+        self.assertEqual(predict_sound_class("https://cdn/4.mp3", top_k=5), first)
+        self.assertEqual(self.cache.stats()["prob_hits"], 2)
+
+    def test_backend_switch_reuses_features(self):
+        """Verifies features are backend-independent while probabilities are cached per backend."""
+        predict_sound_class("https://cdn/3.mp3")
+        with patch.object(AudioClassifier, "backend", "quantized"):
+            predict_sound_class("https://cdn/3.mp3")
+        self.assertEqual(self.classifier.batch_sizes, [1])
+        self.assertEqual(self.classifier.model.call_count, 2)
+        self.assertEqual(self.cache.stats()["feature_hits"], 1)
+
+    def test_batch_only_processes_uncached(self):
+        """Verifies batch tagging loads and extracts new files only, and matches an uncached run."""
+        urls = ["https://cdn/2.mp3", "https://cdn/6.mp3", "https://cdn/9.mp3"]
+        expected = predict_sound_classes(urls, batch_size=2)
+        self.cache.clear()
+        self.loader.load.reset_mock()
+        self.classifier.batch_sizes.clear()
+
+        predict_sound_class(urls[1])
+        results = predict_sound_classes(urls, batch_size=2)
+        self.assertEqual(results, expected)
+        self.assertEqual(sorted(c.args[0] for c in self.loader.load.call_args_list), sorted(urls))
+        self.assertEqual(self.classifier.batch_sizes, [1, 2])  # urls[1] on its own, then the two uncached files
+
+    def test_lru_eviction(self):
+        """Verifies the byte budget evicts least recently used entries and cached arrays are read-only."""
+        features = np.zeros((1024, 128), dtype=np.float32)  # 512 KB, like a real AST input
+        self.cache.store("a", "eager", features=features, probs=np.ones(527))
+        self.cache.store("b", "eager", features=features)
+        self.assertEqual(self.cache.lookup("a", "eager"), (None, None))
+
+        probs, cached = self.cache.lookup("b", "eager")
+        self.assertIsNone(probs)
+        self.assertFalse(cached.flags.writeable)
+        self.assertLessEqual(self.cache.stats()["mb"], 1.0)
+
+    def test_changed_content_is_reclassified(self):
+        """Verifies a new content version (e.g. ETag after revalidation) misses the cache."""
+        predict_sound_class("https://cdn/4.mp3")
+        self.versions["https://cdn/4.mp3"] = "etag-2"
+        predict_sound_class("https://cdn/4.mp3")
+        self.assertEqual(self.loader.load.call_count, 2)
+        self.assertEqual(self.classifier.batch_sizes, [1, 1])
+
+    def test_eviction_after_lookup(self):
+        """Verifies features evicted between the lookup and the forward pass are still used (no error, no reload)."""
+        predict_sound_class("https://cdn/3.mp3")
+        lookup = self.cache.lookup
+
+        def lookup_then_evict(key, backend):
+            hit = lookup(key, backend)
+            self.cache.clear()
+            return hit
+
+        with patch.object(AudioClassifier, "backend", "quantized"), patch.object(self.cache, "lookup", side_effect=lookup_then_evict):
+            single = predict_sound_class("https://cdn/3.mp3")
+            batch = predict_sound_classes(["https://cdn/3.mp3"])
+        self.assertFalse(single[0]["label"].startswith("Error:"))
+        self.assertEqual(batch[0]["predictions"], single)
+        # Audio was loaded and extracted once; later calls ran on the arrays their lookup returned
+        self.assertEqual(self.loader.load.call_count, 1)
+        self.assertEqual(self.classifier.batch_sizes, [1])
+        self.assertEqual(self.classifier.model.call_count, 2)  # eager, then quantized once (its probs were re-stored)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.recommendation_engine import RecommenderSystem
+from services.vector_index import SoundVectorIndex
+from test_recommender import fake_supabase
+
+N_SOUNDS = 25
+
+class TestHybridRecommender(unittest.TestCase):
+    """
+    Unit Verification for the Hybrid (Collaborative + Content) Recommender.
+
+    Validates:
+    1. alpha = 1 serves the collaborative neighbour table unchanged; alpha = 0 ranks by embedding cosine.
+    2. Intermediate weights match a hand-computed blend of both similarity matrices.
+    3. Sounds without interactions get content neighbours instead of a random sample.
+    4. Batch results equal single-sound results, and the engine degrades to the table without an index.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.interactions = [
+            {'id': i, 'user_id': f'u{u}', 'sound_id': f'sound_{s:02d}', 'created_at': '2026-04-01T00:00:00'}
+            for i, (u, s) in enumerate(zip(rng.integers(0, 40, 300), rng.integers(0, N_SOUNDS, 300)))
+        ]
+        sounds = [{'id': f'sound_{i:02d}'} for i in range(N_SOUNDS)] + [{'id': 'sound_new'}, {'id': 'sound_bare'}]
+        self.embeddings = {s['id']: rng.normal(size=384) for s in sounds if s['id'] != 'sound_bare'}
+        with patch.dict(os.environ, {"SUPABASE_URL": "https://fake.supabase.co", "SUPABASE_KEY": "fake_key",
+                                     "AURA_RECOMMENDER_ARTIFACT_DIR": ""}), \
+             patch('services.recommendation_engine.create_client',
+                   return_value=fake_supabase({"user_interactions": self.interactions, "sounds": sounds})):
+            self.recommender = RecommenderSystem()
+
+        self.index = SoundVectorIndex()
+        self.index.load_rows([{**s, 'embedding': self.embeddings[s['id']].tolist()} if s['id'] in self.embeddings else s
+                              for s in sounds])
+        self.patcher = patch.object(SoundVectorIndex, '_instance', self.index)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def cosine(self, a, b):
+        x, y = self.embeddings[a], self.embeddings[b]
+        return float(x @ y / np.linalg.norm(x) / np.linalg.norm(y))
+
+    def collab(self, a, b):
+        factors, index = self.recommender.factors, self.recommender.item_index
+        return float(factors[index[a]] @ factors[index[b]])
+
+    def test_alpha_one_matches_neighbour_table(self):
+        """Verifies alpha = 1 returns exactly the precomputed collaborative neighbours."""
+        snapshot = self.recommender.snapshot
+        for sound_id in ['sound_00', 'sound_07', 'sound_19']:
+            expected = snapshot.item_ids[snapshot.neighbours[snapshot.item_index[sound_id], :5]].tolist()
+            self.assertEqual(self.recommender.recommend_for_sound(sound_id, top_k=5, alpha=1.0), expected)
+
+    def test_alpha_zero_ranks_by_embedding_cosine(self):
+        """Verifies alpha = 0 is a pure content ranking over every embedded sound (including uninteracted ones)."""
+        ids = self.recommender.recommend_for_sound('sound_03', top_k=6, alpha=0.0)
+        candidates = [s for s in self.embeddings if s != 'sound_03']
+        expected = sorted(candidates, key=lambda s: -self.cosine('sound_03', s))[:6]
+        self.assertEqual(ids, expected)
+
+    def test_blend_matches_manual_computation(self):
+        """Verifies the blended scores of every candidate, with content-only scores for sounds without interactions."""
+        alpha = 0.6
+        scores = self.recommender._hybrid_scorer(self.recommender.snapshot).scores(['sound_05'], alpha)[0]
+        for pos, sound_id in enumerate(self.index.ids):
+            if sound_id == 'sound_05':
+                self.assertEqual(scores[pos], -np.inf)
+                continue
+            expected = self.cosine('sound_05', sound_id)
+            if sound_id in self.recommender.item_index:
+                expected = alpha * self.collab('sound_05', sound_id) + (1 - alpha) * expected
+            self.assertAlmostEqual(float(scores[pos]), expected, places=5)
+
+        ids = self.recommender.recommend_for_sound('sound_05', top_k=4, alpha=alpha)
+        self.assertEqual(ids, [self.index.ids[j] for j in np.argsort(-scores, kind="stable")[:4]])
+
+    def test_new_sound_gets_content_neighbours(self):
+        """Verifies a sound without interactions is served by embedding similarity, not random sampling."""
+        with patch('services.recommendation_engine.random.sample', side_effect=AssertionError("random fallback")):
+            for alpha in (1.0, 0.7):
+                ids = self.recommender.recommend_for_sound('sound_new', top_k=5, alpha=alpha)
+                expected = sorted((s for s in self.embeddings if s != 'sound_new'), key=lambda s: -self.cosine('sound_new', s))[:5]
+                self.assertEqual(ids, expected)
+
+        # No interactions and no embedding: random sampling is the last resort
+        self.assertEqual(len(self.recommender.recommend_for_sound('sound_bare', top_k=3)), 3)
+
+    def test_batch_equals_singles_and_index_fallback(self):
+        """Verifies recommend_many matches per-sound calls, and serving falls back to the table when the index is not ready."""
+        sound_ids = ['sound_01', 'sound_new', 'sound_14', 'sound_01']
+        batch = self.recommender.recommend_many(sound_ids, top_k=4, alpha=0.5)
+        for sound_id in sound_ids:
+            self.assertEqual(batch[sound_id], self.recommender.recommend_for_sound(sound_id, top_k=4, alpha=0.5))
+
+        self.index.ready = False
+        snapshot = self.recommender.snapshot
+        expected = snapshot.item_ids[snapshot.neighbours[snapshot.item_index['sound_14'], :4]].tolist()
+        self.assertEqual(self.recommender.recommend_for_sound('sound_14', top_k=4, alpha=0.5), expected)
+
+if __name__ == '__main__':
+    unittest.main()
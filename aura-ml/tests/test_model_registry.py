@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_registry import ModelRegistry, ModelDisabledError, parse_policies, estimate_nbytes
+
+MB = 1024 * 1024
+
+class FakeService:
+    """Service-style lazy singleton whose model is a float32 tensor of `size_mb` megabytes."""
+
+    def __init__(self, size_mb):
+        self.size_mb = size_mb
+        self.model = None
+        self.loads = 0
+
+    def load(self):
+        if self.model is None:
+            self.model = torch.nn.Linear(int(self.size_mb * MB / 4), 1, bias=False)
+            self.loads += 1
+        return self.model
+
+    def unload(self):
+        self.model = None
+
+class TestModelRegistry(unittest.TestCase):
+    """
+    Unit Verification for the Model Registry.
+
+    Validates:
+    1. Policies: eager models load on warm-up, lazy ones on first use, disabled ones never.
+    2. Resident size is measured per model (torch parameters, or the object's own memory_bytes).
+    3. The memory budget unloads least recently used lazy models, never eager ones.
+    4. Idle sweeps unload unused lazy models, which reload transparently on next use.
+    """
+
+    def setUp(self):
+        self.services = {"a": FakeService(1), "b": FakeService(2), "c": FakeService(2), "pinned": FakeService(1)}
+
+    def registry(self, budget_mb=0, policies=None):
+        registry = ModelRegistry(budget_mb=budget_mb, policies=policies or {})
+        for name, service in self.services.items():
+            registry.register(name, service.load, service.unload, default_policy="eager" if name == "pinned" else "lazy")
+        return registry
+
+    def test_policies(self):
+        """Verifies warm-up loads only eager models and disabled models raise without loading."""
+        registry = self.registry(policies=parse_policies("b=disabled, c=eager, bogus, d=sometimes"))
+        registry.warm()
+        self.assertEqual({n for n in self.services if registry.is_loaded(n)}, {"c", "pinned"})
+
+        self.assertIs(registry.get("a"), self.services["a"].model)
+        with self.assertRaises(ModelDisabledError):
+            registry.get("b")
+        self.assertEqual(self.services["b"].loads, 0)
+
+    def test_resident_size(self):
+        """Verifies per-model sizes in stats and the memory_bytes() hook."""
+        registry = self.registry()
+        registry.get("b")
+        stats = registry.stats()
+        self.assertAlmostEqual(stats["models"]["b"]["resident_mb"], 2.0, places=1)
+        self.assertFalse(stats["models"]["a"]["loaded"])
+
+        class Sized:
+            def memory_bytes(self):
+                return 3 * MB
+        self.assertEqual(estimate_nbytes(Sized()), 3 * MB)
+        self.assertEqual(estimate_nbytes(object()), 0)
+
+    def test_budget_evicts_least_recently_used(self):
+        """Verifies loading past the budget unloads the LRU lazy model and keeps eager ones."""
+        registry = self.registry(budget_mb=4.5)
+        registry.get("pinned")
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")            # a is now more recent than b
+        registry.get("c")            # 1 + 1 + 2 + 2 = 6 MB > 4.5 MB -> evict b
+
+        self.assertEqual({n for n in self.services if registry.is_loaded(n)}, {"pinned", "a", "c"})
+        self.assertIsNone(self.services["b"].model)
+        self.assertLessEqual(registry.resident_bytes(), 4.5 * MB)
+        self.assertEqual(registry.stats()["models"]["b"]["evictions"], 1)
+
+    def test_idle_unload_and_reload(self):
+        """Verifies idle lazy models are unloaded and come back on next use."""
+        registry = self.registry()
+        registry.get("pinned")
+        registry.get("a")
+        with patch("core.model_registry.time.monotonic", return_value=registry._entries["a"].last_used + 120):
+            self.assertEqual(registry.unload_idle(60), ["a"])
+        self.assertTrue(registry.is_loaded("pinned"))
+
+        registry.get("a")
+        self.assertEqual(self.services["a"].loads, 2)
+        self.assertEqual(registry.stats()["models"]["a"]["loads"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
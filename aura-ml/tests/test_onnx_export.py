@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import importlib.util
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.onnx_export import create_session, export_onnx, parity_passed, parity_report, staged
+
+HAS_ONNXRUNTIME = importlib.util.find_spec("onnxruntime") is not None
+
+class TestOnnxExport(unittest.TestCase):
+    """
+    Unit Verification for the Shared ONNX Export Helpers.
+
+    Validates:
+    1. Every writer stages under its own name, so concurrent exports of one file never collide.
+    2. A failed write leaves neither the target nor a staging file behind.
+    3. Exports land at the target path with nothing left over.
+    4. The shared parity report scores top-1 agreement and the largest probability gap.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "model.onnx")
+
+    def test_concurrent_writers_never_share_staging(self):
+        """Verifies writers racing on one target each stage privately and the target ends up whole."""
+        stagings, errors = [], []
+        barrier = threading.Barrier(4)
+
+        def write(payload):
+            try:
+                with staged(self.path) as staging:
+                    stagings.append(staging)
+                    barrier.wait()  # every writer holds its staging file at once
+                    with open(staging, "wb") as f:
+                        f.write(payload * 4096)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(bytes([i]),)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(stagings)), 4)
+        with open(self.path, "rb") as f:
+            content = f.read()
+        self.assertEqual(len(set(content)), 1)
+        self.assertEqual(os.listdir(self.dir), ["model.onnx"])
+
+    def test_failed_write_leaves_nothing(self):
+        """Verifies an exception inside the staged block removes the partial file and keeps the target absent."""
+        with self.assertRaises(RuntimeError):
+            with staged(self.path) as staging:
+                with open(staging, "wb") as f:
+                    f.write(b"trunc")
+                raise RuntimeError("export crashed")
+        self.assertEqual(os.listdir(self.dir), [])
+
+    @unittest.skipUnless(HAS_ONNXRUNTIME, "onnxruntime not installed")
+    def test_export_round_trip(self):
+        """Verifies an exported module runs in onnxruntime with a dynamic batch axis and no staging leftovers."""
+        import torch
+        torch.manual_seed(0)
+        module = torch.nn.Linear(4, 3)
+        export_onnx(module, torch.zeros(1, 4), self.path, "input_values")
+
+        self.assertEqual(os.listdir(self.dir), ["model.onnx"])
+        inputs = np.random.default_rng(0).normal(size=(5, 4)).astype(np.float32)
+        logits = create_session(self.path).run(None, {"input_values": inputs})[0]
+        with torch.no_grad():
+            expected = module(torch.from_numpy(inputs)).numpy()
+        np.testing.assert_allclose(logits, expected, atol=1e-5)
+
+    def test_parity_report(self):
+        """Verifies agreement, max difference and the tolerance gate, also when re-applied to a stored report."""
+        ref = np.array([[0.7, 0.2, 0.1], [0.1, 0.3, 0.6]])
+        close = parity_report(ref, ref + [[-0.02, 0.01, 0.01], [0.0, 0.0, 0.0]])
+        self.assertEqual(close, {"passed": True, "top1_agreement": 1.0, "max_prob_diff": 0.02})
+
+        flipped = parity_report(ref, [[0.7, 0.2, 0.1], [0.1, 0.6, 0.3]])
+        self.assertFalse(flipped["passed"])
+        self.assertEqual(flipped["top1_agreement"], 0.5)
+        self.assertAlmostEqual(flipped["max_prob_diff"], 0.3)
+
+        self.assertFalse(parity_passed(close, tolerance=0.01))
+        self.assertTrue(parity_passed(close, tolerance=0.05))
+
+if __name__ == '__main__':
+    unittest.main()
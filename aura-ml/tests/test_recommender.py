@@ -2,11 +2,66 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import pickle
 import pandas as pd
+import numpy as np
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.recommendation_engine import RecommenderSystem
+from services.recommendation_engine import (
+    RecommenderSystem, RecommenderSnapshot, top_k_neighbours, build_interaction_matrix, normalize_rows, item_factors,
+    blocked_top_k, refresh_top_k
+)
+
+class FakeQuery:
+    """In-memory stand-in for a PostgREST query builder (select / gt / order / range / execute)."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def select(self, columns):
+        return self
+
+    def gt(self, column, value):
+        return FakeQuery(r for r in self.rows if r.get(column) is not None and r[column] > value)
+
+    def order(self, column):
+        return FakeQuery(sorted(self.rows, key=lambda r: r.get(column, "")))
+
+    def range(self, start, end):
+        return FakeQuery(self.rows[start:end + 1])
+
+    def execute(self):
+        return MagicMock(data=self.rows)
+
+def fake_supabase(tables):
+    supabase = MagicMock()
+    supabase.table.side_effect = lambda name: FakeQuery(tables.get(name, []))
+    return supabase
+
+def item_similarity(recommender):
+    """Dense sound x sound cosine similarity of the SVD item factors (components_.T scaled by sigma)."""
+    factors = normalize_rows(recommender.model.components_.T * recommender.model.singular_values_)
+    return factors @ factors.T
+
+def scores_of(recommender, sound_id, ids):
+    """Similarity scores of recommended ids (ties may be ordered differently, scores may not)."""
+    columns = list(recommender.item_ids)
+    similarity = item_similarity(recommender)
+    return [similarity[columns.index(sound_id), columns.index(i)] for i in ids]
+
+def legacy_ranking(recommender, sound_id, top_k):
+    """Reference: the original list.index() + full argsort + Python loop, over the dense similarity row."""
+    columns = list(recommender.item_ids)
+    sound_idx = columns.index(sound_id)
+    corr_scores = item_similarity(recommender)[sound_idx]
+    recommendations = []
+    for idx in np.argsort(corr_scores)[::-1]:
+        if columns[idx] != sound_id:
+            recommendations.append(columns[idx])
+            if len(recommendations) >= top_k:
+                break
+    return recommendations
 
 class TestRecommenderSystem(unittest.TestCase):
     """
@@ -16,10 +71,14 @@ class TestRecommenderSystem(unittest.TestCase):
     1. Initialize the SVD (Singular Value Decomposition) model correctly under 'Cold Start' conditions.
     2. Fallback gracefully to synthetic/random data when the database is empty or unreachable.
     3. Return strictly typed, valid recommendation IDs for the frontend.
+    4. Serve item-factor (SVD components_) cosine neighbours with the same ranking as a full argsort.
+    5. Build the sparse interaction matrix and blocked similarities identically to the dense path.
+    6. Incremental updates fold new interactions in past the watermark and match a full re-rank.
+    7. Retrains publish whole snapshots with one swap (or keep the old one on failure), via a training process.
     """
 
     @patch('services.recommendation_engine.create_client')
-    @patch.dict(os.environ, {"SUPABASE_URL": "https://fake.supabase.co", "SUPABASE_KEY": "fake_key"})
+    @patch.dict(os.environ, {"SUPABASE_URL": "https://fake.supabase.co", "SUPABASE_KEY": "fake_key", "AURA_RECOMMENDER_ARTIFACT_DIR": ""})
     def setUp(self, mock_create_client):
         """
         Test Harness Setup.
@@ -38,17 +97,7 @@ class TestRecommenderSystem(unittest.TestCase):
             {'id': 'sound_5', 'title': 'Fire'},
         ]
         
-        self.mock_supabase = MagicMock()
-        
-        def side_effect_table(table_name):
-            query_mock = MagicMock()
-            if table_name == "user_interactions":
-                query_mock.select.return_value.execute.return_value.data = []
-            elif table_name == "sounds":
-                query_mock.select.return_value.execute.return_value.data = self.mock_sounds
-            return query_mock
-
-        self.mock_supabase.table.side_effect = side_effect_table
+        self.mock_supabase = fake_supabase({"user_interactions": [], "sounds": self.mock_sounds})
         mock_create_client.return_value = self.mock_supabase
 
         RecommenderSystem._instance = None
@@ -80,5 +129,172 @@ class TestRecommenderSystem(unittest.TestCase):
         self.assertNotEqual(recommendations[0], 'sound_999', "Should not recommend itself")
         print("✅ Fallback Passed")
 
+    def test_neighbour_table_matches_full_sort(self):
+        """Verifies table lookups (and the beyond-table path) reproduce the original argsort ranking."""
+        def assert_same_ranking(sound_id, top_k):
+            served = self.recommender.recommend_for_sound(sound_id, top_k=top_k)
+            expected = legacy_ranking(self.recommender, sound_id, top_k)
+            np.testing.assert_allclose(scores_of(self.recommender, sound_id, served),
+                                       scores_of(self.recommender, sound_id, expected), atol=1e-6)
+            self.assertNotIn(sound_id, served)
+
+        for sound_id in ['sound_1', 'sound_3', 'sound_5']:
+            assert_same_ranking(sound_id, 3)
+
+        with patch.object(self.recommender.snapshot, 'neighbours', self.recommender.neighbours[:, :2]):
+            assert_same_ranking('sound_2', 4)
+
+    def test_top_k_neighbours(self):
+        """Verifies argpartition top-k returns the highest scores first."""
+        scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.4, -np.inf, 0.8, 0.2]])
+        np.testing.assert_array_equal(top_k_neighbours(scores, 2), [[1, 3], [2, 0]])
+
+    def test_recommend_many(self):
+        """Verifies bulk results equal single lookups, keyed per requested sound, with fallback for unknown ids."""
+        results = self.recommender.recommend_many(['sound_1', 'sound_4', 'sound_999'], top_k=2)
+        self.assertEqual(set(results), {'sound_1', 'sound_4', 'sound_999'})
+        self.assertEqual(results['sound_1'], self.recommender.recommend_for_sound('sound_1', top_k=2))
+        self.assertEqual(results['sound_4'], self.recommender.recommend_for_sound('sound_4', top_k=2))
+        self.assertTrue(len(results['sound_999']) > 0)
+        self.assertNotIn('sound_999', results['sound_999'])
+
+    def test_sparse_matrix_matches_pivot_table(self):
+        """Verifies the CSR matrix equals the original pivot_table (sorted ids, duplicates collapsed to 1)."""
+        users = ['u3', 'u1', 'u1', 'u2', 'u3', 'u1']
+        sounds = ['s2', 's1', 's1', 's3', 's1', 's2']
+        matrix, user_ids, item_ids = build_interaction_matrix(users, sounds)
+        pivot = pd.DataFrame({'user_id': users, 'sound_id': sounds, 'rating': 1}).pivot_table(
+            index='user_id', columns='sound_id', values='rating').fillna(0)
+        self.assertEqual(list(user_ids), list(pivot.index))
+        self.assertEqual(list(item_ids), list(pivot.columns))
+        np.testing.assert_array_equal(matrix.toarray(), pivot.values)
+
+    def test_blocked_top_k_matches_dense_cosine(self):
+        """Verifies block-wise top-k over normalized factors equals ranking the full cosine matrix."""
+        factors = np.random.default_rng(5).normal(size=(40, 6))
+        norms = np.linalg.norm(factors, axis=1)
+        cosine = (factors @ factors.T / np.outer(norms, norms))[:25, :30]
+        cosine[np.arange(25), np.arange(25)] = -np.inf
+        expected = np.argsort(-cosine, axis=1)[:, :4]
+        np.testing.assert_array_equal(blocked_top_k(normalize_rows(factors), 25, 30, 4, block_rows=7), expected)
+
+    def test_item_factors_cover_every_sound(self):
+        """Verifies one unit-norm factor row per sound, built from components_.T, and a neighbour list for every sound."""
+        model = self.recommender.model
+        factors = self.recommender.factors
+        self.assertEqual(factors.shape, (len(self.recommender.item_ids), model.components_.shape[0]))
+        np.testing.assert_allclose(np.linalg.norm(factors, axis=1), 1.0, atol=1e-5)
+        np.testing.assert_allclose(factors, item_factors(model.components_, model.singular_values_))
+        self.assertEqual(len(self.recommender.neighbours), len(self.recommender.item_ids))
+
+    def test_refresh_top_k_matches_full_rank(self):
+        """Verifies partial re-ranking after changed and appended rows equals ranking from scratch."""
+        rng = np.random.default_rng(11)
+        factors = normalize_rows(rng.normal(size=(60, 5)))
+        table = blocked_top_k(factors, 50, 50, 6)
+
+        factors[[3, 17, 40]] = normalize_rows(rng.normal(size=(3, 5)))
+        refreshed = refresh_top_k(factors, table, [3, 17, 40], 55, 6)
+        np.testing.assert_array_equal(refreshed, blocked_top_k(factors, 55, 55, 6))
+
+    @patch('services.recommendation_engine.create_client')
+    @patch.dict(os.environ, {"SUPABASE_URL": "https://fake.supabase.co", "SUPABASE_KEY": "fake_key", "AURA_RECOMMENDER_ARTIFACT_DIR": ""})
+    def test_incremental_update(self, mock_create_client):
+        """Verifies new users/sounds are folded in, the watermark advances and the table stays exact."""
+        rng = np.random.default_rng(2)
+        history = [{'user_id': f'u{u}', 'sound_id': f'sound_{s}', 'created_at': f'2026-01-01T00:{i // 60:02d}:{i % 60:02d}'}
+                   for i, (u, s) in enumerate(zip(rng.integers(0, 30, 120), rng.integers(1, 20, 120)))]
+        new_rows = [{'user_id': 'u3', 'sound_id': 'sound_99', 'created_at': '2026-02-01T00:00:00'},
+                    {'user_id': 'u_new', 'sound_id': 'sound_5', 'created_at': '2026-02-01T00:00:01'},
+                    {'user_id': 'u_new', 'sound_id': 'sound_99', 'created_at': '2026-02-01T00:00:02'}]
+        interactions = [dict(row, id=i) for i, row in enumerate(history)]
+        mock_create_client.return_value = fake_supabase({
+            "user_interactions": interactions, "sounds": [{'id': f'sound_{i}'} for i in range(1, 20)]})
+        recommender = RecommenderSystem()
+        self.assertEqual(recommender.watermark, max(r['created_at'] for r in history))
+        old_snapshot = recommender.snapshot
+        old_shape = recommender.user_item_matrix.shape
+        old_components = recommender.model.components_.shape
+        interactions.extend(dict(row, id=len(history) + i) for i, row in enumerate(new_rows))
+
+        self.assertEqual(recommender.update_incremental(), "incremental")
+        self.assertEqual(recommender.watermark, '2026-02-01T00:00:02')
+        self.assertEqual(recommender.user_item_matrix.shape, (old_shape[0] + 1, old_shape[1] + 1))
+        self.assertEqual(recommender.item_index['sound_99'], old_shape[1])
+        self.assertEqual(recommender.user_item_matrix[recommender.user_index['u_new']].nnz, 2)
+
+        # Published as a new snapshot; the one in-flight requests hold is untouched
+        self.assertIsNot(recommender.snapshot, old_snapshot)
+        self.assertEqual(old_snapshot.user_item_matrix.shape, old_shape)
+        self.assertEqual(old_snapshot.model.components_.shape, old_components)
+        self.assertNotIn('sound_99', old_snapshot.item_index)
+
+        # Touched users are re-projected; sounds that received plays are re-folded from the updated user factors
+        matrix, model = recommender.user_item_matrix, recommender.model
+        touched = [recommender.user_index['u3'], recommender.user_index['u_new']]
+        untouched = np.setdiff1d(np.arange(old_shape[0]), touched)
+        np.testing.assert_array_equal(recommender.matrix_reduced[untouched], old_snapshot.matrix_reduced[untouched])
+        self.assertFalse(np.allclose(recommender.matrix_reduced[touched[0]], old_snapshot.matrix_reduced[touched[0]]))
+        changed = [recommender.item_index['sound_5'], recommender.item_index['sound_99']]
+        expected = np.asarray(matrix[:, changed].T @ recommender.matrix_reduced) / model.singular_values_ ** 2
+        np.testing.assert_allclose(model.components_[:, changed], expected.T, atol=1e-6)
+        np.testing.assert_allclose(recommender.factors[changed], item_factors(expected.T, model.singular_values_), atol=1e-5)
+        n_items = matrix.shape[1]
+        np.testing.assert_array_equal(recommender.neighbours, blocked_top_k(recommender.factors, n_items, n_items, 32))
+
+    def test_incremental_without_baseline_is_noop(self):
+        """Verifies a cold-start (synthetic) model is left to the full retrain instead of retraining every tick."""
+        self.assertIsNone(self.recommender.watermark)
+        served = self.recommender.snapshot
+        with patch.object(self.recommender, 'train_mock_model') as train:
+            self.assertEqual(self.recommender.update_incremental(), "noop")
+        train.assert_not_called()
+        self.assertIs(self.recommender.snapshot, served)
+
+    def test_retrain_swaps_whole_snapshot(self):
+        """Verifies a retrain replaces the snapshot object and never mutates the one being served."""
+        served = self.recommender.snapshot
+        table = served.neighbours.copy()
+        self.recommender.train_mock_model(use_process=False)
+        self.assertIsNot(self.recommender.snapshot, served)
+        np.testing.assert_array_equal(served.neighbours, table)
+        self.assertTrue(len(self.recommender.recommend_for_sound('sound_1')) > 0)
+
+    @patch('services.recommendation_engine.time.sleep')
+    def test_failed_retrain_keeps_serving(self, _):
+        """Verifies an unreachable DB during retrain leaves the current model in place."""
+        served = self.recommender.snapshot
+        with patch.object(self.recommender.reader, 'iter_pages', side_effect=ConnectionError("DB down")):
+            self.recommender.train_mock_model(use_process=False)
+        self.assertIs(self.recommender.snapshot, served)
+        self.assertTrue(len(self.recommender.recommend_for_sound('sound_2')) > 0)
+
+    def test_retrain_runs_in_training_process(self):
+        """Verifies full retrains are submitted to the process pool and the snapshot survives pickling."""
+        submitted = []
+
+        class InlineExecutor:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def submit(self, fn, *args):
+                submitted.append(fn.__name__)
+                future = MagicMock()
+                future.result.return_value = pickle.loads(pickle.dumps(fn(*args)))
+                return future
+
+            def shutdown(self, **kwargs):
+                pass
+
+        served = self.recommender.snapshot
+        with patch('services.recommendation_engine.ProcessPoolExecutor', InlineExecutor), \
+             patch('services.recommendation_engine.create_client', return_value=self.mock_supabase):
+            self.recommender.train_mock_model(use_process=True)
+
+        self.assertEqual(submitted, ['_train_in_child_process'])
+        self.assertIsInstance(self.recommender.snapshot, RecommenderSnapshot)
+        self.assertIsNot(self.recommender.snapshot, served)
+        self.assertEqual(sorted(self.recommender.item_ids), sorted(s['id'] for s in self.mock_sounds))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
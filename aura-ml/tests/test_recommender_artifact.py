@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import json
+import tempfile
+import shutil
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.recommendation_engine import RecommenderSystem
+from services.recommender_artifact import current_artifact, save_snapshot
+from test_recommender import fake_supabase
+
+def interactions(n=200, seed=8):
+    rng = np.random.default_rng(seed)
+    return [{'id': i, 'user_id': f'u{u}', 'sound_id': f'sound_{s:02d}', 'created_at': f'2026-04-01T00:{i // 60:02d}:{i % 60:02d}'}
+            for i, (u, s) in enumerate(zip(rng.integers(0, 40, n), rng.integers(0, 25, n)))]
+
+class TestRecommenderArtifact(unittest.TestCase):
+    """
+    Unit Verification for the Persisted Recommender Artifact.
+
+    Validates:
+    1. A trained snapshot is persisted on startup and a new process maps it without touching the DB.
+    2. Mapped snapshots serve identical recommendations and still accept incremental updates.
+    3. Versioning: CURRENT pointer, format check and pruning of old versions.
+    4. Scheduled refreshes adopt a fresh artifact from another worker instead of retraining.
+    5. Incremental updates are never rolled back by an older artifact; stale artifacts are not mapped at startup.
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.rows = interactions()
+        self.tables = {"user_interactions": self.rows, "sounds": [{'id': f'sound_{i:02d}'} for i in range(25)]}
+        self.env = patch.dict(os.environ, {"SUPABASE_URL": "https://fake.supabase.co", "SUPABASE_KEY": "fake_key",
+                                           "AURA_RECOMMENDER_ARTIFACT_DIR": self.root})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def start_worker(self, tables=None):
+        with patch('services.recommendation_engine.create_client', return_value=fake_supabase(tables or self.tables)):
+            return RecommenderSystem()
+
+    def test_startup_maps_persisted_artifact(self):
+        """Verifies the second worker loads the first one's artifact (no DB reads) and serves the same results."""
+        trainer = self.start_worker()
+        self.assertIsNotNone(trainer.snapshot.artifact)
+
+        with patch('services.recommendation_engine.read_interactions', side_effect=AssertionError("DB fetch")):
+            worker = self.start_worker({})
+
+        self.assertEqual(worker.snapshot.artifact, trainer.snapshot.artifact)
+        self.assertIsInstance(worker.neighbours, np.memmap)
+        self.assertIsInstance(worker.factors, np.memmap)
+        self.assertEqual(worker.watermark, trainer.watermark)
+        sound_ids = [f'sound_{i:02d}' for i in range(25)]
+        self.assertEqual(worker.recommend_many(sound_ids, top_k=5), trainer.recommend_many(sound_ids, top_k=5))
+
+    def test_mapped_snapshot_accepts_incremental_update(self):
+        """Verifies fold-in over read-only mapped arrays builds new arrays instead of writing to the file."""
+        self.start_worker()
+        worker = self.start_worker()
+        self.rows.append({'id': 999, 'user_id': 'u_new', 'sound_id': 'sound_03', 'created_at': '2026-05-01T00:00:00'})
+        with patch.object(worker.reader, 'supabase', fake_supabase(self.tables)):
+            self.assertEqual(worker.update_incremental(), "incremental")
+        self.assertIn('u_new', worker.user_index)
+        self.assertNotIsInstance(worker.factors, np.memmap)
+
+    def test_versioning_and_pruning(self):
+        """Verifies CURRENT tracks the newest version, old versions are pruned and other formats are ignored."""
+        recommender = self.start_worker()
+        paths = [save_snapshot(recommender.snapshot, self.root, keep=2) for _ in range(3)]
+        path, manifest = current_artifact(self.root)
+        self.assertEqual(path, paths[-1])
+        self.assertEqual(manifest["shape"], list(recommender.user_item_matrix.shape))
+        self.assertEqual(len([d for d in os.listdir(self.root) if d.startswith("v2-")]), 2)
+
+        with open(os.path.join(path, "manifest.json"), "w") as f:
+            json.dump(dict(manifest, format_version=99), f)
+        self.assertIsNone(current_artifact(self.root))
+
+    def test_refresh_adopts_fresh_artifact(self):
+        """Verifies refresh maps another worker's recent artifact, and retrains when it is stale."""
+        worker = self.start_worker()
+        other = self.start_worker()
+        other.snapshot.artifact = save_snapshot(other.snapshot, self.root)
+
+        with patch.object(worker, 'train_mock_model') as train:
+            self.assertEqual(worker.refresh(), "loaded")
+            train.assert_not_called()
+        self.assertEqual(worker.snapshot.artifact, other.snapshot.artifact)
+
+        with patch('services.recommendation_engine.ARTIFACT_MAX_AGE_MINUTES', 0), \
+             patch.object(worker, 'train_mock_model') as train:
+            self.assertEqual(worker.refresh(), "trained")
+            train.assert_called_once()
+
+    def test_refresh_keeps_incremental_updates(self):
+        """Verifies a folded-in snapshot (newer watermark, never persisted) survives refresh."""
+        worker = self.start_worker()
+        self.rows.append({'id': 999, 'user_id': 'u_new', 'sound_id': 'sound_03', 'created_at': '2026-05-01T00:00:00'})
+        with patch.object(worker.reader, 'supabase', fake_supabase(self.tables)):
+            self.assertEqual(worker.update_incremental(), "incremental")
+        folded = worker.snapshot
+
+        with patch.object(worker, 'train_mock_model') as train:
+            self.assertEqual(worker.refresh(), "current")
+            train.assert_not_called()
+        self.assertIs(worker.snapshot, folded)
+        self.assertIn('u_new', worker.user_index)
+
+    def test_stale_artifact_not_mapped_at_startup(self):
+        """Verifies startup retrains over an old artifact, and only maps it when training is unavailable."""
+        first = self.start_worker()
+        with patch('services.recommendation_engine.ARTIFACT_MAX_AGE_MINUTES', 0):
+            retrained = self.start_worker()
+            self.assertNotEqual(retrained.snapshot.artifact, first.snapshot.artifact)
+            self.assertNotIsInstance(retrained.factors, np.memmap)
+
+            with patch('services.recommendation_engine.train_snapshot', return_value=None):
+                offline = self.start_worker()
+        self.assertEqual(offline.snapshot.artifact, retrained.snapshot.artifact)
+        self.assertIsInstance(offline.factors, np.memmap)
+
+if __name__ == '__main__':
+    unittest.main()
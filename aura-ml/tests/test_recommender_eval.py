@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+import numpy as np
+from scipy import sparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.paged_reader import InteractionLog
+from services.recommendation_engine import fit_snapshot, interaction_matrix
+from services.recommender_eval import holdout_split, recommend_from_history, recall_at_k, popularity_table
+
+def topic_log(n_users=400, n_sounds=120, n_topics=6, plays=12, seed=3):
+    """Users who only play sounds from one favourite topic (a structure collaborative filtering should find)."""
+    rng = np.random.default_rng(seed)
+    topic_of = np.arange(n_sounds) % n_topics
+    favourite = rng.integers(0, n_topics, n_users)
+    users = np.repeat(np.arange(n_users), plays)
+    items = np.array([rng.choice(np.flatnonzero(topic_of == favourite[u])) for u in users])
+    return InteractionLog(users.astype(np.int32), items.astype(np.int32),
+                          np.array([f"u{u}" for u in range(n_users)], dtype=object),
+                          np.array([f"sound_{s:03d}" for s in range(n_sounds)], dtype=object), "2026-01-01")
+
+class TestRecommenderEval(unittest.TestCase):
+    """
+    Unit Verification for the Recommender Evaluation Harness.
+
+    Validates:
+    1. The leave-one-out split holds out exactly one unseen-in-train sound per eligible user.
+    2. History voting ranks by rank-weighted neighbour votes and never recommends played sounds.
+    3. recall@K counts hits at the right cut-offs.
+    4. On topic-structured data the item-factor engine beats the popularity baseline.
+    """
+
+    def test_holdout_split(self):
+        """Verifies one held-out pair per user with 2+ sounds, absent from train, with unchanged vocabularies."""
+        log = InteractionLog(np.array([0, 0, 0, 1, 1, 2, 2], dtype=np.int32), np.array([0, 1, 1, 2, 3, 4, 4], dtype=np.int32),
+                             np.array(['a', 'b', 'c'], dtype=object), np.array(['s0', 's1', 's2', 's3', 's4'], dtype=object))
+        train, held_users, held_items = holdout_split(log)
+
+        self.assertEqual(sorted(held_users.tolist()), [0, 1])  # user 2 has a single distinct sound
+        self.assertIs(train.item_ids, log.item_ids)
+        train_pairs = set(zip(train.user_codes.tolist(), train.item_codes.tolist()))
+        for user, item in zip(held_users, held_items):
+            self.assertNotIn((user, item), train_pairs)
+        self.assertEqual(len(train) + len(held_users), 5)  # deduplicated pairs
+
+    def test_recommend_from_history(self):
+        """Verifies votes are weighted 1 / (1 + rank) and history sounds are excluded."""
+        neighbours = np.array([[1, 2, 3], [2, 3, 0], [0, 1, 3], [0, 1, 2]])
+        ranked = recommend_from_history(neighbours, np.array([0, 1]), 2, 4)
+        # sound 2: 1/2 (from 0) + 1 (from 1); sound 3: 1/3 + 1/2
+        self.assertEqual(ranked.tolist(), [2, 3])
+
+    def test_recall_at_k(self):
+        """Verifies hits are counted only when the held-out sound ranks within K."""
+        neighbours = np.array([[1, 2], [2, 0], [0, 1]])
+        matrix = sparse.csr_matrix(np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32))
+        # User 0 played sound 0 -> ranked [1, 2]; user 1 played sound 1 -> ranked [2, 0]
+        recall = recall_at_k(neighbours, matrix, np.array([0, 1]), np.array([2, 2]), ks=(1, 2))
+        self.assertEqual(recall, {1: 0.5, 2: 1.0})
+
+    def test_item_engine_beats_popularity(self):
+        """Verifies item-factor neighbours recover planted topics better than the popularity baseline."""
+        log = topic_log()
+        train, held_users, held_items = holdout_split(log)
+        matrix, _, _ = interaction_matrix(train)
+        snapshot = fit_snapshot(train, list(log.item_ids))
+
+        item = recall_at_k(snapshot.neighbours, matrix, held_users, held_items, ks=(10,))[10]
+        popular = recall_at_k(popularity_table(matrix, 32), matrix, held_users, held_items, ks=(10,))[10]
+        self.assertGreater(item, popular + 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
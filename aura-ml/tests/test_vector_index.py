@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import json
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.paged_reader import PagedReader
+from services.vector_index import SoundVectorIndex
+from test_recommender import FakeQuery
+
+# Columns of a `match_sounds` RPC row (the table row subset it returns, plus 'similarity')
+RPC_COLUMNS = ("id", "title", "file_url", "duration_seconds")
+
+class RecordingQuery(FakeQuery):
+    """FakeQuery that records the selected columns and returns only those columns."""
+    selected = []
+
+    def select(self, columns):
+        RecordingQuery.selected.append(columns)
+        names = [c.strip() for c in columns.split(",")]
+        return FakeQuery({k: row.get(k) for k in names} for row in self.rows)
+
+def fake_rpc(data):
+    """Stand-in for the `match_sounds` RPC: exact cosine scan returning RPC_COLUMNS + 'similarity'."""
+    def rpc(name, params):
+        query = np.asarray(params["query_embedding"], dtype=np.float32)
+        rows = []
+        for row in data:
+            vector = SoundVectorIndex._parse_embedding(row.get("embedding"))
+            if vector is None:
+                continue
+            vector = np.asarray(vector, dtype=np.float32)
+            score = float(vector @ query / (np.linalg.norm(vector) * np.linalg.norm(query)))
+            if score > params["match_threshold"]:
+                rows.append({**{k: row.get(k) for k in RPC_COLUMNS}, "similarity": score})
+        rows.sort(key=lambda r: -r["similarity"])
+        return MagicMock(execute=MagicMock(return_value=MagicMock(data=rows[:params["match_count"]])))
+    return rpc
+
+class TestSoundVectorIndex(unittest.TestCase):
+    """
+    Unit Verification for the In-Process Vector Index.
+
+    Validates that local queries reproduce the `match_sounds` RPC contract:
+    1. Cosine similarity, strictly above `match_threshold`, sorted descending, capped at `match_count`.
+    2. Rows hydrated from the row cache (no raw embedding leaked) with a 'similarity' field.
+    3. Sounds without embeddings are cached but never matched.
+    4. Builds page through the whole table and never select '*'.
+    5. Built rows have exactly the RPC's columns.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.vectors = rng.normal(size=(30, 384)).astype(np.float32)
+        self.data = [
+            {"id": f"sound_{i}", "title": f"Sound {i}", "file_url": f"https://cdn/{i}.mp3",
+             "duration_seconds": 30 + i, "tags": ["calm"], "analysis": {"waveform": [0.1] * 8},
+             # PostgREST returns pgvector columns as JSON strings
+             "embedding": json.dumps(self.vectors[i].tolist()) if i % 2 else self.vectors[i].tolist()}
+            for i in range(30)
+        ]
+        self.data.append({"id": "no_vector", "title": "Silent", "file_url": "https://cdn/x.mp3", "embedding": None})
+
+        self.index = SoundVectorIndex()
+        self.index.load_rows(self.data)
+
+    def brute_force(self, query, threshold, count):
+        normed = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        sims = normed @ (query / np.linalg.norm(query))
+        ranked = [(f"sound_{i}", s) for i, s in enumerate(sims) if s > threshold]
+        ranked.sort(key=lambda x: -x[1])
+        return ranked[:count]
+
+    def test_matches_rpc_semantics(self):
+        """Verifies ids, order and scores against a brute-force cosine scan."""
+        query = self.vectors[3] + 0.5 * self.vectors[8]
+        for threshold, count in [(-1.0, 10), (0.0, 5), (0.3, 20), (0.99, 4)]:
+            expected = self.brute_force(query, threshold, count)
+            results = self.index.query(query, threshold, count)
+            self.assertEqual([r["id"] for r in results], [e[0] for e in expected])
+            for r, (_, score) in zip(results, expected):
+                self.assertAlmostEqual(r["similarity"], float(score), places=4)
+
+    def test_row_hydration(self):
+        """Verifies results carry cached metadata and a similarity score, without embeddings."""
+        results = self.index.query(self.vectors[0], 0.5, 1)
+        self.assertEqual(results[0]["id"], "sound_0")
+        self.assertEqual(results[0]["file_url"], "https://cdn/0.mp3")
+        self.assertNotIn("embedding", results[0])
+        self.assertAlmostEqual(results[0]["similarity"], 1.0, places=4)
+
+    def test_missing_embeddings(self):
+        """Verifies sounds without an embedding are cached but excluded from matching."""
+        self.assertIn("no_vector", self.index.rows)
+        self.assertIsNone(self.index.get_embedding("no_vector"))
+        results = self.index.query(self.vectors[1], -1.0, 100)
+        self.assertEqual(len(results), 30)
+        self.assertNotIn("no_vector", [r["id"] for r in results])
+
+    def test_build_pages_whole_table(self):
+        """Verifies every row past the first page is indexed and only the needed columns are read."""
+        RecordingQuery.selected = []
+        supabase = MagicMock()
+        supabase.table.side_effect = lambda name: RecordingQuery(self.data)
+        supabase.rpc.side_effect = fake_rpc(self.data)
+        index = SoundVectorIndex()
+        index.build(supabase, reader=PagedReader(supabase, page_size=7, workers=2))
+
+        self.assertTrue(index.ready)
+        self.assertEqual(len(index.rows), 31)
+        self.assertEqual(sorted(index.ids), sorted(f"sound_{i}" for i in range(30)))
+        self.assertNotIn("embedding", index.rows["sound_3"])
+        self.assertEqual(set(RecordingQuery.selected), {"id, embedding", ", ".join(RPC_COLUMNS)})
+        results = index.query(self.vectors[29], 0.5, 1)
+        self.assertEqual(results[0]["id"], "sound_29")
+
+    def test_built_rows_match_rpc_shape(self):
+        """Verifies locally served rows have the same keys, ids and scores as the RPC's rows."""
+        supabase = MagicMock()
+        supabase.table.side_effect = lambda name: RecordingQuery(self.data)
+        supabase.rpc.side_effect = fake_rpc(self.data)
+        index = SoundVectorIndex()
+        index.build(supabase)
+
+        query = self.vectors[5] + 0.3 * self.vectors[12]
+        params = {"query_embedding": query.tolist(), "match_threshold": 0.0, "match_count": 8}
+        expected = supabase.rpc("match_sounds", params).execute().data
+        results = index.query(query, 0.0, 8)
+        self.assertEqual([r["id"] for r in results], [r["id"] for r in expected])
+        for ours, theirs in zip(results, expected):
+            self.assertEqual(set(ours), set(theirs))
+            self.assertEqual({k: v for k, v in ours.items() if k != "similarity"},
+                             {k: v for k, v in theirs.items() if k != "similarity"})
+            self.assertAlmostEqual(ours["similarity"], theirs["similarity"], places=4)
+
+    def test_build_failure_keeps_rpc_fallback(self):
+        """Verifies a failed DB fetch leaves the index cold so endpoints keep using the RPC."""
+        supabase = MagicMock()
+        supabase.table.side_effect = Exception("connection refused")
+        index = SoundVectorIndex()
+        index.build(supabase)
+        self.assertFalse(index.ready)
+        self.assertIn("connection refused", index.stats()["error"])
+
+if __name__ == '__main__':
+    unittest.main()